@@ -3,17 +3,27 @@ Handles the board / bench state inside of the game and
 other variables used by the bot to make decisions
 """
 
+from functools import partial
 from time import sleep
 from typing import List, Optional, Union
 
 import arena_functions
 import game_assets
 import game_functions
+import gold_ledger
+import item_planner
+import input_sequencer
 import mk_functions
 import ocr
+import perception
 import screen_coords
 from champion import Champion
-from comps import CompsManager
+from comps import CompPlan, CompsManager
+from gold_ledger import GoldLedger
+from input_sequencer import InputSequencer
+from item_planner import Placement
+from perception import GameState
+from symbols import ChampionCounts
 
 
 class Arena:
@@ -23,6 +33,7 @@ class Arena:
     def __init__(self, message_queue, comps_manager: CompsManager) -> None:
         self.comps_manager = comps_manager
         self.comps_manager.select_next_comp()
+        self.comp_plan: CompPlan = comps_manager.current_plan()
         self.message_queue = message_queue
         self.board_size = 0
         self.bench: List[Optional[Union[Champion, str]]] = [None] * 9
@@ -32,7 +43,7 @@ class Arena:
         self.unknown_slots: List[int] = comps_manager.get_unknown_slots()
         self.board_dummy: List[Optional[str]] = []
         self.champs_to_buy: dict = comps_manager.champions_to_buy()
-        self.board_names: List[str] = []
+        self.board_names: ChampionCounts = ChampionCounts(comps_manager.symbols)
         self.items: List[Optional[str]] = [None] * 10
         self.final_comp = False
         self.level = 0
@@ -42,6 +53,7 @@ class Arena:
         self.spam_roll = False
         self.active_portal: str = ""
         self.radiant_item = False
+        self.gold_ledger = GoldLedger()
 
     def portal_vote(self) -> None:
         """Picks a portal based on a comp-specific/user-defined portal list
@@ -140,12 +152,6 @@ class Arena:
                     comps=self.comps_manager,
                 )
                 print(f"Fix bench state: {champ_name}")
-                # Replaces "Ilaoi" with "Illaoi"
-                if champ_name.strip() == "Ilaoi":
-                    champ_name = "Illaoi"
-                # Replaces "Xayah & Raka" with "Xayah & Rakan"
-                if champ_name.strip() == "Xayah & Raka":
-                    champ_name = "Xayah & Rakan"
                 if self.champs_to_buy.get(champ_name, 0) > 0:
                     print(
                         f"  The unknown champion {champ_name} exists in comps, keeping it."
@@ -153,17 +159,16 @@ class Arena:
                     self.bench[index] = Champion(
                         name=champ_name,
                         coords=screen_coords.BENCH_LOC[index].get_coords(),
-                        build=self.comps_manager.current_comp()[1][champ_name][
-                            "items"
-                        ].copy(),
+                        build=list(self.comp_plan.champions[champ_name].items),
                         slot=index,
                         size=self.comps_manager.champions[champ_name]["Board Size"],
-                        final_comp=self.comps_manager.current_comp()[1][champ_name][
-                            "final_comp"
-                        ],
+                        final_comp=self.comp_plan.champions[champ_name].final_comp,
                         trait1=self.comps_manager.champions[champ_name]["Trait1"],
                         trait2=self.comps_manager.champions[champ_name]["Trait2"],
                         trait3=self.comps_manager.champions[champ_name]["Trait3"],
+                        trait_mask=self.comps_manager.symbols.champion_traits(
+                            champ_name
+                        ),
                     )
                     self.champs_to_buy[champ_name] -= 1
                 else:
@@ -178,22 +183,28 @@ class Arena:
             if isinstance(slot, Champion) and not bench_occupied[index]:
                 self.bench[index] = None
 
-    def bought_champion(self, name: str, slot: int) -> None:
-        """Purchase a champion and create a Champion instance"""
+    def bought_champion(self, name: str, slot: int) -> bool:
+        """Purchase a champion and create a Champion instance,
+        returns False if the champion never showed up on the bench"""
         self.bench[slot] = Champion(
             name=name,
             coords=screen_coords.BENCH_LOC[slot].get_coords(),
-            build=self.comps_manager.current_comp()[1][name]["items"].copy(),
+            build=list(self.comp_plan.champions[name].items),
             slot=slot,
             size=self.comps_manager.champions[name]["Board Size"],
-            final_comp=self.comps_manager.current_comp()[1][name]["final_comp"],
+            final_comp=self.comp_plan.champions[name].final_comp,
             trait1=self.comps_manager.champions[name]["Trait1"],
             trait2=self.comps_manager.champions[name]["Trait2"],
             trait3=self.comps_manager.champions[name]["Trait3"],
+            trait_mask=self.comps_manager.symbols.champion_traits(name),
         )
-        mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
-        sleep(0.5)
+        landed: bool = InputSequencer().add(
+            partial(mk_functions.move_mouse, screen_coords.DEFAULT_LOC.get_coords()),
+            partial(input_sequencer.bench_slot_occupied, slot),
+            timeout=0.5,
+        ).run()
         self.fix_bench_state()
+        return landed
 
     def have_champion(self) -> Champion | None:
         """Check if there is a champion on the bench that is not on the board"""
@@ -210,19 +221,18 @@ class Arena:
     def move_known(self, champion: Champion) -> None:
         """Moves a known champion to the board"""
         print(f"  Moving {champion.name} to board")
-        destination: tuple = screen_coords.BOARD_LOC[
-            self.comps_manager.current_comp()[1][champion.name]["board_position"]
-        ].get_coords()
-        mk_functions.left_click(champion.coords)
-        sleep(0.18)
-        mk_functions.left_click(destination)
+        board_position: int = self.comp_plan.champions[champion.name].board_position
+        destination: tuple = screen_coords.BOARD_LOC[board_position].get_coords()
+        InputSequencer().add(
+            partial(mk_functions.left_click, champion.coords),
+            partial(input_sequencer.bench_slot_empty, champion.index),
+            timeout=0.18,
+        ).add(partial(mk_functions.left_click, destination)).run()
         champion.coords = destination
         self.board.append(champion)
-        self.board_names.append(champion.name)
+        self.board_names.add(champion.name)
         self.bench[champion.index] = None
-        champion.index = self.comps_manager.current_comp()[1][champion.name][
-            "board_position"
-        ]
+        champion.index = board_position
         self.board_size += champion.size
 
     def move_unknown(self) -> None:
@@ -248,6 +258,8 @@ class Arena:
             print(f"  Selling {name}")
             mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
             self.bench[index] = None
+        # What a sold champion is worth depends on its star level
+        self.gold_ledger.invalidate()
 
     def unknown_in_bench(self) -> bool:
         """Sells all of the unknown champions on the bench"""
@@ -264,9 +276,9 @@ class Arena:
                 self.move_unknown()
             else:
                 bought_unknown = False
-                shop: list = arena_functions.get_shop(self.comps_manager)
-                for champion in shop:
-                    gold: int = arena_functions.get_gold()
+                state: GameState = perception.capture_game_state(self.comps_manager)
+                for champion in state.shop:
+                    gold: int = state.gold
                     valid_champ: bool = (
                         champion[1] in self.comps_manager.champions
                         and self.comps_manager.champion_gold_cost(champion[1]) <= gold
@@ -276,10 +288,23 @@ class Arena:
                     )
                     if valid_champ:
                         none_slot: int = arena_functions.empty_slot()
-                        mk_functions.left_click(
-                            screen_coords.BUY_LOC[champion[0]].get_coords()
-                        )
-                        sleep(0.2)
+                        if none_slot == -1:
+                            # Bench is full, nowhere for the unit to land
+                            break
+                        landed: bool = InputSequencer().add(
+                            partial(
+                                mk_functions.left_click,
+                                screen_coords.BUY_LOC[champion[0]].get_coords(),
+                            ),
+                            partial(input_sequencer.bench_slot_occupied, none_slot),
+                            timeout=0.2,
+                        ).run()
+                        if landed:
+                            self.gold_ledger.spend(
+                                self.comps_manager.champion_gold_cost(champion[1])
+                            )
+                        else:
+                            self.gold_ledger.invalidate()
                         self.bench[none_slot] = f"{champion[1]}"
                         self.move_unknown()
                         bought_unknown = True
@@ -301,6 +326,7 @@ class Arena:
             )
             self.board_unknown.pop()
             self.board_size -= 1
+            self.gold_ledger.invalidate()
             self.move_known(champion)
 
     def bench_cleanup(self) -> None:
@@ -321,6 +347,8 @@ class Arena:
                     mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
                     self.bench[index] = None
                     self.anvil_free[index] = True
+        if any(self.anvil_free):
+            self.gold_ledger.invalidate()
 
     def clear_anvil(self) -> None:
         """Clears anvil on the bench, selects middle item"""
@@ -341,36 +369,64 @@ class Arena:
         sleep(1)
 
     def place_items(self) -> None:
-        """Iterates through items and tries to add them to champion."""
+        """Handles the special items, then plans where the rest go and places them."""
         self.items = arena_functions.get_items()
         print(f"  Items: {list(filter(None.__ne__, self.items))}")
-        for index, _ in enumerate(self.items):
-            if self.items[index] is not None:
-                if self.items[index] == "TacticiansCrown":
-                    self.bench_tacticians_crown = True
-                    if not self.tacticians_crown:
-                        print("  Tacticians Crown on bench, adding extra slot to board")
-                        self.board_size -= 1
-                        self.tacticians_crown = True
-                    self.move_champions()
-                    self.add_item_to_champs(index)
-                else:
-                    if self.items[index] in [
-                        "ChampionDuplicator",
-                        "LesserChampionDuplicator",
-                    ]:
-                        self.use_duplicator_items(index, self.items[index])
-                    elif "Emblem" in self.items[index]:
-                        self.use_trait_emblem(index)
-                    else:
-                        self.add_item_to_champs(index)
+        for index, item in enumerate(self.items):
+            if item == "TacticiansCrown":
+                self.bench_tacticians_crown = True
+                if not self.tacticians_crown:
+                    print("  Tacticians Crown on bench, adding extra slot to board")
+                    self.board_size -= 1
+                    self.tacticians_crown = True
+                self.move_champions()
+            elif item in ["ChampionDuplicator", "LesserChampionDuplicator"]:
+                self.use_duplicator_items(index, item)
+            elif item is not None and "Emblem" in item:
+                self.use_trait_emblem(index)
+
+        plan: list[Placement] = item_planner.plan_items(
+            [
+                item if item is not None and "Emblem" not in item else None
+                for item in self.items
+            ],
+            self.board,
+            self.bench,
+            self.comp_plan.item_demand,
+        )
+        for placement in plan:
+            self.place_item(placement)
+
+    def place_item(self, placement: Placement) -> None:
+        """Clicks a planned item onto its champion and records the build change"""
+        champ: Champion = placement.champion
+        mk_functions.left_click(
+            screen_coords.ITEM_POS[placement.item_index][0].get_coords()
+        )
+        mk_functions.left_click(champ.coords)
+        item_planner.apply_placement(placement, champ)
+        self.items[placement.item_index] = None
+        if placement.filler:
+            # Handle resetting Tacticians Crown flags once placed on random champ
+            if placement.item == "TacticiansCrown" and self.bench_tacticians_crown:
+                self.bench_tacticians_crown = False
+                self.tacticians_crown = False
+            print(f"  Placed {placement.item} on {champ.name} to free up space")
+            return
+        print(f"  Placed {placement.item} on {champ.name}")
+        if placement.starts is None and placement.completes != placement.item:
+            print(f"  Completed {placement.completes} on {champ.name}")
 
     def use_trait_emblem(self, item_index: int) -> None:
         """Handle the placement of trait emblem items."""
-        trait_to_check = self.items[item_index].replace("Emblem", "")
+        emblem_trait: int = self.comps_manager.symbols.emblem_trait(self.items[item_index])
+        if emblem_trait and not self.board_names.trait_totals()[emblem_trait.bit_length() - 1]:
+            # Nobody fields the trait yet, a lone emblem holder wouldn't activate it
+            print(f"  Holding {self.items[item_index]}, no champion on the board has the trait")
+            return
         for champ in self.board:
             if isinstance(champ, Champion):
-                if not champ.check_trait(trait_to_check):
+                if not champ.check_trait(emblem_trait):
                     mk_functions.left_click(
                         screen_coords.ITEM_POS[item_index][0].get_coords()
                     )
@@ -420,157 +476,6 @@ class Arena:
         print(f"  Duplicated {champ.name} with {item}")
         self.items[self.items.index(item)] = None
 
-    def add_item_to_champs(self, item_index: int) -> None:
-        """Iterates through champions in the board and checks if the champion needs items."""
-        for champ in self.board:
-            if isinstance(champ, Champion):
-                if self.items[item_index] is not None:
-                    if champ.does_need_items():
-                        self.add_item_to_champ(item_index, champ)
-                    if len(champ.build) == 0:
-                        if champ.has_available_item_slots():
-                            item = self.items[item_index]
-                            gloves = [
-                                "ThiefsGloves",
-                                "BlacksmithsGloves",
-                                "RascalsGloves",
-                                "AccomplicesGloves",
-                            ]
-                            if (
-                                self.other_instances_dont_need_item(item)
-                                and (
-                                    (item not in gloves)
-                                    or (
-                                        len(champ.completed_items) == 0
-                                        and len(champ.build) == 0
-                                        and len(champ.current_building) == 0
-                                    )
-                                )
-                                and item
-                                in set(game_assets.CRAFTABLE_ITEMS_DICT.values()).union(
-                                    game_assets.RADIANT_ITEMS_DICT.values(),
-                                    game_assets.FORCED_ITEMS,
-                                )
-                            ):
-                                mk_functions.left_click(
-                                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                                )
-                                mk_functions.left_click(champ.coords)
-                                # Handle resetting Tacticians Crown flags once placed on random champ
-                                if (
-                                    item == "TacticiansCrown"
-                                    and self.bench_tacticians_crown
-                                ):
-                                    self.bench_tacticians_crown = False
-                                    self.tacticians_crown = False
-                                print(
-                                    f"  Placed {item} on {champ.name} to free up space"
-                                )
-                                if item in gloves and champ.max_item_slots == 3:
-                                    champ.completed_items = [
-                                        item
-                                    ] * 3  # Set to 3 completed_items
-                                    # print(
-                                    #    f"  {champ.name} completed items: {champ.completed_items}"
-                                    #    f"  {champ.name} item slots number: {champ.max_item_slots}"
-                                    # )
-                                champ.completed_items.append(item)
-                                self.items[self.items.index(item)] = None
-                                # print(
-                                #    f"  {champ.name} completed items: {champ.completed_items}"
-                                # )
-
-    def item_needed_on_champions(self, champions, item):
-        """Checks if the item is needed on any champions, accounting for items already placed."""
-        for champ in champions:
-            if champ is not None and getattr(champ, "build", None) is not None:
-                if item in champ.build and item not in champ.completed_items:
-                    return True
-        return False
-
-    def other_instances_dont_need_item(self, item):
-        """Check if any other instance (board, bench, champs to buy) needs the item,
-        considering items already placed and adjusting for dynamic needs."""
-        item_needed_on_board = self.item_needed_on_champions(self.board, item)
-        item_needed_on_bench = self.item_needed_on_champions(self.bench, item)
-
-        champions_in_comp = self.comps_manager.current_comp()[1].items()
-
-        # Check if the item is needed by any champion in the comp who is not on the board or bench
-        item_needed_on_champions_to_buy = any(
-            item in data.get("items", [])
-            and item not in data.get("completed_items", [])
-            for _, data in champions_in_comp
-        )
-
-        # Determine if the item is not needed across all instances.
-        return not (
-            item_needed_on_board
-            or item_needed_on_bench
-            or item_needed_on_champions_to_buy
-        )
-
-    def add_item_to_champ(self, item_index: int, champ: Champion) -> None:
-        """Takes item index and champ and applies the item"""
-        item = self.items[item_index]
-
-        if item in game_assets.CRAFTABLE_ITEMS_DICT:
-            if item in champ.build:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                champ.completed_items.append(item)
-                champ.build.remove(item)
-                self.items[self.items.index(item)] = None
-                # print(
-                #    f"1  {champ.name} Completed Items: {champ.completed_items}\n"
-                #    f"1  {champ.name} Build: {champ.build}"
-                # )
-        elif len(champ.current_building) == 0:
-            item_to_move = None
-            for build_item in champ.build:
-                build_item_components = list(
-                    game_assets.CRAFTABLE_ITEMS_DICT.get(build_item, [])
-                )
-                if item in build_item_components:
-                    item_to_move = item
-                    build_item_components.remove(item_to_move)
-                    champ.current_building.append(
-                        (build_item, build_item_components[0])
-                    )
-                    champ.build.remove(build_item)
-            if item_to_move is not None:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                self.items[self.items.index(item)] = None
-                # print(
-                #    f"2  {champ.name} Currently Building: {champ.current_building[0][0]}\n"
-                #    f"2  {champ.name} Completed Items: {champ.completed_items}\n"
-                #    f"2  {champ.name} Build: {champ.build}"
-                # )
-        else:
-            for build_item in champ.current_building:
-                if item == build_item[1]:
-                    mk_functions.left_click(
-                        screen_coords.ITEM_POS[item_index][0].get_coords()
-                    )
-                    mk_functions.left_click(champ.coords)
-                    champ.completed_items.append(build_item[0])
-                    champ.current_building.clear()
-                    self.items[self.items.index(item)] = None
-                    print(f"  Placed {item} on {champ.name}")
-                    print(f"  Completed {build_item[0]} on {champ.name}")
-                    # print(
-                    #    f"3  {champ.name} Completed Items: {build_item[0]}\n"
-                    #    f"3  {champ.name} Build: {champ.build}"
-                    # )
-                    return
-
     def fix_unknown(self) -> None:
         """Checks if the item passed in arg one is valid"""
         sleep(0.25)
@@ -580,6 +485,7 @@ class Arena:
         if len(self.board_unknown) > 0:
             self.board_unknown.pop(0)
             self.board_size -= 1
+        self.gold_ledger.invalidate()
 
     def remove_champion(self, champion: Champion) -> None:
         """Remove a champion from the board and update relevant attributes"""
@@ -593,6 +499,7 @@ class Arena:
             self.champs_to_buy.pop(champion.name)
 
         mk_functions.press_e(champion.coords)
+        self.gold_ledger.invalidate()
         self.board_names.remove(champion.name)
         self.board_size -= champion.size
         self.board.remove(champion)
@@ -641,16 +548,31 @@ class Arena:
         """Spend gold to buy champions and XP"""
         first_run = True
         min_gold = 100 if speedy else (20 if self.spam_roll else 52)
-        while first_run or arena_functions.get_gold() >= min_gold:
+        while first_run or self.gold_ledger.at_least(min_gold):
             if not first_run:
                 current_level = arena_functions.get_level_via_https_request()
                 if current_level != 10:
                     mk_functions.buy_xp()
+                    self.gold_ledger.spend(gold_ledger.XP_COST)
                     print("  Purchasing XP")
-                mk_functions.reroll()
                 print("  Rerolling shop")
-                sleep(0.1)
-            shop: list = arena_functions.get_shop(self.comps_manager)
+                InputSequencer().add(
+                    mk_functions.reroll,
+                    partial(
+                        input_sequencer.region_settled,
+                        screen_coords.SHOP_POS.get_coords(),
+                    ),
+                    timeout=0.2,
+                ).run()
+                # The reroll costs the same whether or not the shop settled in time
+                self.gold_ledger.spend(gold_ledger.REROLL_COST)
+            if first_run:
+                state: GameState = perception.capture_game_state(self.comps_manager)
+                shop: list = list(state.shop)
+                self.gold_ledger.sync(state.gold)
+            else:
+                # Gold after a reroll comes from the ledger, only the shop is read
+                shop: list = arena_functions.get_shop(self.comps_manager)
 
             # For set 11 encounter round shop delay and choose items popup
             for _ in range(15):
@@ -668,10 +590,27 @@ class Arena:
                     if anvil_msg in ["Choose One", "Choose Your Path", "Feeling lucky"]:
                         sleep(2)
                         print("  Choosing item")
-                        mk_functions.left_click(screen_coords.BUY_LOC[2].get_coords())
-                        sleep(0.2)
-                        mk_functions.left_click(screen_coords.BUY_LOC[1].get_coords())
-                        sleep(1.5)
+                        InputSequencer().add(
+                            partial(
+                                mk_functions.left_click,
+                                screen_coords.BUY_LOC[2].get_coords(),
+                            ),
+                            partial(
+                                input_sequencer.region_settled,
+                                screen_coords.ANVIL_MSG_POS.get_coords(),
+                            ),
+                            timeout=0.2,
+                        ).add(
+                            partial(
+                                mk_functions.left_click,
+                                screen_coords.BUY_LOC[1].get_coords(),
+                            ),
+                            partial(
+                                input_sequencer.region_settled,
+                                screen_coords.SHOP_POS.get_coords(),
+                            ),
+                            timeout=1.5,
+                        ).run()
                         shop: list = arena_functions.get_shop(self.comps_manager)
                         break
                     # For set 11 re-fetch shop after item choice
@@ -683,7 +622,7 @@ class Arena:
             for champion in shop:
                 if (
                     self.champs_to_buy.get(champion[1], -1) >= 0
-                    and arena_functions.get_gold()
+                    and self.gold_ledger.gold()
                     - self.comps_manager.champions[champion[1]]["Gold"]
                     >= 0
                 ):
@@ -697,7 +636,9 @@ class Arena:
             buy_coords = screen_coords.BUY_LOC[champion[0]].get_coords()
             mk_functions.left_click(buy_coords)
             print(f"Purchased {champion[1]}")
-            self.bought_champion(champion[1], none_slot)
+            self.gold_ledger.spend(self.comps_manager.champion_gold_cost(champion[1]))
+            if not self.bought_champion(champion[1], none_slot):
+                self.gold_ledger.invalidate()
             if champion[1] in self.champs_to_buy:
                 self.champs_to_buy[champion[1]] -= quantity
         else:
@@ -706,6 +647,8 @@ class Arena:
             mk_functions.left_click(buy_coords)
             game_functions.default_pos()
             sleep(0.5)
+            # Whether the buy combined into an upgrade can't be told from here
+            self.gold_ledger.invalidate()
             self.fix_bench_state()
             none_slot = arena_functions.empty_slot()
             sleep(0.5)
@@ -716,12 +659,13 @@ class Arena:
 
     def buy_xp_round(self) -> None:
         """Buy XP if gold is equal to or over 4"""
-        if arena_functions.get_gold() >= 4:
+        if self.gold_ledger.gold() >= gold_ledger.XP_COST:
             mk_functions.buy_xp()
+            self.gold_ledger.spend(gold_ledger.XP_COST)
 
     def load_aguments(self):
         """Augments from lolchess.gg"""
-        return self.comps_manager.current_comp()[2]
+        return list(self.comp_plan.augments)
 
     def pick_augment(self) -> None:
         """Picks an augment based on a comp-specific/user-defined augment list
@@ -2,43 +2,45 @@
 Functions used by the Arena class to get game data
 """
 
-import threading
-from difflib import SequenceMatcher
 from time import sleep
 
 from typing import Optional
 import numpy as np
-import requests
-from PIL import ImageGrab
 
+import frame_capture
 import game_assets
+import item_icons
 import mk_functions
 import ocr
 import screen_coords
 from comps import CompsManager
+from frame_capture import Frame
+from live_client import LiveClientPoller
+from name_index import NameIndex
 from vec4 import Vec4
 
+HEALTH_BAR_COLOR: list[int] = [0, 255, 18]
 
-def get_level_via_https_request() -> int:
+# The game_assets.ALL_ITEMS set the current item index was built from
+_ITEM_INDEX: dict[str, object] = {}
+
+
+LIVE_CLIENT = LiveClientPoller()
+
+
+def get_level_via_https_request(max_age: Optional[float] = None) -> int:
     """Returns the level for the tactician"""
     try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=20,
-            verify=False,
-        )
-        return int(response.json()["activePlayer"]["level"])
-    except (requests.exceptions.ConnectionError, KeyError):
+        return int(LIVE_CLIENT.snapshot(max_age)["activePlayer"]["level"])
+    except (TypeError, KeyError):
         return 1
 
 
-def get_level_via_ocr() -> int:
+def get_level_via_ocr(frame: Optional[Frame] = None) -> int:
     """Returns the level of the tactician"""
-    level: str = ocr.get_text(
-        screenxy=screen_coords.TACTICIAN_LEVEL_POS.get_coords(),
-        scale=3,
+    level: str = ocr.get_digits_from_image(
+        image=frame_capture.capture(screen_coords.TACTICIAN_LEVEL_POS, frame),
         psm=8,
-        whitelist="0123456789",
     )
     try:
         return int(level)
@@ -49,27 +51,17 @@ def get_level_via_ocr() -> int:
 def get_health() -> int:
     """Returns the health for the tactician"""
     try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=20,
-            verify=False,
+        return int(
+            LIVE_CLIENT.snapshot()["activePlayer"]["championStats"]["currentHealth"]
         )
-        return int(response.json()["activePlayer"]["championStats"]["currentHealth"])
-    except (
-        requests.exceptions.ReadTimeout,
-        requests.exceptions.ConnectionError,
-        KeyError,
-    ):
+    except (TypeError, KeyError):
         return -1
 
 
-def get_gold() -> int:
+def get_gold(frame: Optional[Frame] = None) -> int:
     """Returns the gold for the tactician"""
-    gold: str = ocr.get_text(
-        screenxy=screen_coords.GOLD_POS.get_coords(),
-        scale=3,
-        psm=7,
-        whitelist="0123456789",
+    gold: str = ocr.get_digits_from_image(
+        image=frame_capture.capture(screen_coords.GOLD_POS, frame),
     )
     try:
         return int(gold)
@@ -79,114 +71,150 @@ def get_gold() -> int:
 
 def valid_champ(champ: str, comps: CompsManager) -> str:
     """Matches champion string to a valid champion name string and returns it"""
-    if champ in comps.champions:
-        return champ
-
-    return next(
-        (
-            champion
-            for champion in comps.champions
-            if SequenceMatcher(a=champion, b=champ).ratio() >= 0.7
-        ),
-        "",
-    )
+    return comps.resolve_champion(champ)
 
 
-def get_champ(
-    screen_capture: ImageGrab.Image,
-    name_pos: Vec4,
-    shop_pos: int,
-    shop_array: list,
-    comps: CompsManager,
-) -> str:
-    """Returns a tuple containing the shop position and champion name"""
-    champ: str = screen_capture.crop(name_pos.get_coords())
-    champ: str = ocr.get_text_from_image(
-        image=champ,
+def get_shop(comps: CompsManager, frame: Optional[Frame] = None) -> list:
+    """Returns the list of champions in the shop"""
+    screen_capture = frame_capture.capture(screen_coords.SHOP_POS, frame)
+    names: list[str] = ocr.get_text_lines_from_image(
+        image=screen_capture,
+        boxes=[name_pos.get_coords() for name_pos in screen_coords.CHAMP_NAME_POS],
         whitelist=ocr.ALPHABET_WHITELIST + ocr.SPACE_WHITELIST + ocr.SYMBOL_WHITELIST,
     )
-    shop_array.append((shop_pos, valid_champ(champ, comps)))
+    return [
+        (shop_index, valid_champ(name, comps)) for shop_index, name in enumerate(names)
+    ]
+
+
+def occupied_mask(positions: list[Vec4], frame: Optional[Frame] = None) -> int:
+    """Returns a bitmask with bit n set when a health bar is visible inside positions[n].
+
+    The strip covering every position is captured once, and all slots are checked in a
+    single vectorized lookup on a summed-area table of the health bar colour mask.
+    """
+    boxes: np.ndarray = np.array([position.get_coords() for position in positions])
+    strip: tuple = (
+        int(boxes[:, 0].min()),
+        int(boxes[:, 1].min()),
+        int(boxes[:, 2].max()),
+        int(boxes[:, 3].max()),
+    )
+    screen_capture = (
+        frame.crop_coords(strip) if frame is not None else frame_capture.grab(strip)
+    )
+    screenshot_array = np.array(screen_capture)[..., :3]
+    is_health_color = np.all(screenshot_array == HEALTH_BAR_COLOR, axis=-1)
 
+    table = np.zeros(
+        (is_health_color.shape[0] + 1, is_health_color.shape[1] + 1), dtype=np.int32
+    )
+    table[1:, 1:] = is_health_color.cumsum(axis=0).cumsum(axis=1)
+    left, top, right, bottom = (boxes - [strip[0], strip[1]] * 2).T
+    counts = table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+    return int(np.dot(counts > 0, 1 << np.arange(len(positions))))
 
-def get_shop(comps: CompsManager) -> list:
-    """Returns the list of champions in the shop"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.SHOP_POS.get_coords())
-    shop: list = []
-    thread_list: list = []
-    for shop_index, name_pos in enumerate(screen_coords.CHAMP_NAME_POS):
-        thread = threading.Thread(
-            target=get_champ, args=(screen_capture, name_pos, shop_index, shop, comps)
-        )
-        thread_list.append(thread)
-    for thread in thread_list:
-        thread.start()
-    for thread in thread_list:
-        thread.join()
-    return sorted(shop)
 
+def bench_occupied_mask(frame: Optional[Frame] = None) -> int:
+    """Returns a 9 bit mask of the occupied bench slots"""
+    return occupied_mask(screen_coords.BENCH_HEALTH_POS, frame)
 
-def empty_slot() -> int:
+
+def board_occupied_mask(frame: Optional[Frame] = None) -> int:
+    """Returns a 28 bit mask of the occupied board hexes, bit 0 is the bottom left hex"""
+    return occupied_mask(screen_coords.BOARD_HEALTH_POS, frame)
+
+
+def empty_slot(frame: Optional[Frame] = None) -> int:
     """Finds the first empty spot on the bench"""
-    for slot, positions in enumerate(screen_coords.BENCH_HEALTH_POS):
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        is_health_color = np.all(screenshot_array == [0, 255, 18], axis=-1)
-        if not any(np.convolve(is_health_color.reshape(-1), np.ones(5), mode="valid")):
-            return slot  # Slot 0-8
-    return -1  # No empty slot
+    bench_mask: int = bench_occupied_mask(frame)
+    return next(
+        (
+            slot
+            for slot in range(len(screen_coords.BENCH_HEALTH_POS))
+            if not bench_mask >> slot & 1
+        ),
+        -1,  # No empty slot
+    )
 
 
-def bench_occupied_check() -> list:
+def bench_occupied_check(frame: Optional[Frame] = None) -> list:
     """Returns a list of booleans that map to each bench slot indicating if its occupied"""
-    bench_occupied: list = []
-    for positions in screen_coords.BENCH_HEALTH_POS:
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        is_health_color = np.all(screenshot_array == [0, 255, 18], axis=-1)
-        occupied = any(
-            np.convolve(is_health_color.reshape(-1), np.ones(5), mode="valid")
+    bench_mask: int = bench_occupied_mask(frame)
+    return [
+        bool(bench_mask >> slot & 1)
+        for slot in range(len(screen_coords.BENCH_HEALTH_POS))
+    ]
+
+
+def item_index() -> NameIndex:
+    """Returns the item name index, rebuilt only when game_assets is reloaded with new items"""
+    if _ITEM_INDEX.get("source") is not game_assets.ALL_ITEMS:
+        _ITEM_INDEX["source"] = game_assets.ALL_ITEMS
+        _ITEM_INDEX["index"] = NameIndex(
+            game_assets.ALL_ITEMS, min_ratio=0.85, match_substrings=True
         )
-        bench_occupied.append(occupied)
-    return bench_occupied
+    return _ITEM_INDEX["index"]
 
 
 def valid_item(item: str) -> Optional[str]:
     """Checks if the item passed in arg one is valid"""
-    return next(
-        (
-            valid_item_name
-            for valid_item_name in game_assets.ALL_ITEMS
-            if valid_item_name in item
-            or SequenceMatcher(a=valid_item_name, b=item).ratio() >= 0.85
-        ),
-        None,
-    )
+    return item_index().resolve(item)
+
 
+def hover_item(positions: list) -> tuple[Optional[str], bool]:
+    """Reads an item slot's name from the tooltip shown while hovering it.
 
-def get_items() -> list:
-    """Returns a list of items currently on the board"""
+    Returns the item, None if the text isn't one, and whether the tooltip area
+    was blank, which is what hovering an empty slot shows.
+    """
+    mk_functions.move_mouse(positions[0].get_coords())
+    sleep(0.1)
+    item: str = ocr.get_text(
+        screenxy=positions[1].get_coords(),
+        scale=3,
+        psm=8,
+        whitelist=ocr.ALPHABET_WHITELIST,
+    )
+    return valid_item(item), not item
+
+
+def get_items(frame: Optional[Frame] = None) -> list:
+    """Returns a list of items currently on the board.
+
+    Every slot is recognized from its icon in one capture, only slots the icon
+    index isn't confident about are hovered and read from the tooltip. Resolved
+    names and slots whose tooltip was blank are learned by the index, text that
+    didn't resolve says nothing about the icon and isn't.
+    """
+    if frame is None:
+        # Tooltips of a hovered slot would cover other icons
+        mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+        frame = Frame.grab_window()
+    icons: list = [
+        frame.crop_coords(item_icons.icon_box(positions[0].get_coords()))
+        for positions in screen_coords.ITEM_POS
+    ]
     item_bench: list = []
-    for positions in screen_coords.ITEM_POS:
-        mk_functions.move_mouse(positions[0].get_coords())
-        sleep(0.1)
-        item: str = ocr.get_text(
-            screenxy=positions[1].get_coords(),
-            scale=3,
-            psm=8,
-            whitelist=ocr.ALPHABET_WHITELIST,
-        )
-        item_bench.append(valid_item(item))
-    mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+    hovered = False
+    for positions, icon, (item, confident) in zip(
+        screen_coords.ITEM_POS, icons, item_icons.read_items(icons)
+    ):
+        if not confident:
+            item, blank = hover_item(positions)
+            if item is not None or blank:
+                item_icons.learn(icon, item)
+            hovered = True
+        item_bench.append(item)
+    if hovered:
+        mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
     return item_bench
 
 
-def get_seconds_remaining() -> int:
+def get_seconds_remaining(frame: Optional[Frame] = None) -> int:
     """Returns how many seconds are remaining before the next phase of this round."""
-    seconds: str = ocr.get_text(
-        screenxy=screen_coords.SECONDS_REMAINING_POS.get_coords(),
-        scale=3,
-        psm=7,
-        whitelist="0123456789",
+    seconds: str = ocr.get_digits_from_image(
+        image=frame_capture.capture(screen_coords.SECONDS_REMAINING_POS, frame),
     )
     try:
         if int(seconds) > 60:
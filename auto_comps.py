@@ -6,15 +6,23 @@ import json
 import os
 import re
 import pathlib
-import requests
 from bs4 import BeautifulSoup
 
 
 from comps import CompsManager
+from comps_store import CompRecords, CompsStore
+from http_cache import HttpCache
 
 # Constants
 LOLCHESS_CHAMPIONS_URL = "https://lolchess.gg/champions/"
 LOLCHESS_META_COMPS_URL = "https://lolchess.gg/meta?hl=en"
+LOLCHESS_BUILDER_URL = "https://lolchess.gg/builder/set{set}?hl=en&deck={deck}"
+DAKGG_TEAM_BUILDER_URL = "https://tft.dakgg.io/api/v1/team-builders/{deck}"
+NEXT_DATA_PATTERN = (
+    r'<script id="__NEXT_DATA__" type="application/json">\s*({[\s\S]*?})\s*</script>'
+)
+HTTP_CACHE = HttpCache(os.path.join(os.path.curdir, "cached_data", "http"))
+COMPS_STORE_DIR = os.path.join(os.path.curdir, "cached_data", "comps")
 LOLCHESS_BOARD_ARRANGE = [
     21,
     22,
@@ -79,7 +87,7 @@ def load_lolchess_prices():
     Load champion prices from LOLCHESS.
     """
     lolchess_url = LOLCHESS_CHAMPIONS_URL
-    response = requests.get(lolchess_url, timeout=10)
+    response = HTTP_CACHE.get(lolchess_url, timeout=10)
     current_tft_set = response.url.split("/")[4][3:]
 
     # Extracting JSON data from the response text
@@ -115,10 +123,58 @@ def load_lolchess_prices():
         return [current_tft_set, output_dictionary]
 
 
+def parse_slots(builder: dict, query_data: dict) -> dict:
+    """
+    Turn team builder slots into the comp's champion entries.
+    """
+    slots = {}
+    for each_slot in builder.get("slots", []):
+        if each_slot is not None:
+            try:
+                champion_name = (
+                    list(
+                        filter(
+                            lambda e, each_slot=each_slot: e["key"]
+                            == each_slot.get("champion"),
+                            query_data.get("champions"),
+                        ),
+                    )[0]["name"]
+                    .replace("ChoGath", "Cho'Gath")
+                    .replace("Kaisa", "Kai'Sa")
+                    .replace("KhaZix", "Kha'Zix")
+                    .replace("KogMaw", "Kog'Maw")
+                    .replace("LeeSin", "Lee Sin")
+                    .replace("RekSai", "Rek'Sai")
+                    .replace("TahmKench", "Tahm Kench")
+                )
+                champion_name = re.sub(
+                    r"\bRakan\b|\bXayah\b", "Xayah & Rakan", champion_name
+                )
+
+                star = each_slot.get("star", 1)
+            except Exception:
+                continue
+            slot_items = render_item(
+                query_data.get("items"),
+                each_slot.get("items", []),
+            )
+
+            slots[champion_name] = {
+                "board_position": LOLCHESS_BOARD_ARRANGE[each_slot.get("index")],
+                "items": slot_items,
+                "level": star,
+                "final_comp": True,
+            }
+    return slots
+
+
 def load_lolchess_comps(input_str: str, set_str: str, comps_manager: CompsManager):
     # pylint: disable=unused-argument
     """
     Load LOLCHESS comps.
+
+    Every builder page and team builder is fetched in parallel through the HTTP cache,
+    then the comps are put together in deck order, each with the URL it came from.
     """
     output_comps = []
     url_start_string = "https://lolchess.gg/builder/guide/"
@@ -135,14 +191,32 @@ def load_lolchess_comps(input_str: str, set_str: str, comps_manager: CompsManage
                 # Check "Early Build summary" comp exists and skip adding to deck_list since it's useless
                 if nms != "Early Build summary":
                     deck_list.append((nms, afs))
-    pattern = r'<script id="__NEXT_DATA__" type="application/json">\s*({[\s\S]*?})\s*</script>'
-    for nms, afs in deck_list:
-        deck_keys = afs.split("/guide/")[-1].split("?type=guide")[0]
-        deck_response = requests.get(
-            f"https://lolchess.gg/builder/set{set_str}?hl=en&deck={deck_keys}",
-            timeout=20,
-        )
-        json_in_text = re.search(pattern, deck_response.text)[1]
+
+    with open("custom_comps.txt", "r", encoding="utf-8") as file:
+        custom_comps_links = [line.strip() for line in file if not line.startswith("#")]
+
+    deck_keys = [
+        afs.split("/guide/")[-1].split("?type=guide")[0] for _, afs in deck_list
+    ]
+    custom_deck_keys = [link.split("deck=")[-1] for link in custom_comps_links]
+    deck_urls = [
+        LOLCHESS_BUILDER_URL.format(set=set_str, deck=key) for key in deck_keys
+    ]
+    custom_urls = [DAKGG_TEAM_BUILDER_URL.format(deck=key) for key in custom_deck_keys]
+    responses = HTTP_CACHE.get_all(
+        deck_urls
+        + [DAKGG_TEAM_BUILDER_URL.format(deck=key) for key in deck_keys]
+        + custom_urls
+    )
+    deck_responses = responses[: len(deck_keys)]
+    slot_responses = responses[len(deck_keys) : 2 * len(deck_keys)]
+    custom_responses = responses[2 * len(deck_keys) :]
+
+    query_data = {}
+    for (nms, _), deck_url, deck_response, slots_response in zip(
+        deck_list, deck_urls, deck_responses, slot_responses
+    ):
+        json_in_text = re.search(NEXT_DATA_PATTERN, deck_response.text)[1]
         query_data = (
             json.loads(json_in_text)
             .get("props")
@@ -153,12 +227,7 @@ def load_lolchess_comps(input_str: str, set_str: str, comps_manager: CompsManage
             .get("data")
             .get("refs")
         )
-        with open("cached_data/deck.json", "w", encoding="utf-8") as f:
-            f.write(json.dumps(query_data))
-        deck_slots = requests.get(
-            f"https://tft.dakgg.io/api/v1/team-builders/{deck_keys}", timeout=20
-        ).json()
-        counter = 0
+        deck_slots = slots_response.json()
 
         # Get the highest available team builder from lv5TeamBuilder to lv9TeamBuilder
         highest_builder = {}
@@ -176,57 +245,18 @@ def load_lolchess_comps(input_str: str, set_str: str, comps_manager: CompsManage
             for arg in query_data.get("augments", [])
             if arg.get("key") in augments
         ]
-        slots = {}
-        for each_slot in highest_builder.get("slots", []):
-            if each_slot is not None:
-                try:
-                    champion_name = (
-                        list(
-                            filter(
-                                lambda e, each_slot=each_slot: e["key"]
-                                == each_slot.get("champion"),
-                                query_data.get("champions"),
-                            ),
-                        )[0]["name"]
-                        .replace("ChoGath", "Cho'Gath")
-                        .replace("Kaisa", "Kai'Sa")
-                        .replace("KhaZix", "Kha'Zix")
-                        .replace("KogMaw", "Kog'Maw")
-                        .replace("LeeSin", "Lee Sin")
-                        .replace("RekSai", "Rek'Sai")
-                        .replace("TahmKench", "Tahm Kench")
-                    )
-                    champion_name = re.sub(
-                        r"\bRakan\b|\bXayah\b", "Xayah & Rakan", champion_name
-                    )
-
-                    star = each_slot.get("star", 1)
-                except Exception:
-                    continue
-                slot_items = render_item(
-                    query_data.get("items"),
-                    each_slot.get("items", []),
-                )
-
-                slots[champion_name] = {
-                    "board_position": LOLCHESS_BOARD_ARRANGE[each_slot.get("index")],
-                    "items": slot_items,
-                    "level": star,
-                    "final_comp": True,
-                }
-            counter += 3
-        output_comps.append([nms, slots, real_augments])
+        output_comps.append(
+            (deck_url, [nms, parse_slots(highest_builder, query_data), real_augments])
+        )
 
-    # Process custom comps from the text file
-    with open("custom_comps.txt", "r", encoding="utf-8") as file:
-        custom_comps_links = [line.strip() for line in file if not line.startswith("#")]
+    if deck_list:
+        with open("cached_data/deck.json", "w", encoding="utf-8") as f:
+            f.write(json.dumps(query_data))
 
-    for index, custom_comps_link in enumerate(custom_comps_links):
-        # Extract the deck key from the custom comps link
-        custom_deck_key = custom_comps_link.split("deck=")[-1]
-        custom_comps_response = requests.get(
-            f"https://tft.dakgg.io/api/v1/team-builders/{custom_deck_key}", timeout=20
-        )
+    # Custom comps use the champion and item references of the last meta deck
+    for index, (custom_url, custom_comps_response) in enumerate(
+        zip(custom_urls, custom_responses)
+    ):
         if custom_comps_response.ok:
             custom_comps_data = custom_comps_response.json().get("teamBuilder", {})
             augments = custom_comps_data.get("augments", [])
@@ -235,46 +265,16 @@ def load_lolchess_comps(input_str: str, set_str: str, comps_manager: CompsManage
                 for arg in query_data.get("augments", [])
                 if arg.get("key") in augments
             ]
-            slots = {}
-            for each_slot in custom_comps_data.get("slots", []):
-                if each_slot is not None:
-                    try:
-                        champion_name = (
-                            list(
-                                filter(
-                                    lambda e, each_slot=each_slot: e["key"]
-                                    == each_slot.get("champion"),
-                                    query_data.get("champions"),
-                                ),
-                            )[0]["name"]
-                            .replace("ChoGath", "Cho'Gath")
-                            .replace("Kaisa", "Kai'Sa")
-                            .replace("KhaZix", "Kha'Zix")
-                            .replace("KogMaw", "Kog'Maw")
-                            .replace("LeeSin", "Lee Sin")
-                            .replace("RekSai", "Rek'Sai")
-                            .replace("TahmKench", "Tahm Kench")
-                        )
-                        champion_name = re.sub(
-                            r"\bRakan\b|\bXayah\b", "Xayah & Rakan", champion_name
-                        )
-
-                        star = each_slot.get("star", 1)
-                    except Exception:
-                        continue
-                    slot_items = render_item(
-                        query_data.get("items"),
-                        each_slot.get("items", []),
-                    )
-
-                    slots[champion_name] = {
-                        "board_position": LOLCHESS_BOARD_ARRANGE[each_slot.get("index")],
-                        "items": slot_items,
-                        "level": star,
-                        "final_comp": True,
-                    }
-
-            output_comps.append([f"Custom Comp {index+1}", slots, real_augments])
+            output_comps.append(
+                (
+                    custom_url,
+                    [
+                        f"Custom Comp {index+1}",
+                        parse_slots(custom_comps_data, query_data),
+                        real_augments,
+                    ],
+                )
+            )
 
     return output_comps
 
@@ -289,18 +289,28 @@ def render_item(ob, ids):
     ]
 
 
-def load_from_cache(cached_file_path, comp_manager: CompsManager, set_current):
+def import_legacy_cache(cached_file_path: str, store: CompsStore) -> bool:
     """
-    Load champions and comps data from the cache file.
+    Move the comps of an old single-file cache into the store, so upgrading doesn't refetch them.
     """
-    with open(cached_file_path + set_current + ".json", encoding="utf-8") as f:
-        comp_manager.champions = json.loads(f.readline())
-        comp_manager.set_comps_loaded(json.loads(f.readline()))
+    if not os.path.isfile(cached_file_path):
+        return False
+    with open(cached_file_path, encoding="utf-8") as f:
+        f.readline()
+        comps = json.loads(f.readline())
+    store.update(
+        LOLCHESS_META_COMPS_URL, [(LOLCHESS_META_COMPS_URL, comp) for comp in comps]
+    )
+    os.remove(cached_file_path)
+    return True
 
 
-def load_champions_and_comps(comp_manager: CompsManager):
+def load_champions_and_comps(comp_manager: CompsManager, refresh: bool = False):
     """
     Loads champion and composition data into CompsManager.
+
+    Comps come from the store of the current set, fetched when it's empty or a refresh is asked for.
+    Only the manifest is read here, each comp's record is read once the comp is selected.
     """
     print("Loading champions and comps...")
     cached_path = os.path.join(os.path.curdir, "cached_data")
@@ -308,30 +318,36 @@ def load_champions_and_comps(comp_manager: CompsManager):
     if not os.path.isdir(cached_path):
         os.mkdir(cached_path)
 
-    cached_file_path = os.path.join(cached_path, "cached")
     lol_chess_tftnames_and_price = load_lolchess_prices()
     set_current = lol_chess_tftnames_and_price[0]
+    store = CompsStore(os.path.join(COMPS_STORE_DIR, set_current))
+    inputed_file_path = os.path.join(cached_path, "inputed")
 
-    if os.path.isfile(cached_file_path + set_current + ".json"):
-        print("Loading from cache file...")
-        load_from_cache(cached_file_path, comp_manager, set_current)
+    comps_changed = False
+    if store.manifest() is None and import_legacy_cache(
+        os.path.join(cached_path, f"cached{set_current}.json"), store
+    ):
+        print("Moved cached comps into the comps store")
+    if refresh or store.manifest() is None:
+        comps_changed = refresh_comps(store, set_current, comp_manager)
     else:
-        save_to_cache(
-            comp_manager,
-            set_current,
-            cached_file_path,
-        )
+        print("Loading from cache...")
+    # Indices of a remembered selection mean other comps once the list changed
+    if comps_changed and os.path.isfile(inputed_file_path):
+        os.remove(inputed_file_path)
+
+    comps: CompRecords = store.comps()
+    comp_manager.set_comps_loaded(comps)
 
     print(
         f"Set: {set_current}, loaded champions: {len(comp_manager.champions)}, comps: {len(comp_manager.comps_loaded)}",
     )
 
-    for i, comps_loaded_item in enumerate(comp_manager.comps_loaded):
-        temp = ",".join(comps_loaded_item[1])
-        print(f"{str(i)} - {comps_loaded_item[0]} [{temp}]")
+    for i, (name, champions) in enumerate(comps.summaries()):
+        temp = ",".join(champions)
+        print(f"{str(i)} - {name} [{temp}]")
 
     inputed = ""
-    inputed_file_path = os.path.join(cached_path, "inputed")
 
     if os.path.isfile(inputed_file_path):
         temp_inputed = ""
@@ -378,14 +394,16 @@ def load_champions_and_comps(comp_manager: CompsManager):
         f.write(inputed)
 
 
-def save_to_cache(comp_manager: CompsManager, set_current, cached_file_path):
+def refresh_comps(store: CompsStore, set_current, comp_manager: CompsManager) -> bool:
     """
-    Save champions and comps data to a cache file.
+    Fetch the comps and write the ones that changed to the store.
+
+    Returns whether the list of comps changed.
     """
-    print("Loading from web... (It can take up to ~1 min)")
+    print("Loading from web...")
 
     # Fetch meta comps data from LOLCHESS
-    response_meta_comps = requests.get(LOLCHESS_META_COMPS_URL, timeout=20).text
+    response_meta_comps = HTTP_CACHE.get(LOLCHESS_META_COMPS_URL, timeout=20).text
 
     # Load LOLCHESS comps data
     lol_chess_comps = load_lolchess_comps(
@@ -394,14 +412,6 @@ def save_to_cache(comp_manager: CompsManager, set_current, cached_file_path):
         comp_manager,
     )
 
-    # Update comps_loaded with LOLCHESS comps data
-    comp_manager.comps_loaded = lol_chess_comps
-
-    # Convert champions and comps data to JSON
-    jsoned_champions = json.dumps(comp_manager.champions)
-    jsoned_comps = json.dumps(comp_manager.comps_loaded)
-
-    # Write JSON data to the cache file
-    with open(cached_file_path + set_current + ".json", "w", encoding="utf-8") as f:
-        f.write(jsoned_champions + "\n")  # Writes champions data to the file
-        f.write(jsoned_comps)  # Writes comps data to the file
+    written, comps_changed = store.update(LOLCHESS_META_COMPS_URL, lol_chess_comps)
+    print(f"Updated {written} of {len(lol_chess_comps)} comps")
+    return comps_changed
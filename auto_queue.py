@@ -2,164 +2,50 @@
 Handles getting into a game
 """
 
-from time import sleep
+import asyncio
 import json
-from requests.auth import HTTPBasicAuth
-import requests
+import os
+from time import sleep
+from typing import Optional
+
+import aiohttp
 import urllib3
-from retrying import retry
 import settings
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+GAMEFLOW_PHASE_EVENT = "OnJsonApiEvent_lol-gameflow_v1_gameflow-phase"
+READY_CHECK_EVENT = "OnJsonApiEvent_lol-matchmaking_v1_ready-check"
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
 
-def retry_if_connection_error_or_timeout(exception):
-    """Determine if a retry should be attempted based on the given exception."""
-    return isinstance(
-        exception,
-        (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError),
-    )
-
-
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def create_lobby(client_info: tuple) -> bool:
-    """Creates a lobby"""
-    payload: dict[str, int] = {"queueId": 1090}  # Ranked TFT is 1100
-    payload: dict[str, int] = json.dumps(payload)
-    try:
-        status = requests.post(
-            f"{client_info[1]}/lol-lobby/v2/lobby/",
-            payload,
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        if status.status_code == 200:
-            print("  Creating lobby")
-            return True
-        return False
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
-
-
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def start_queue(client_info: tuple) -> bool:
-    """Starts queue"""
-    try:
-        status = requests.post(
-            f"{client_info[1]}/lol-lobby/v2/lobby/matchmaking/search",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        if status.status_code == 204:
-            print("  Starting queue")
-            return True
-        return False
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
-
+# Phases the client passes through after a game, a new lobby can be created from them
+POST_GAME_PHASES: set[str] = {"None", "WaitingForStats", "PreEndOfGame", "EndOfGame"}
+# Phases that mean the bot's queue is running, even if it was started before a reconnect
+QUEUED_PHASES: set[str] = {"Matchmaking", "ReadyCheck", "ChampSelect", "GameStart"}
 
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def check_queue(client_info: tuple) -> bool:
-    """Checks queue to see if we are searching"""
-    try:
-        status = requests.get(
-            f"{client_info[1]}/lol-lobby/v2/lobby/matchmaking/search-state",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        return status.json().get("searchState") == "Searching"
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
-
-
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def check_game_status(client_info: tuple) -> bool:
-    """Checks to see if we are in a game"""
-    try:
-        status = requests.get(
-            f"{client_info[1]}/lol-gameflow/v1/session",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        return status.json().get("phase", "None")
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
-
-
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def accept_queue(client_info: tuple) -> bool:
-    """Accepts the queue"""
-    try:
-        requests.post(
-            f"{client_info[1]}/lol-matchmaking/v1/ready-check/accept",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        return True
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
-
-
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def change_arena_skin(client_info: tuple) -> bool:
-    """Changes arena skin to default, other arena skins have different coordinates"""
-    try:
-        status = requests.delete(
-            f"{client_info[1]}/lol-cosmetics/v1/selection/tft-map-skin",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
-        )
-        if status.status_code == 204:
-            print("  Changed arena skin to default")
-            return True
-        return False
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
-        return False
+REQUEST_RETRY_SECONDS = 2
+REQUEST_RETRY_LIMIT_SECONDS = 20
+# Re-read the phase over REST when no event arrived for this long
+EVENT_TIMEOUT_SECONDS = 10
+# Upper bound on any single REST request or the WebSocket handshake
+SESSION_TIMEOUT = aiohttp.ClientTimeout(total=20)
 
 
 def get_client() -> tuple:
     """Gets data about the client such as port and auth token"""
     print("\n\n[Auto Queue]")
-    file_path = settings.LEAGUE_CLIENT_PATH + "\\lockfile"
+    file_path = os.path.join(settings.LEAGUE_CLIENT_PATH, "lockfile")
     got_lock_file = False
     while not got_lock_file:
         try:
             with open(file_path, "r", encoding="utf-8") as data:
-                data: list[str] = data.read().split(":")
+                # name:pid:port:password:protocol
+                data: list[str] = data.read().strip().split(":")
                 app_port: str = data[2]
                 remoting_auth_token: str = data[3]
-                server_url: str = f"https://127.0.0.1:{app_port}"
+                server_url: str = f"{data[4]}://127.0.0.1:{app_port}"
                 got_lock_file = True
         except IOError:
             print("Client not open! Trying again in 10 seconds.")
@@ -168,49 +54,176 @@ def get_client() -> tuple:
     return remoting_auth_token, server_url
 
 
-@retry(
-    retry_on_exception=retry_if_connection_error_or_timeout,
-    wait_fixed=2000,
-    stop_max_delay=20000,
-)
-def reconnect(client_info: tuple) -> None:
-    """Reconnect to game when "Failed to Connect" windows are found"""
-    try:
-        requests.post(
-            f"{client_info[1]}/lol-gameflow/v1/reconnect",
-            auth=HTTPBasicAuth("riot", client_info[0]),
-            timeout=20,
-            verify=False,
+class QueueController:
+    """Gets from the client into a game by reacting to LCU WebSocket events.
+
+    All REST calls share one pooled session, and the ready check is accepted
+    as soon as its event arrives instead of on the next poll.
+    """
+
+    def __init__(self, client_info: tuple) -> None:
+        self.auth_token: str = client_info[0]
+        self.server_url: str = client_info[1]
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.queued = False
+        self.changed_arena_skin = False
+
+    async def request(
+        self, method: str, endpoint: str, payload: Optional[dict] = None
+    ) -> Optional[tuple[int, object]]:
+        """Sends a REST request, retrying connection errors for up to 20 seconds.
+
+        Returns the status code and decoded JSON body, or None if the client never answered.
+        """
+        loop = asyncio.get_running_loop()
+        deadline: float = loop.time() + REQUEST_RETRY_LIMIT_SECONDS
+        while True:
+            try:
+                async with self.session.request(
+                    method, f"{self.server_url}{endpoint}", json=payload
+                ) as response:
+                    try:
+                        body = await response.json(content_type=None)
+                    except ValueError:
+                        body = None
+                    return response.status, body
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if loop.time() >= deadline:
+                    return None
+                await asyncio.sleep(REQUEST_RETRY_SECONDS)
+
+    async def get_phase(self) -> str:
+        """Returns the current gameflow phase"""
+        result = await self.request("GET", "/lol-gameflow/v1/session")
+        if result is None or not isinstance(result[1], dict):
+            return "None"
+        return result[1].get("phase", "None")
+
+    async def create_lobby(self) -> bool:
+        """Creates a lobby"""
+        # Ranked TFT is 1100
+        result = await self.request("POST", "/lol-lobby/v2/lobby/", {"queueId": 1090})
+        if result is not None and result[0] == 200:
+            print("  Creating lobby")
+            return True
+        return False
+
+    async def change_arena_skin(self) -> bool:
+        """Changes arena skin to default, other arena skins have different coordinates"""
+        result = await self.request(
+            "DELETE", "/lol-cosmetics/v1/selection/tft-map-skin"
         )
-        return True
-    except (requests.exceptions.ConnectionError, urllib3.exceptions.ReadTimeoutError):
+        if result is not None and result[0] == 204:
+            print("  Changed arena skin to default")
+            return True
         return False
 
+    async def start_queue(self) -> bool:
+        """Starts queue"""
+        result = await self.request(
+            "POST", "/lol-lobby/v2/lobby/matchmaking/search"
+        )
+        if result is not None and result[0] == 204:
+            print("  Starting queue")
+            self.queued = True
+            return True
+        return False
 
-def handle_queue() -> None:
-    """Handles getting into a game"""
-    client_info: tuple = get_client()
-    while check_game_status(client_info) == "InProgress":
-        sleep(2)
-    if check_game_status(client_info) == "Reconnect":
-        print("  Reconnecting")
-        reconnect(client_info)
-        return
-    while not create_lobby(client_info):
-        sleep(3)
+    async def accept_queue(self) -> bool:
+        """Accepts the queue"""
+        result = await self.request(
+            "POST", "/lol-matchmaking/v1/ready-check/accept"
+        )
+        if result is not None:
+            print("  Accepting")
+            return True
+        return False
 
-    change_arena_skin(client_info)
+    async def reconnect(self) -> bool:
+        """Reconnect to game when "Failed to Connect" windows are found"""
+        return await self.request("POST", "/lol-gameflow/v1/reconnect") is not None
 
-    sleep(3)
+    async def handle_phase(self, phase: str) -> bool:
+        """Acts on a gameflow phase, returns True once the bot should start playing."""
+        if phase == "Reconnect":
+            print("  Reconnecting")
+            await self.reconnect()
+            return True
+        if phase in QUEUED_PHASES:
+            self.queued = True
+        if phase == "InProgress":
+            # A game still running before we queued is the previous one ending
+            return self.queued
+        if phase in POST_GAME_PHASES:
+            if await self.create_lobby() and not self.changed_arena_skin:
+                self.changed_arena_skin = await self.change_arena_skin()
+        elif phase == "Lobby":
+            await self.start_queue()
+        elif phase == "ReadyCheck":
+            await self.accept_queue()
+        return False
 
-    while state := check_game_status(client_info):
-        if state == "None":
-            create_lobby(client_info)
-        if state == "Lobby":
-            start_queue(client_info)
-        if state == "ReadyCheck":
-            accept_queue(client_info)
-            print("  Accepting")
-        if state == "InProgress":
-            return
+    async def handle_event(self, message: str) -> bool:
+        """Handles one WAMP message, returns True once the bot should start playing."""
+        try:
+            opcode, event, payload = json.loads(message)
+        except (TypeError, ValueError):
+            return False
+        if opcode != WAMP_EVENT or not isinstance(payload, dict):
+            return False
+        if event == GAMEFLOW_PHASE_EVENT:
+            return await self.handle_phase(payload.get("data") or "None")
+        if event == READY_CHECK_EVENT:
+            ready_check = payload.get("data") or {}
+            if (
+                ready_check.get("state") == "InProgress"
+                and ready_check.get("playerResponse") == "None"
+            ):
+                await self.accept_queue()
+        return False
+
+    async def run(self) -> bool:
+        """Subscribes to the client's events and walks the queue flow.
+
+        Returns True once a game starts, False if the WebSocket closed before that.
+        """
+        async with aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth("riot", self.auth_token),
+            connector=aiohttp.TCPConnector(ssl=False),
+            timeout=SESSION_TIMEOUT,
+        ) as self.session:
+            async with self.session.ws_connect(
+                self.server_url.replace("http", "ws", 1) + "/"
+            ) as websocket:
+                for event in (GAMEFLOW_PHASE_EVENT, READY_CHECK_EVENT):
+                    await websocket.send_json([WAMP_SUBSCRIBE, event])
+                if await self.handle_phase(await self.get_phase()):
+                    return True
+                while not websocket.closed:
+                    try:
+                        message = await websocket.receive(timeout=EVENT_TIMEOUT_SECONDS)
+                    except asyncio.TimeoutError:
+                        if await self.handle_phase(await self.get_phase()):
+                            return True
+                        continue
+                    if message.type == aiohttp.WSMsgType.TEXT and message.data:
+                        if await self.handle_event(message.data):
+                            return True
+                    elif message.type in (
+                        aiohttp.WSMsgType.CLOSED,
+                        aiohttp.WSMsgType.ERROR,
+                    ):
+                        break
+        return False
+
+
+def handle_queue() -> None:
+    """Handles getting into a game"""
+    while True:
+        try:
+            if asyncio.run(QueueController(get_client()).run()):
+                return
+        except (aiohttp.ClientError, ConnectionResetError, asyncio.TimeoutError):
+            pass
+        print("  Lost connection to the client, trying again in 3 seconds.")
         sleep(3)
@@ -0,0 +1,122 @@
+"""
+Accuracy and latency of the digit matcher against a labelled corpus of thresholded crops.
+
+The corpus is a directory of PNG crops named "<text>_<anything>.png", all of one region.
+Without one, crops of gold-like numbers are rendered with OpenCV. The atlas is built
+three ways from the first half of the corpus and read back on the second half:
+from the true labels, from Tesseract-like labels with some misreads fed through the
+voting learn(), and from the same noisy labels trusted on first sight as before.
+
+    python benchmarks/bench_digit_matcher.py [corpus_dir] [--misread-rate 0.1]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import digit_matcher  # pylint: disable=wrong-import-position
+
+WHITELIST = "0123456789"
+CANVAS = (48, 120)
+
+
+def render_corpus(count: int, rng: random.Random) -> list[tuple[str, np.ndarray]]:
+    """Renders numbers black on white with a little jitter, like thresholded gold crops"""
+    corpus: list[tuple[str, np.ndarray]] = []
+    for _ in range(count):
+        text: str = str(rng.randint(0, 150))
+        image: np.ndarray = np.full(CANVAS, 255, dtype=np.uint8)
+        cv2.putText(
+            image,
+            text,
+            (rng.randint(2, 8), rng.randint(34, 40)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            0,
+            3,
+        )
+        corpus.append((text, image))
+    return corpus
+
+
+def load_corpus(directory: Path) -> list[tuple[str, np.ndarray]]:
+    """Reads the labelled crops of a directory"""
+    return [
+        (path.stem.split("_")[0], cv2.imread(str(path), cv2.IMREAD_GRAYSCALE))
+        for path in sorted(directory.glob("*.png"))
+    ]
+
+
+def misread(text: str, rng: random.Random) -> str:
+    """Swaps one character for another digit, the way Tesseract confuses 8 and 0"""
+    index: int = rng.randrange(len(text))
+    return text[:index] + rng.choice(WHITELIST.replace(text[index], "")) + text[index + 1 :]
+
+
+def evaluate(
+    name: str,
+    train: list[tuple[str, np.ndarray]],
+    test: list[tuple[str, np.ndarray]],
+    teach: Callable[[np.ndarray, str, str], None],
+    labels: list[str],
+) -> None:
+    """Builds an atlas with teach from the training labels and reports reads of the test set"""
+    digit_matcher._ATLASES.clear()  # pylint: disable=protected-access
+    digit_matcher._VOTES.clear()  # pylint: disable=protected-access
+    for (_, crop), label in zip(train, labels):
+        teach(crop, WHITELIST, label)
+    correct = wrong = fallback = 0
+    start: float = time.perf_counter()
+    for text, crop in test:
+        read = digit_matcher.read_digits(crop, WHITELIST)
+        if read is None:
+            fallback += 1
+        elif read == text:
+            correct += 1
+        else:
+            wrong += 1
+    elapsed: float = time.perf_counter() - start
+    print(
+        f"{name:<22} correct {correct / len(test):6.1%}  confident misreads {wrong:4d}"
+        f"  Tesseract fallbacks {fallback:4d}  {elapsed / len(test) * 1e6:7.1f} us/read"
+    )
+
+
+def main() -> None:
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("corpus", nargs="?", type=Path)
+    parser.add_argument("--misread-rate", type=float, default=0.1)
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.corpus) if args.corpus else render_corpus(args.size, rng)
+    rng.shuffle(corpus)
+    train, test = corpus[: len(corpus) // 2], corpus[len(corpus) // 2 :]
+    noisy: list[str] = [
+        misread(text, rng) if rng.random() < args.misread_rate else text
+        for text, _ in train
+    ]
+    print(
+        f"{len(train)} training and {len(test)} test crops,"
+        f" {args.misread_rate:.0%} of the training labels misread"
+    )
+    evaluate(
+        "labelled", train, test, digit_matcher.learn_labelled, [t for t, _ in train]
+    )
+    evaluate("voted (learn)", train, test, digit_matcher.learn, noisy)
+    evaluate("trusted first read", train, test, digit_matcher.learn_labelled, noisy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Latency of resolving item OCR reads with the linear SequenceMatcher scan valid_item used
+to do, against the NameIndex it uses now, and how often the two disagree.
+
+The reads are the lines of a text file, for example item tooltip reads pulled from a
+recording, or misread variants of every item name without one.
+
+    python benchmarks/bench_item_names.py [reads.txt] [--passes 3]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+import game_assets
+from name_index import NameIndex
+
+
+def linear_scan(item: str) -> Optional[str]:
+    """valid_item before the index: the first item contained in the read or close to it"""
+    return next(
+        (
+            valid_item_name
+            for valid_item_name in game_assets.ALL_ITEMS
+            if valid_item_name in item
+            or SequenceMatcher(a=valid_item_name, b=item).ratio() >= 0.85
+        ),
+        None,
+    )
+
+
+def misreads(name: str, rng: random.Random) -> list[str]:
+    """The name plus the ways Tesseract tends to get a tooltip wrong"""
+    index: int = rng.randrange(len(name))
+    return [
+        name,
+        name[:index] + name[index + 1 :],
+        name[:index] + rng.choice(string.ascii_letters) + name[index + 1 :],
+        name + rng.choice(string.ascii_lowercase),
+        name.lower(),
+        "".join(rng.choices(string.ascii_letters, k=len(name))),
+    ]
+
+
+def time_pass(resolve: Callable[[str], Optional[str]], reads: list[str]) -> float:
+    """Returns the mean seconds per read over one pass"""
+    start: float = time.perf_counter()
+    for read in reads:
+        resolve(read)
+    return (time.perf_counter() - start) / len(reads)
+
+
+def main() -> None:
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("reads", nargs="?", type=Path)
+    parser.add_argument("--passes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    reads: list[str] = (
+        args.reads.read_text(encoding="utf-8").splitlines()
+        if args.reads
+        else [read for name in sorted(game_assets.ALL_ITEMS) for read in misreads(name, rng)]
+    )
+    rng.shuffle(reads)
+
+    started: float = time.perf_counter()
+    index = NameIndex(game_assets.ALL_ITEMS, min_ratio=0.85, match_substrings=True)
+    build: float = time.perf_counter() - started
+    answers: list[tuple] = [(linear_scan(read), index.resolve(read)) for read in reads]
+    only_index: int = sum(old is None and new is not None for old, new in answers)
+    only_scan: int = sum(old is not None and new is None for old, new in answers)
+    different: int = sum(None not in (old, new) and old != new for old, new in answers)
+    index = NameIndex(game_assets.ALL_ITEMS, min_ratio=0.85, match_substrings=True)
+
+    print(
+        f"{len(reads)} reads of {len(game_assets.ALL_ITEMS)} items,"
+        f" index built in {build * 1000:.2f} ms"
+    )
+    for number in range(1, args.passes + 1):
+        scan: float = time_pass(linear_scan, reads)
+        indexed: float = time_pass(index.resolve, reads)
+        print(
+            f"pass {number}: linear scan {scan * 1e6:9.1f} us/read,"
+            f" NameIndex {indexed * 1e6:7.1f} us/read ({scan / indexed:.0f}x)"
+        )
+    print(
+        f"resolved only by NameIndex {only_index}, only by the linear scan {only_scan},"
+        f" to different items {different}"
+    )
+
+
+if __name__ == "__main__":
+    main()
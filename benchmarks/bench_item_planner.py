@@ -0,0 +1,255 @@
+"""
+Latency of Arena.place_items walking champions and items with nested loops, as before
+the item planner, against planning the whole bench in one pass with item_planner.
+
+Every inventory is synthetic: nine champions with three-item builds, some of them
+halfway through a recipe and some done, and a bench of random components and
+finished items.
+Both versions place items on copies of the same boards, recording clicks instead of
+sending them, and the run fails when any inventory ends up with different clicks or
+build progress.
+
+    python benchmarks/bench_item_planner.py [--inventories 500]
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+import game_assets
+import item_planner
+from champion import Champion
+from comps import CompsManager
+from simulator import synthetic_champions, synthetic_comp
+
+GLOVES: list[str] = ["ThiefsGloves", "BlacksmithsGloves", "RascalsGloves", "AccomplicesGloves"]
+
+
+class NestedLoops:
+    """Arena.add_item_to_champs before the planner, recording (item slot, champion) clicks"""
+
+    def __init__(self, board: list, items: list, comp: dict) -> None:
+        self.board: list = board
+        self.bench: list = [None] * 9
+        self.items: list = items
+        self.comp: dict = comp
+        self.clicks: list[tuple[int, str]] = []
+
+    def place_items(self) -> None:
+        """Offers every item slot to the champions in board order"""
+        for index, item in enumerate(self.items):
+            if item is not None:
+                self.add_item_to_champs(index)
+
+    def click(self, item_index: int, champ: Champion) -> None:
+        """Stands in for the two left clicks"""
+        self.clicks.append((item_index, champ.name))
+
+    def add_item_to_champs(self, item_index: int) -> None:
+        """Iterates through champions in the board and checks if the champion needs items."""
+        # pylint: disable=too-many-nested-blocks,too-many-boolean-expressions
+        for champ in self.board:
+            if isinstance(champ, Champion):
+                if self.items[item_index] is not None:
+                    if champ.does_need_items():
+                        self.add_item_to_champ(item_index, champ)
+                    if len(champ.build) == 0:
+                        if champ.has_available_item_slots():
+                            item = self.items[item_index]
+                            if (
+                                self.other_instances_dont_need_item(item)
+                                and (
+                                    (item not in GLOVES)
+                                    or (
+                                        len(champ.completed_items) == 0
+                                        and len(champ.build) == 0
+                                        and len(champ.current_building) == 0
+                                    )
+                                )
+                                and item
+                                in set(game_assets.CRAFTABLE_ITEMS_DICT.values()).union(
+                                    game_assets.RADIANT_ITEMS_DICT.values(),
+                                    game_assets.FORCED_ITEMS,
+                                )
+                            ):
+                                self.click(item_index, champ)
+                                if item in GLOVES and champ.max_item_slots == 3:
+                                    champ.completed_items = [item] * 3
+                                champ.completed_items.append(item)
+                                self.items[self.items.index(item)] = None
+
+    def item_needed_on_champions(self, champions, item):
+        """Checks if the item is needed on any champions, accounting for items already placed."""
+        for champ in champions:
+            if champ is not None and getattr(champ, "build", None) is not None:
+                if item in champ.build and item not in champ.completed_items:
+                    return True
+        return False
+
+    def other_instances_dont_need_item(self, item):
+        """Check if any other instance (board, bench, champs to buy) needs the item"""
+        return not (
+            self.item_needed_on_champions(self.board, item)
+            or self.item_needed_on_champions(self.bench, item)
+            or any(
+                item in data.get("items", [])
+                and item not in data.get("completed_items", [])
+                for data in self.comp.values()
+            )
+        )
+
+    def add_item_to_champ(self, item_index: int, champ: Champion) -> None:
+        """Takes item index and champ and applies the item"""
+        item = self.items[item_index]
+
+        if item in game_assets.CRAFTABLE_ITEMS_DICT:
+            if item in champ.build:
+                self.click(item_index, champ)
+                champ.completed_items.append(item)
+                champ.build.remove(item)
+                self.items[self.items.index(item)] = None
+        elif len(champ.current_building) == 0:
+            item_to_move = None
+            for build_item in champ.build:
+                build_item_components = list(
+                    game_assets.CRAFTABLE_ITEMS_DICT.get(build_item, [])
+                )
+                if item in build_item_components:
+                    item_to_move = item
+                    build_item_components.remove(item_to_move)
+                    champ.current_building.append((build_item, build_item_components[0]))
+                    champ.build.remove(build_item)
+            if item_to_move is not None:
+                self.click(item_index, champ)
+                self.items[self.items.index(item)] = None
+        else:
+            for build_item in champ.current_building:
+                if item == build_item[1]:
+                    self.click(item_index, champ)
+                    champ.completed_items.append(build_item[0])
+                    champ.current_building.clear()
+                    self.items[self.items.index(item)] = None
+                    return
+
+
+def planned(board: list, items: list, comps: CompsManager) -> list[tuple[int, str]]:
+    """Arena.place_items now: plans the bench, then applies every placement"""
+    clicks: list[tuple[int, str]] = []
+    for placement in item_planner.plan_items(
+        items, board, [None] * 9, comps.current_plan().item_demand
+    ):
+        clicks.append((placement.item_index, placement.champion.name))
+        item_planner.apply_placement(placement, placement.champion)
+    return clicks
+
+
+def synthetic_inventory(rng: random.Random, comps: CompsManager) -> tuple[list, list]:
+    """Returns a board of champions with builds and a bench of ten item slots.
+
+    Emblems and the crown are left out, both versions hand them to the same
+    special cases before placing the rest. No two recipes of a build share a component:
+    the nested loops started every recipe using a component at once, which the planner
+    deliberately doesn't copy.
+    """
+    craftables: list[str] = sorted(
+        item
+        for item in game_assets.CRAFTABLE_ITEMS_DICT
+        if "Emblem" not in item and item != "TacticiansCrown"
+    )
+    components: list[str] = sorted(
+        {part for parts in game_assets.CRAFTABLE_ITEMS_DICT.values() for part in parts}
+    )
+    board: list = [None] * 28
+    for slot, name in enumerate(rng.sample(sorted(comps.champions), 9)):
+        build: list[str] = []
+        for craftable in rng.sample(craftables, len(craftables)):
+            parts: set[str] = set(game_assets.CRAFTABLE_ITEMS_DICT[craftable])
+            if len(build) < 3 and not any(
+                parts & set(game_assets.CRAFTABLE_ITEMS_DICT[other]) for other in build
+            ):
+                build.append(craftable)
+        champion = Champion(name, (slot, 0), build, slot, 1, False, "", "", "")
+        roll: float = rng.random()
+        if roll < 0.3:
+            # Build done, extra items can be dumped on it
+            champion.completed_items = champion.build[: rng.randint(1, 2)]
+            champion.build = []
+        elif roll < 0.6:
+            started: str = champion.build.pop()
+            champion.current_building.append(
+                (started, game_assets.CRAFTABLE_ITEMS_DICT[started][1])
+            )
+        board[slot * 3] = champion
+    items: list = [
+        rng.choice(components if rng.random() < 0.8 else craftables)
+        if rng.random() < 0.8
+        else None
+        for _ in range(10)
+    ]
+    return board, items
+
+
+def nested_loops(board: list, items: list, comps: CompsManager) -> list[tuple[int, str]]:
+    """Places the inventory the way Arena.place_items did before the planner"""
+    placer = NestedLoops(board, list(items), comps.current_comp()[1])
+    placer.place_items()
+    return placer.clicks
+
+
+def build_states(board: list) -> list[tuple]:
+    """The item progress of every champion, to compare what both versions left behind"""
+    return [
+        (champ.name, champ.build, champ.completed_items, champ.current_building)
+        for champ in board
+        if isinstance(champ, Champion)
+    ]
+
+
+def place_all(place, comps: CompsManager, inventories: list) -> tuple[float, list]:
+    """Places copies of every inventory, returns seconds per inventory and the outcomes"""
+    elapsed: float = 0.0
+    outcomes: list = []
+    for board, items in copy.deepcopy(inventories):
+        start: float = time.perf_counter()
+        clicks: list[tuple[int, str]] = place(board, items, comps)
+        elapsed += time.perf_counter() - start
+        outcomes.append((clicks, build_states(board)))
+    return elapsed / len(inventories), outcomes
+
+
+def main() -> None:
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--inventories", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    comps = CompsManager()
+    comps.champions = synthetic_champions(rng)
+    comps.set_comps_loaded([synthetic_comp(rng, comps.champions)])
+    inventories: list = [synthetic_inventory(rng, comps) for _ in range(args.inventories)]
+
+    nested, nested_outcomes = place_all(nested_loops, comps, inventories)
+    plan, plan_outcomes = place_all(planned, comps, inventories)
+    differing: list[int] = [
+        index
+        for index, (before, after) in enumerate(zip(nested_outcomes, plan_outcomes))
+        if before != after
+    ]
+    print(f"{args.inventories} inventories of 10 slots over 9 champions")
+    print(f"nested loops    {nested * 1e6:8.1f} us/inventory")
+    print(f"item planner    {plan * 1e6:8.1f} us/inventory  ({nested / plan:.1f}x)")
+    print(f"placements differ on {len(differing)} inventories {differing[:10]}")
+    if differing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Per-call latency of reading text crops with a new Tesseract engine for every call, as
+before the engine pool, against the pooled engines of ocr.py.
+
+The crops are the PNGs of a directory, or rendered names without one. The OCR cache
+is disabled for the pooled reads so every call reaches Tesseract.
+
+    python benchmarks/bench_ocr_engines.py [crop_dir] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from PIL import Image, ImageDraw
+from tesserocr import PyTessBaseAPI
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+import game_assets
+import ocr
+
+WHITELIST = ocr.ALPHABET_WHITELIST + ocr.SPACE_WHITELIST
+
+
+def engine_per_call(image: Image.Image, whitelist: str = "") -> str:
+    """get_text_from_image before the engine pool: a new Tesseract engine for every read"""
+    thresholding = ocr.preprocess_image(image, 3)
+    with PyTessBaseAPI(path=ocr.TESSDATA_PATH) as api:
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+        api.SetPageSegMode(7)
+        api.SetImageBytes(
+            thresholding.tobytes(),
+            thresholding.shape[1],
+            thresholding.shape[0],
+            1,
+            thresholding.shape[1],
+        )
+        text = api.GetUTF8Text()
+    return text.strip()
+
+
+def render_crops(count: int) -> list[Image.Image]:
+    """Renders item names on a dark background, about the size of a shop name crop"""
+    crops: list[Image.Image] = []
+    for name in sorted(game_assets.ALL_ITEMS)[:count]:
+        image = Image.new("RGB", (120, 20), (16, 24, 32))
+        ImageDraw.Draw(image).text((4, 4), name, fill=(230, 230, 230))
+        crops.append(image)
+    return crops
+
+
+def time_reads(read: Callable[[Image.Image, str], str], crops: list, repeat: int) -> float:
+    """Returns the mean seconds per read over every crop, repeat times"""
+    start: float = time.perf_counter()
+    for _ in range(repeat):
+        for crop in crops:
+            read(crop, WHITELIST)
+    return (time.perf_counter() - start) / (repeat * len(crops))
+
+
+def main() -> None:
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("crops", nargs="?", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--count", type=int, default=20)
+    args = parser.parse_args()
+
+    crops: list = (
+        [Image.open(path).convert("RGB") for path in sorted(args.crops.glob("*.png"))]
+        if args.crops
+        else render_crops(args.count)
+    )
+    ocr.OCR_CACHE = ocr.OcrCache(max_size=0)
+    # The first pooled call loads the engine, like the first call of a game would
+    ocr.get_text_from_image(crops[0], WHITELIST)
+
+    fresh: float = time_reads(engine_per_call, crops, args.repeat)
+    pooled: float = time_reads(ocr.get_text_from_image, crops, args.repeat)
+    print(f"{len(crops)} crops, {args.repeat} reads each")
+    print(f"engine per call  {fresh * 1000:8.2f} ms/read")
+    print(f"pooled engine    {pooled * 1000:8.2f} ms/read  ({fresh / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Latency of reading the five shop names with a thread and a Tesseract pass per slot, as
+before batching, against ocr.get_text_lines_from_image reading all of them in one pass.
+
+The frame is a full game window screenshot, or a rendered shop without one. Both readers
+resolve names the current way and the OCR cache is disabled, so only the OCR differs.
+
+    python benchmarks/bench_shop_reader.py [screenshot.png] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+import arena_functions
+import frame_capture
+import ocr
+import screen_coords
+from comps import CompsManager
+from frame_capture import Frame
+from simulator import synthetic_champions
+from vec4 import Vec4
+
+
+def get_champ(
+    screen_capture: Image.Image,
+    name_pos: Vec4,
+    shop_pos: int,
+    shop_array: list,
+    comps: CompsManager,
+) -> None:
+    """Reads one shop slot and appends its position and champion name"""
+    champ = screen_capture.crop(name_pos.get_coords())
+    champ: str = ocr.get_text_from_image(
+        image=champ,
+        whitelist=ocr.ALPHABET_WHITELIST + ocr.SPACE_WHITELIST + ocr.SYMBOL_WHITELIST,
+    )
+    shop_array.append((shop_pos, arena_functions.valid_champ(champ, comps)))
+
+
+def thread_per_slot(comps: CompsManager, frame: Optional[Frame] = None) -> list:
+    """arena_functions.get_shop before batching: a thread and a Tesseract pass per slot"""
+    screen_capture = frame_capture.capture(screen_coords.SHOP_POS, frame)
+    shop: list = []
+    thread_list: list = []
+    for shop_index, name_pos in enumerate(screen_coords.CHAMP_NAME_POS):
+        thread = threading.Thread(
+            target=get_champ, args=(screen_capture, name_pos, shop_index, shop, comps)
+        )
+        thread_list.append(thread)
+    for thread in thread_list:
+        thread.start()
+    for thread in thread_list:
+        thread.join()
+    return sorted(shop)
+
+
+def render_shop(names: list[str]) -> Image.Image:
+    """Draws the names into their shop slots on an empty game window"""
+    window: tuple = screen_coords.GAME_WINDOW_POS.get_coords()
+    image = Image.new("RGB", (window[2] - window[0], window[3] - window[1]), (16, 24, 32))
+    draw = ImageDraw.Draw(image)
+    shop: tuple = screen_coords.SHOP_POS.get_coords()
+    for name, position in zip(names, screen_coords.CHAMP_NAME_POS):
+        box: tuple = position.get_coords()
+        draw.text(
+            (shop[0] - window[0] + box[0] + 4, shop[1] - window[1] + box[1] + 4),
+            name,
+            fill=(230, 230, 230),
+        )
+    return image
+
+
+def time_reads(read: Callable[[CompsManager, Frame], list], comps, frame, repeat) -> float:
+    """Returns the mean seconds per shop read"""
+    start: float = time.perf_counter()
+    for _ in range(repeat):
+        read(comps, frame)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("screenshot", nargs="?", type=Path)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    comps = CompsManager()
+    comps.champions = synthetic_champions(random.Random(0))
+    image: Image.Image = (
+        Image.open(args.screenshot).convert("RGB")
+        if args.screenshot
+        else render_shop(sorted(comps.champions)[:5])
+    )
+    frame = Frame(image, screen_coords.GAME_WINDOW_POS.get_coords())
+
+    ocr.OCR_CACHE = ocr.OcrCache(max_size=0)
+    # Load the engines both readers use before timing them
+    thread_per_slot(comps, frame)
+    arena_functions.get_shop(comps, frame)
+
+    threaded: float = time_reads(thread_per_slot, comps, frame, args.repeat)
+    batched: float = time_reads(arena_functions.get_shop, comps, frame, args.repeat)
+    print(f"shop read {args.repeat} times: {arena_functions.get_shop(comps, frame)}")
+    print(f"thread per slot  {threaded * 1000:8.2f} ms/shop")
+    print(f"one batched pass {batched * 1000:8.2f} ms/shop  ({threaded / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
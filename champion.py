@@ -18,7 +18,8 @@ class Champion:
         final_comp: bool,
         trait1: str,
         trait2: str,
-        trait3: str
+        trait3: str,
+        trait_mask: int = 0,
     ) -> None:
         self.name: str = name
         self.coords: tuple = coords
@@ -30,6 +31,8 @@ class Champion:
         self.max_item_slots: int = 3
         self.final_comp: bool = final_comp
         self.traits = [trait1, trait2, trait3]
+        # Bitset of the traits, see symbols.SymbolTable
+        self.trait_mask: int = trait_mask
 
     def __str__(self) -> str:
         return (
@@ -52,10 +55,6 @@ class Champion:
         max_item_slots = 3
         return len(self.completed_items) < max_item_slots
 
-    def check_trait(self, item: str) -> bool:
-        """Check if the champion has a specific trait based on the item passed."""
-        # Remove "Emblem" from the item name
-        trait_to_check = item.replace("Emblem", "")
-
-        # Check if the trait exists in the champion's traits
-        return trait_to_check in self.traits
+    def check_trait(self, trait_mask: int) -> bool:
+        """Check if the champion has any of the traits in the bitset, such as an emblem's."""
+        return bool(self.trait_mask & trait_mask)
@@ -3,7 +3,85 @@ This module contains the CompsManager class, which manages team compositions and
 """
 
 import random
-from typing import Dict, List, Union
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Sequence, Union
+
+import game_assets
+from name_index import NameIndex
+from symbols import SymbolTable
+
+# Copies of a champion needed for each star level
+COPIES_PER_LEVEL: dict[int, int] = {1: 1, 2: 3, 3: 9}
+# Board slots the bot places champions on
+BOARD_SLOTS = 27
+
+
+@dataclass(frozen=True)
+class ChampionPlan:
+    """What a comp wants from one champion"""
+
+    name: str
+    level: int
+    board_position: int
+    items: tuple[str, ...]
+    final_comp: bool
+
+
+@dataclass(frozen=True)
+class CompPlan:
+    """A comp compiled into the lookups the arena makes while playing it"""
+
+    name: str
+    champions: Mapping[str, ChampionPlan]
+    # Copies to buy per champion, in comp order
+    buy_counts: tuple[tuple[str, int], ...]
+    # Bit n is set when board slot n belongs to a comp champion
+    board_mask: int
+    # Board slots left for champions outside the comp, in order
+    free_slots: tuple[int, ...]
+    # How many of each item the builds of the comp ask for
+    item_demand: Mapping[str, int]
+    augments: tuple[str, ...]
+
+
+def compile_comp(comp: List[Union[str, Dict[str, Dict[str, int]]]]) -> CompPlan:
+    """
+    Compile a [name, champions, augments] comp into a CompPlan.
+
+    Raises:
+    - ValueError: If a champion's level isn't 1, 2 or 3.
+    """
+    champions: dict[str, ChampionPlan] = {}
+    board_mask = 0
+    item_demand: Counter = Counter()
+    for champion, champion_data in comp[1].items():
+        if champion_data["level"] not in COPIES_PER_LEVEL:
+            raise ValueError("Comps.py | Champion level must be a valid level (1-3)")
+        champions[champion] = ChampionPlan(
+            name=champion,
+            level=champion_data["level"],
+            board_position=champion_data["board_position"],
+            items=tuple(champion_data.get("items", [])),
+            final_comp=champion_data["final_comp"],
+        )
+        board_mask |= 1 << champion_data["board_position"]
+        item_demand.update(champions[champion].items)
+    return CompPlan(
+        name=comp[0],
+        champions=MappingProxyType(champions),
+        buy_counts=tuple(
+            (champion, COPIES_PER_LEVEL[plan.level])
+            for champion, plan in champions.items()
+        ),
+        board_mask=board_mask,
+        free_slots=tuple(
+            slot for slot in range(BOARD_SLOTS) if not board_mask >> slot & 1
+        ),
+        item_demand=MappingProxyType(dict(item_demand)),
+        augments=tuple(comp[2]) if len(comp) > 2 else (),
+    )
 
 
 class CompsManager:
@@ -18,18 +96,43 @@ class CompsManager:
         self.sequence: list = []
         self.augments: list = []
         self.comps_loaded: list[str, dict[str, dict[str,]]] = []
-        self.champions: dict[str, dict[str, int]] = {}
+        self._champions: dict[str, dict[str, int]] = {}
+        self.champion_index: NameIndex = NameIndex([], min_ratio=0.7)
+        self.symbols: SymbolTable = SymbolTable({})
+        self.plans: dict[int, CompPlan] = {}
+
+    @property
+    def champions(self) -> dict[str, dict[str, int]]:
+        """
+        Champion data keyed by champion name.
+
+        Returns:
+        - dict[str, dict[str, int]]: Gold cost, board size and traits of every champion.
+        """
+        return self._champions
+
+    @champions.setter
+    def champions(self, champions: dict[str, dict[str, int]]) -> None:
+        self._champions = champions
+        self.champion_index = NameIndex(
+            champions,
+            min_ratio=0.7,
+            corrections=game_assets.CHAMPION_NAME_CORRECTIONS,
+        )
+        self.symbols = SymbolTable(champions)
 
     def set_comps_loaded(
-        self, input_data: List[Union[str, Dict[str, Dict[str, int]]]]
+        self, input_data: Sequence[List[Union[str, Dict[str, Dict[str, int]]]]]
     ) -> None:
         """
         Set the loaded compositions.
 
         Args:
-        - input_data (List[Union[str, Dict[str, Dict[str, int]]]]): Input data containing compositions.
+        - input_data (Sequence[List[Union[str, Dict[str, Dict[str, int]]]]]): Input data containing
+          compositions, a comps_store.CompRecords reads each one when it's first used.
         """
         self.comps_loaded = input_data
+        self.plans = {}
 
     def select_next_comp(self) -> None:
         """
@@ -57,6 +160,31 @@ class CompsManager:
         """
         return self.comps_loaded[self.index_current]
 
+    def current_plan(self) -> CompPlan:
+        """
+        Get the compiled plan of the currently selected composition.
+
+        Each comp is compiled the first time it's selected and reused after that.
+
+        Returns:
+        - CompPlan: Plan of the currently selected composition.
+        """
+        if self.index_current not in self.plans:
+            self.plans[self.index_current] = compile_comp(self.current_comp())
+        return self.plans[self.index_current]
+
+    def resolve_champion(self, name: str) -> str:
+        """
+        Resolve an OCR read of a champion name to a known champion.
+
+        Args:
+        - name (str): Champion name as read from the screen.
+
+        Returns:
+        - str: Name of the champion, or an empty string if nothing is close enough.
+        """
+        return self.champion_index.resolve(name) or ""
+
     def champion_board_size(self, champion: str) -> int:
         """
         Get the board size of a specific champion.
@@ -88,19 +216,7 @@ class CompsManager:
         Returns:
         - dict: Dictionary of champions to buy.
         """
-        champs_to_buy: dict = {}
-        for champion, champion_data in self.current_comp()[1].items():
-            if champion_data["level"] == 1:
-                champs_to_buy[champion] = 1
-            elif champion_data["level"] == 2:
-                champs_to_buy[champion] = 3
-            elif champion_data["level"] == 3:
-                champs_to_buy[champion] = 9
-            else:
-                raise ValueError(
-                    "Comps.py | Champion level must be a valid level (1-3)"
-                )
-        return champs_to_buy
+        return dict(self.current_plan().buy_counts)
 
     def get_unknown_slots(self) -> List[int]:
         """
@@ -109,8 +225,4 @@ class CompsManager:
         Returns:
         - list: List of slots without champions.
         """
-        container: List[int] = [
-            champion_data["board_position"]
-            for _, champion_data in self.current_comp()[1].items()
-        ]
-        return [n for n in range(27) if n not in container]
+        return list(self.current_plan().free_slots)
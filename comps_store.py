@@ -0,0 +1,145 @@
+"""
+Versioned on-disk store of the loaded comps: one record file per comp and a manifest listing them
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Iterator, Optional, Sequence
+
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def write_atomic(path: str, content: str) -> None:
+    """Writes a file through a temporary one so a crash never leaves half of it"""
+    temporary: str = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def comp_hash(comp: list) -> str:
+    """Returns the content hash of a comp, which also names its record file"""
+    return hashlib.sha256(json.dumps(comp).encode("utf-8")).hexdigest()
+
+
+class CompRecords(Sequence):
+    """The comps of a manifest, each record is read from disk the first time it's indexed.
+
+    Behaves like the list of [name, champions, augments] entries it replaces.
+    """
+
+    def __init__(self, folder: str, entries: list[dict]) -> None:
+        self.folder: str = folder
+        self.entries: list[dict] = entries
+        self.loaded: dict[int, list] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> list:
+        index = range(len(self.entries))[index]
+        if index not in self.loaded:
+            path: str = os.path.join(self.folder, self.entries[index]["record"])
+            with open(path, encoding="utf-8") as file:
+                self.loaded[index] = json.load(file)
+        return self.loaded[index]
+
+    def __iter__(self) -> Iterator[list]:
+        return (self[index] for index in range(len(self.entries)))
+
+    def summaries(self) -> list[tuple[str, list[str]]]:
+        """Returns the name and champions of every comp without reading any record"""
+        return [(entry["name"], entry["champions"]) for entry in self.entries]
+
+
+class CompsStore:
+    """The comps of one TFT set, kept under their own folder"""
+
+    def __init__(self, folder: str) -> None:
+        self.folder: str = folder
+        self.manifest_path: str = os.path.join(folder, MANIFEST_NAME)
+
+    def manifest(self) -> Optional[dict]:
+        """Returns the manifest, None if the store is empty or from another version"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                manifest: dict = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != STORE_VERSION:
+            return None
+        return manifest
+
+    def comps(self) -> Optional[CompRecords]:
+        """Returns the stored comps, loaded lazily, or None if there are none"""
+        manifest: Optional[dict] = self.manifest()
+        if manifest is None:
+            return None
+        return CompRecords(self.folder, manifest["comps"])
+
+    def update(self, source: str, comps: list[tuple[str, list]]) -> tuple[int, bool]:
+        """Replaces the stored comps with freshly fetched (source URL, comp) pairs.
+
+        Only comps whose content changed get a new record, records no longer
+        listed are deleted. Returns how many records were written and whether
+        the list of comp names changed.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        previous: Optional[dict] = self.manifest()
+        previous_entries: list[dict] = previous["comps"] if previous else []
+        fetched: float = time.time()
+        entries: list[dict] = []
+        written = 0
+        for comp_source, comp in comps:
+            digest: str = comp_hash(comp)
+            record: str = digest + ".json"
+            if not os.path.isfile(os.path.join(self.folder, record)):
+                write_atomic(os.path.join(self.folder, record), json.dumps(comp))
+                written += 1
+            entries.append(
+                {
+                    "name": comp[0],
+                    "champions": list(comp[1]),
+                    "source": comp_source,
+                    "fetched": fetched,
+                    "hash": digest,
+                    "record": record,
+                }
+            )
+        write_atomic(
+            self.manifest_path,
+            json.dumps(
+                {
+                    "version": STORE_VERSION,
+                    "source": source,
+                    "fetched": fetched,
+                    "comps": entries,
+                },
+                indent=1,
+            ),
+        )
+
+        kept: set[str] = {entry["record"] for entry in entries}
+        for file_name in os.listdir(self.folder):
+            if file_name.endswith(".json") and file_name != MANIFEST_NAME:
+                if file_name not in kept:
+                    os.remove(os.path.join(self.folder, file_name))
+        names_changed: bool = [entry["name"] for entry in entries] != [
+            entry["name"] for entry in previous_entries
+        ]
+        return written, names_changed
+
+
+def last_update(folder: str) -> Optional[float]:
+    """Returns when any set's comps under the folder were last refreshed, None if never"""
+    if not os.path.isdir(folder):
+        return None
+    times: list[float] = []
+    for set_folder in os.listdir(folder):
+        manifest: Optional[dict] = CompsStore(os.path.join(folder, set_folder)).manifest()
+        if manifest is not None:
+            times.append(manifest["fetched"])
+    return max(times, default=None)
@@ -0,0 +1,190 @@
+"""
+Template matcher for the fixed-font digit strings (gold, level, round and timer)
+that reads them without going through Tesseract
+"""
+
+import threading
+import zlib
+from typing import Optional
+
+import cv2
+import numpy as np
+
+GLYPH_WIDTH = 12
+GLYPH_HEIGHT = 16
+MIN_CONFIDENCE = 0.92
+MAX_TEMPLATES_PER_LABEL = 3
+MIN_GLYPH_AREA = 6
+# Distinct crops a label has to lead a glyph's other labels by before it becomes a template
+CONFIRMATIONS = 3
+# Unconfirmed glyph pools kept per atlas, the oldest is dropped first
+MAX_POOLS = 64
+
+
+class DigitAtlas:
+    """Glyph templates for one region at one resolution, labelled by character"""
+
+    def __init__(self) -> None:
+        self.labels: list[str] = []
+        self.templates: np.ndarray = np.empty(
+            (0, GLYPH_WIDTH * GLYPH_HEIGHT), dtype=np.float32
+        )
+
+    def add(self, label: str, glyph: np.ndarray) -> None:
+        """Adds a normalized glyph vector as a template for the label."""
+        if self.labels.count(label) >= MAX_TEMPLATES_PER_LABEL:
+            return
+        self.labels.append(label)
+        self.templates = np.vstack((self.templates, glyph))
+
+    def classify(self, glyphs: np.ndarray) -> tuple[str, float]:
+        """Matches every glyph against every template in one pass.
+
+        Returns the text and the lowest per-glyph correlation as its confidence.
+        """
+        scores: np.ndarray = glyphs @ self.templates.T
+        best: np.ndarray = scores.argmax(axis=1)
+        text: str = "".join(self.labels[index] for index in best)
+        return text, float(scores[np.arange(len(best)), best].min())
+
+
+class GlyphVotes:
+    """Glyphs Tesseract labelled that aren't trusted as templates yet.
+
+    Similar glyphs share a pool, and every distinct crop a pool's glyph was seen
+    in votes for the label it was read as. A label is trusted once it leads the
+    pool's other labels by CONFIRMATIONS votes, so a single misread, or the same
+    misread of an unchanged crop, never becomes a template.
+    """
+
+    def __init__(self) -> None:
+        self.pools: list[tuple[np.ndarray, dict[str, set[int]]]] = []
+
+    def vote(self, label: str, glyph: np.ndarray, crop: int) -> bool:
+        """Counts the read of a glyph from a crop, returns whether the label is now trusted"""
+        for index, (pooled, votes) in enumerate(self.pools):
+            if float(pooled @ glyph) >= MIN_CONFIDENCE:
+                break
+        else:
+            if len(self.pools) >= MAX_POOLS:
+                self.pools.pop(0)
+            votes = {}
+            self.pools.append((glyph, votes))
+            index = len(self.pools) - 1
+        votes.setdefault(label, set()).add(crop)
+        others: int = max(
+            (len(crops) for other, crops in votes.items() if other != label), default=0
+        )
+        if len(votes[label]) - others < CONFIRMATIONS:
+            return False
+        del self.pools[index]
+        return True
+
+
+def crop_id(thresholding: np.ndarray) -> int:
+    """Identifies a crop by its pixels, so reading the same crop again isn't a new vote"""
+    return zlib.crc32(thresholding.tobytes())
+
+
+_ATLASES: dict[tuple, DigitAtlas] = {}
+_VOTES: dict[tuple, GlyphVotes] = {}
+_ATLASES_LOCK = threading.Lock()
+
+
+def atlas_key(thresholding: np.ndarray, whitelist: str) -> tuple:
+    """Atlases are kept per crop size, which pins down both the region and the resolution."""
+    return thresholding.shape, whitelist
+
+
+def segment_glyphs(thresholding: np.ndarray) -> np.ndarray:
+    """Splits a thresholded image into normalized glyph vectors ordered left to right.
+
+    Glyphs are cut from the full text line height so that short glyphs like '-'
+    keep their position instead of being stretched over the whole template.
+    """
+    foreground: np.ndarray = (thresholding < 128).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(foreground, connectivity=8)
+    boxes: list = [
+        stats[index]
+        for index in range(1, count)
+        if stats[index][cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA
+    ]
+    if not boxes:
+        return np.empty((0, GLYPH_WIDTH * GLYPH_HEIGHT), dtype=np.float32)
+    boxes.sort(key=lambda box: box[cv2.CC_STAT_LEFT])
+
+    # Merge components that overlap horizontally, they belong to the same glyph
+    columns: list[list[int]] = []
+    for box in boxes:
+        left: int = box[cv2.CC_STAT_LEFT]
+        right: int = left + box[cv2.CC_STAT_WIDTH]
+        if columns and left < columns[-1][1]:
+            columns[-1][1] = max(columns[-1][1], right)
+        else:
+            columns.append([left, right])
+
+    top: int = min(box[cv2.CC_STAT_TOP] for box in boxes)
+    bottom: int = max(box[cv2.CC_STAT_TOP] + box[cv2.CC_STAT_HEIGHT] for box in boxes)
+    glyphs: np.ndarray = np.stack(
+        [
+            cv2.resize(
+                foreground[top:bottom, left:right].astype(np.float32),
+                (GLYPH_WIDTH, GLYPH_HEIGHT),
+                interpolation=cv2.INTER_AREA,
+            ).reshape(-1)
+            for left, right in columns
+        ]
+    )
+    glyphs -= glyphs.mean(axis=1, keepdims=True)
+    norms: np.ndarray = np.linalg.norm(glyphs, axis=1, keepdims=True)
+    return glyphs / np.maximum(norms, 1e-6)
+
+
+def read_digits(thresholding: np.ndarray, whitelist: str) -> Optional[str]:
+    """Returns the text if every glyph matches the atlas confidently, None otherwise.
+
+    Characters that have not been learned yet match poorly and fall below the
+    confidence threshold, so the caller falls back to Tesseract for them.
+    """
+    atlas: Optional[DigitAtlas] = _ATLASES.get(atlas_key(thresholding, whitelist))
+    if atlas is None:
+        return None
+    glyphs: np.ndarray = segment_glyphs(thresholding)
+    if len(glyphs) == 0:
+        return None
+    text, confidence = atlas.classify(glyphs)
+    if confidence < MIN_CONFIDENCE:
+        return None
+    return text
+
+
+def learn(thresholding: np.ndarray, whitelist: str, text: str) -> None:
+    """Votes the glyphs of a crop with the text Tesseract read for it.
+
+    A glyph only becomes a template once repeated reads of different crops agree on it.
+    """
+    if not text or any(char not in whitelist for char in text):
+        return
+    glyphs: np.ndarray = segment_glyphs(thresholding)
+    if len(glyphs) != len(text):
+        return
+    key: tuple = atlas_key(thresholding, whitelist)
+    crop: int = crop_id(thresholding)
+    with _ATLASES_LOCK:
+        votes: GlyphVotes = _VOTES.setdefault(key, GlyphVotes())
+        for label, glyph in zip(text, glyphs):
+            if votes.vote(label, glyph, crop):
+                _ATLASES.setdefault(key, DigitAtlas()).add(label, glyph)
+
+
+def learn_labelled(thresholding: np.ndarray, whitelist: str, text: str) -> None:
+    """Adds the glyphs of a crop whose text is known to be right straight to the atlas"""
+    glyphs: np.ndarray = segment_glyphs(thresholding)
+    if len(glyphs) != len(text) or any(char not in whitelist for char in text):
+        return
+    with _ATLASES_LOCK:
+        atlas: DigitAtlas = _ATLASES.setdefault(
+            atlas_key(thresholding, whitelist), DigitAtlas()
+        )
+        for label, glyph in zip(text, glyphs):
+            atlas.add(label, glyph)
@@ -0,0 +1,53 @@
+"""
+Single entry point for screen captures, and the Frame class that lets several
+regions of interest be cropped out of one screenshot of the game window
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import ImageGrab, Image
+
+import screen_coords
+from vec4 import Vec4
+
+
+def grab(bbox: tuple) -> Image:
+    """Captures the given (x, y, x+w, y+h) screen box."""
+    return ImageGrab.grab(bbox=bbox)
+
+
+@dataclass(frozen=True, eq=False)
+class Frame:
+    """One screenshot of the game window that screen_coords regions are cropped from"""
+
+    image: Image
+    bbox: tuple
+
+    @classmethod
+    def grab_window(cls) -> "Frame":
+        """Captures the whole game window in a single grab."""
+        bbox: tuple = screen_coords.GAME_WINDOW_POS.get_coords()
+        return cls(grab(bbox), bbox)
+
+    def crop_coords(self, coords: tuple) -> Image:
+        """Crops absolute (x, y, x+w, y+h) screen coordinates out of the frame."""
+        return self.image.crop(
+            (
+                coords[0] - self.bbox[0],
+                coords[1] - self.bbox[1],
+                coords[2] - self.bbox[0],
+                coords[3] - self.bbox[1],
+            )
+        )
+
+    def crop(self, position: Vec4) -> Image:
+        """Crops a screen_coords region out of the frame."""
+        return self.crop_coords(position.get_coords())
+
+
+def capture(position: Vec4, frame: Optional[Frame] = None) -> Image:
+    """Returns the region from the frame if one is given, otherwise grabs it from the screen."""
+    if frame is not None:
+        return frame.crop(position)
+    return grab(position.get_coords())
@@ -2,11 +2,12 @@
 Handles tasks that happen each game round
 """
 
-import importlib
 import multiprocessing
 import random
 import time
+from functools import partial
 from time import perf_counter, sleep
+from typing import Optional
 
 import win32gui
 from win32con import BM_CLICK
@@ -14,14 +15,24 @@ from win32con import BM_CLICK
 import arena_functions
 import game_assets
 import game_functions
+import perception
 import screen_coords
 import settings
 from arena import Arena
 from comps import CompsManager
+from perception import GameState
+from phase_clock import PhaseClock
+from round_schedule import ROUND_POSITIONS, RoundFlag, RoundTable, RoundType
+from round_scheduler import RoundScheduler, Task
+from screen_watcher import ScreenWatcher
 from vec2 import Vec2
 from vec4 import Vec4
 
 
+# Seconds the game loop waits for a screen change before checking the game anyway
+WATCH_HEARTBEAT = 2.0
+
+
 class Game:
     """Game class that handles game logic such as round tasks"""
 
@@ -34,15 +45,18 @@ class Game:
             message_queue (multiprocessing.Queue): The message queue.
             comps (CompsManager): The CompsManager instance.
         """
-        importlib.reload(game_assets)
         self.message_queue = message_queue
         self.comps_manager = comps
         self.arena = Arena(self.message_queue, comps)
         self.round: list[str, int] = ["0-0", 0]
+        self.round_table = RoundTable()
         self.time = None
         self.forfeit_time = settings.FORFEIT_TIME + random.randint(50, 150)
         self.found_window = False
         self.start_time_of_round = None
+        self.phase_clock = PhaseClock()
+        self.watcher = ScreenWatcher()
+        self.scheduler = RoundScheduler()
         self.fast8_leveling = False
 
         print("\n[!] Searching for game window")
@@ -116,15 +130,8 @@ class Game:
     def game_loop(self) -> None:
         """Loop that runs while the game is active, handles calling the correct tasks for round and exiting game."""
         self.start_time_of_round = time.time()
-        labels = [
-            (
-                f"{arena_functions.get_seconds_remaining()}",
-                screen_coords.SECONDS_REMAINING_LOC.get_coords(),
-                -40,
-                -10,
-            )
-        ]
-        self.message_queue.put(("LABEL", labels))
+        self.phase_clock.observe(arena_functions.get_seconds_remaining())
+        self.show_seconds_remaining()
 
         ran_round: str = None
         last_game_health: int = 100
@@ -148,19 +155,12 @@ class Game:
                 break
             last_game_health = game_health
 
-            self.round = game_functions.get_round()
+            state: GameState = perception.capture_game_state(clock=self.phase_clock)
+            self.round = list(state.round)
 
             # Display the seconds remaining for this phase in real-time.
             self.start_time_of_round = time.time()
-            labels = [
-                (
-                    f"{arena_functions.get_seconds_remaining()}",
-                    screen_coords.SECONDS_REMAINING_LOC.get_coords(),
-                    -40,
-                    -10,
-                )
-            ]
-            self.message_queue.put(("LABEL", labels))
+            self.show_seconds_remaining(state.seconds_remaining)
             if (
                 settings.FORFEIT
                 and perf_counter() - self.start_time > self.forfeit_time
@@ -172,91 +172,64 @@ class Game:
                 print(
                     f"\n[Comps] Stick to [{','.join(self.comps_manager.current_comp()[1])}] "
                 )
-                if self.round[0] in game_assets.PORTAL_ROUND:
+                round_type: RoundType = self.round_table.round_type(self.round[0])
+                if round_type == RoundType.PORTAL:
                     self.portal_round()
                     ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.PVP_ROUND:
+                elif round_type == RoundType.PVP:
                     game_functions.default_pos()
                     self.pvp_round()
                     ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.PVE_ROUND:
+                elif round_type == RoundType.PVE:
                     game_functions.default_pos()
                     self.pve_round()
                     ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.CAROUSEL_ROUND:
+                elif round_type == RoundType.CAROUSEL:
                     self.carousel_round()
                     ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.SECOND_ROUND:
+                elif round_type == RoundType.SECOND:
                     self.second_round()
                     ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.ENCOUNTER_ROUNDS:
+                elif round_type == RoundType.ENCOUNTER:
                     print(f"\n[Encounter Round] {self.round[0]}")
                     print("  Do nothing")
                     self.message_queue.put("CLEAR")
                     self.arena.check_health()
                     ran_round: str = self.round[0]
-                if self.round[1] == 1 and self.round[0].split("-")[1] == "1":
+                if (
+                    self.round[1] == 1
+                    and ROUND_POSITIONS.get(self.round[0], (0, 0))[1] == 1
+                ):
                     print("\n[Encounter round setup]")
                     self.encounter_round_setup()
-            sleep(0.5)
+            # Sleep until the round banner changes, the timer ticking only updates the
+            # label and reads the timer when the phase clock runs out or needs a recheck
+            while self.watcher.wait(WATCH_HEARTBEAT) == {"timer"}:
+                self.phase_clock.sync(
+                    partial(arena_functions.get_seconds_remaining, self.watcher.frame),
+                    self.round[0],
+                )
+                self.show_seconds_remaining()
+
+    def show_seconds_remaining(self, seconds: Optional[int] = None) -> None:
+        """Puts the seconds remaining, the phase clock's by default, on the overlay"""
+        labels = [
+            (
+                f"{self.phase_clock.seconds() if seconds is None else seconds}",
+                screen_coords.SECONDS_REMAINING_LOC.get_coords(),
+                -40,
+                -10,
+            )
+        ]
+        self.message_queue.put(("LABEL", labels))
 
     def encounter_round_setup(self) -> None:
-        """Remove rounds from game_assets and add it back by checking round message"""
-        game_assets.CAROUSEL_ROUND = {
-            carousel_round
-            for carousel_round in game_assets.CAROUSEL_ROUND
-            if not carousel_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.PVE_ROUND = {
-            pve_round
-            for pve_round in game_assets.PVE_ROUND
-            if not pve_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.PVP_ROUND = {
-            pvp_round
-            for pvp_round in game_assets.PVP_ROUND
-            if not pvp_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.ANVIL_ROUNDS = {
-            anvil_round
-            for anvil_round in game_assets.ANVIL_ROUNDS
-            if not anvil_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.ITEM_PLACEMENT_ROUNDS = {
-            item_placement_round
-            for item_placement_round in game_assets.ITEM_PLACEMENT_ROUNDS
-            if not item_placement_round.startswith(self.round[0].split("-")[0])
-        }
-        for index, round_msg in enumerate(game_functions.check_encounter_round()):
-            print(f"  Round {self.round[0].split('-')[0]}-{str(index + 1)}: {round_msg.upper()} ROUND")
-            if index == 0:
-                continue
-            if round_msg == "carousel":
-                game_assets.CAROUSEL_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-                game_assets.ANVIL_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 2)
-                )
-                game_assets.ITEM_PLACEMENT_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 2)
-                )
-            elif round_msg == "pve":
-                game_assets.PVE_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-            elif round_msg == "pvp":
-                game_assets.PVP_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-            elif round_msg == "encounter":
-                game_assets.ENCOUNTER_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-                if index+1 == 2 and 3 <= int(self.round[0].split("-")[0]) <= 4:
-                    game_assets.AUGMENT_ROUNDS.add(
-                        self.round[0].split("-")[0] + "-" + str(index + 2)
-                    )
+        """Relabel the rounds of this stage by checking the round messages"""
+        stage: int = ROUND_POSITIONS[self.round[0]][0]
+        round_messages: list[str] = game_functions.check_encounter_round()
+        for index, round_msg in enumerate(round_messages):
+            print(f"  Round {stage}-{index + 1}: {round_msg.upper()} ROUND")
+        self.round_table.apply_encounters(stage, round_messages)
 
     def portal_round(self) -> None:
         """Waits for Region Augment decision."""
@@ -297,7 +270,7 @@ class Game:
         self.start_round_tasks()
         sleep(0.8)
         seconds_in_round = 30
-        if self.round[0] in game_assets.AUGMENT_ROUNDS:
+        if self.round_table.has(self.round[0], RoundFlag.AUGMENT):
             sleep(1)
             self.arena.augment_roll = True
             self.arena.pick_augment()
@@ -322,26 +295,16 @@ class Game:
         #if self.round[0] == "4-7":
         #    self.arena.check_dummy()
 
-        self.arena.fix_bench_state()
-        self.arena.spend_gold()
-
-        if (
-            seconds_in_round - (time.time() - self.start_time_of_round) >= 5.0
-        ):  # number picked randomly
-            self.arena.move_champions()
-        else:
-            print("  Less than 5 seconds left in planning. No time to move champions.")
-        if (
-            seconds_in_round - (time.time() - self.start_time_of_round) >= 5.0
-        ):  # number picked randomly
-            self.arena.replace_unknown()
-        else:
-            print(
-                "  Less than 5 seconds left in planning. No time to replace unknown units."
-            )
+        tasks: list[Task] = [
+            Task("fix_bench_state", self.arena.fix_bench_state, required=True),
+            Task("spend_gold", self.arena.spend_gold, required=True),
+            Task("move_champions", self.arena.move_champions, priority=3),
+            Task("replace_unknown", self.arena.replace_unknown, priority=1),
+        ]
         if self.arena.final_comp:
-            self.arena.final_comp_check()
-        self.arena.bench_cleanup()
+            tasks.append(Task("final_comp_check", self.arena.final_comp_check, priority=2))
+        tasks.append(Task("bench_cleanup", self.arena.bench_cleanup, required=True))
+        self.scheduler.run(self.round[0], tasks, self.round_deadline(seconds_in_round))
         self.end_round_tasks()
 
     def pvp_round(self) -> None:
@@ -350,7 +313,7 @@ class Game:
         self.start_round_tasks()
         sleep(0.8)
         seconds_in_round = 30
-        if self.round[0] in game_assets.AUGMENT_ROUNDS:
+        if self.round_table.has(self.round[0], RoundFlag.AUGMENT):
             seconds_in_round = 50
             sleep(1)
             self.arena.augment_roll = True
@@ -358,72 +321,69 @@ class Game:
             sleep(2.5)
             #self.arena.check_dummy()
 
-        if self.fast8_leveling:
-            if self.round[0] in game_assets.FAST8_LEVEL_ROUNDS:
-                target_level = game_assets.FAST8_LEVEL_ROUNDS[self.round[0]]
+        target_level: int = self.round_table.level_target(
+            self.round[0], fast8=self.fast8_leveling
+        )
+        if target_level and target_level >= arena_functions.get_level_via_https_request():
+            stop_seconds = 10
+            self.level_up(target_level, stop_seconds)
 
-                if target_level >= arena_functions.get_level_via_https_request():
-                    stop_seconds = 10
-                    self.level_up(target_level, stop_seconds)
-        else:
-            if self.round[0] in game_assets.NORMAL_LEVEL_ROUNDS:
-                target_level = game_assets.NORMAL_LEVEL_ROUNDS[self.round[0]]
-
-                if target_level >= arena_functions.get_level_via_https_request():
-                    stop_seconds = 10
-                    self.level_up(target_level, stop_seconds)
-
-        if self.round[0] in game_assets.PICKUP_ROUNDS:
+        pickup_round: bool = self.round_table.has(self.round[0], RoundFlag.PICKUP)
+        if pickup_round:
             print("  Picking up items")
             game_functions.pickup_items()
 
-        self.arena.fix_bench_state()
-        self.arena.bench_cleanup()
-        if self.round[0] in game_assets.ANVIL_ROUNDS:
-            self.arena.clear_anvil()
-        self.arena.spend_gold(speedy=self.round[0] in game_assets.PICKUP_ROUNDS)
-        if (
-            seconds_in_round - (time.time() - self.start_time_of_round) >= 3.0
-        ):  # number picked randomly
-            self.arena.move_champions()
-        else:
-            print("  Less than 3 seconds left in planning. No time to move champions.")
-        if (
-            seconds_in_round - (time.time() - self.start_time_of_round) >= 3.0
-        ):  # number picked randomly
-            self.arena.replace_unknown()
-        else:
-            print(
-                "  Less than 3 seconds left in planning. No time to replace unknown units."
-            )
+        tasks: list[Task] = [
+            Task("fix_bench_state", self.arena.fix_bench_state, required=True),
+            Task("bench_cleanup", self.arena.bench_cleanup, required=True),
+        ]
+        if self.round_table.has(self.round[0], RoundFlag.ANVIL):
+            tasks.append(Task("clear_anvil", self.arena.clear_anvil, required=True))
+        tasks += [
+            Task(
+                "spend_gold",
+                partial(
+                    self.arena.spend_gold,
+                    speedy=pickup_round,
+                ),
+                required=True,
+            ),
+            Task("move_champions", self.arena.move_champions, priority=4),
+            Task("replace_unknown", self.arena.replace_unknown, priority=1),
+        ]
         if self.arena.final_comp:
-            self.arena.final_comp_check()
-        self.arena.bench_cleanup()
-
-        if (seconds_in_round - (time.time() - self.start_time_of_round)) >= 3.0 and (
-            self.round[0] in game_assets.ITEM_PLACEMENT_ROUNDS
+            tasks.append(Task("final_comp_check", self.arena.final_comp_check, priority=2))
+        tasks.append(Task("bench_cleanup", self.arena.bench_cleanup, required=True))
+        if (
+            self.round_table.has(self.round[0], RoundFlag.ITEM_PLACEMENT)
             or arena_functions.get_health() <= 15
             or len(self.arena.items) >= 8
         ):
-            self.arena.place_items()
-        else:
-            print(
-                "  Less than 3 seconds left in planning. No time to give items to units."
-            )
+            tasks.append(Task("place_items", self.arena.place_items, priority=3))
+        self.scheduler.run(self.round[0], tasks, self.round_deadline(seconds_in_round))
 
         self.end_round_tasks()
 
+    def round_deadline(self, seconds_in_round: float) -> float:
+        """Returns when the planning phase ends, assuming a full phase if the timer wasn't read"""
+        if self.phase_clock.synced():
+            return self.phase_clock.deadline()
+        return time.monotonic() + seconds_in_round - (
+            time.time() - self.start_time_of_round
+        )
+
     def level_up(self, target_level: int, stop_seconds: float) -> None:
         """Level up to the target level, with a maximum duration to avoid being stuck.
         Args:
             target_level (int): Target level to reach.
             stop_seconds (float): Maximum duration for leveling up."""
         prev_level = arena_functions.get_level_via_https_request()
-        while arena_functions.get_level_via_https_request() < target_level:
+        # Buying XP changes the level right away, so don't act on a polled snapshot here
+        while arena_functions.get_level_via_https_request(max_age=0) < target_level:
             self.arena.buy_xp_round()
             if time.time() - self.start_time_of_round >= stop_seconds:
                 break
-        current_level = arena_functions.get_level_via_https_request()
+        current_level = arena_functions.get_level_via_https_request(max_age=0)
 
         if current_level > prev_level:
             print(f"  [LEVEL UP] Lvl. {current_level} from Lvl. {prev_level}\n")
@@ -431,6 +391,8 @@ class Game:
     def start_round_tasks(self) -> None:
         """Common tasks across rounds that happen at the start"""
         self.message_queue.put("CLEAR")
+        # Income and interest landed since the last round
+        self.arena.gold_ledger.invalidate()
         game_functions.default_pos()
         game_functions.default_tactician_pos()
         self.arena.check_health()
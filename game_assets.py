@@ -578,3 +578,9 @@ AVOID_PORTALS: list[str] = [
     "No portal this game",
     "Duplicator Start",
 ]
+
+# Champion names OCR is known to misread, mapped to the real name
+CHAMPION_NAME_CORRECTIONS: dict[str, str] = {
+    "Ilaoi": "Illaoi",
+    "Xayah & Raka": "Xayah & Rakan",
+}
@@ -2,39 +2,67 @@
 Functions used by the Game class to retrieve relevant data
 """
 
+from functools import partial
 from time import sleep
 from random import randint
+from typing import Any, Optional
 
-from PIL import ImageGrab
+from PIL import Image
 
+import frame_capture
 import game_assets
+import input_sequencer
 import mk_functions
 import ocr
+import round_banner
 import screen_coords
+from frame_capture import Frame
+from input_sequencer import InputSequencer
+from round_banner import RoundMatch
+from vec4 import Vec4
+
+
+# Banner layouts by the number of icons before the round text, in the order Tesseract tries them
+ROUND_LAYOUTS: list[tuple[int, Vec4]] = [
+    (3, screen_coords.ROUND_POS_THREE),
+    (2, screen_coords.ROUND_POS_TWO),
+    (1, screen_coords.ROUND_POS_ONE),
+]
+
+
+def read_round(frame: Optional[Frame] = None) -> RoundMatch:
+    """Reads the round banner with its layout and a confidence score.
+
+    Every layout is matched against every known round in one pass. Only when
+    that match isn't confident are the layouts read in turn the old way, and
+    that read teaches the matcher the glyphs. Those reads count as fully confident.
+    """
+    screen_capture = frame_capture.capture(screen_coords.ROUND_POS, frame)
+    crops: dict[int, Image] = {
+        layout: screen_capture.crop(position.get_coords())
+        for layout, position in ROUND_LAYOUTS
+    }
+    banners: dict[int, Any] = {
+        layout: ocr.preprocess_image(crop, 3) for layout, crop in crops.items()
+    }
+    match: Optional[RoundMatch] = round_banner.match_round(banners)
+    if match is not None and match.confident:
+        return match
+
+    for layout, _ in ROUND_LAYOUTS:
+        game_round: str = ocr.get_digits_from_image(
+            image=crops[layout], whitelist=ocr.ROUND_WHITELIST
+        )
+        if game_round in game_assets.ROUNDS:
+            round_banner.learn(banners[layout], game_round)
+            return RoundMatch(game_round, layout, 1.0)
+    return RoundMatch("999-999", 0, 0.0)
 
 
-def get_round() -> list[str, int]:
+def get_round(frame: Optional[Frame] = None) -> list[str, int]:
     """Gets the current game round"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.ROUND_POS.get_coords())
-    round_three = screen_capture.crop(screen_coords.ROUND_POS_THREE.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_three, whitelist=ocr.ROUND_WHITELIST)
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 3]
-
-    round_two = screen_capture.crop(screen_coords.ROUND_POS_TWO.get_coords())
-    game_round: str = ocr.get_text_from_image(
-        image=round_two, whitelist=ocr.ROUND_WHITELIST
-    )
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 2]
-
-    round_one = screen_capture.crop(screen_coords.ROUND_POS_ONE.get_coords())
-    game_round: str = ocr.get_text_from_image(
-        image=round_one, whitelist=ocr.ROUND_WHITELIST
-    )
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 1]
-    return ["999-999",0]
+    match: RoundMatch = read_round(frame)
+    return [match.round, match.layout]
 
 
 def check_encounter_round() -> list[str]:
@@ -60,20 +88,29 @@ def check_encounter_round() -> list[str]:
     return round_list
 
 
-def pickup_items() -> (
-    None
-):  # Refacor this function to make it more clear whats happening
+def pickup_items() -> None:
     """Picks up items from the board after PVP round"""
-    for index, coords in enumerate(screen_coords.ITEM_PICKUP_LOC):
-        mk_functions.right_click(coords.get_coords())
-        if index == 7:  # Don't need to sleep on final click
-            return
-        if index == 0:
-            sleep(1.2)
-        if index % 2 == 0:
-            sleep(2.0)
-        else:
-            sleep(1.2)
+    # An orb is picked up once it lands on the item bench or as gold,
+    # the old fixed sleeps are only kept as timeouts
+    icons: list[tuple] = [positions[0].get_coords() for positions in screen_coords.ITEM_POS]
+    item_bench: tuple = (
+        min(x_pos for x_pos, _ in icons) - 30,
+        min(y_pos for _, y_pos in icons) - 30,
+        max(x_pos for x_pos, _ in icons) + 30,
+        max(y_pos for _, y_pos in icons) + 30,
+    )
+    sequencer = InputSequencer()
+    for coords, timeout in zip(screen_coords.ITEM_PICKUP_LOC, [3.2, 1.2, 2.0, 1.2]):
+        sequencer.add(
+            partial(mk_functions.right_click, coords.get_coords()),
+            partial(
+                input_sequencer.region_changed,
+                item_bench,
+                screen_coords.GOLD_POS.get_coords(),
+            ),
+            timeout=timeout,
+        )
+    sequencer.run()
 
 
 def get_champ_carousel(tft_round: str) -> None:
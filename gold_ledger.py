@@ -0,0 +1,52 @@
+"""
+Keeps track of the tactician's gold locally so it doesn't have to be read after every purchase
+"""
+
+from typing import Optional
+
+import arena_functions
+
+REROLL_COST = 2
+XP_COST = 4
+
+
+class GoldLedger:
+    """Predicts gold from one verified read plus the known cost of every action.
+
+    The screen is only read again at checkpoints, or after the ledger was invalidated
+    because an action's outcome could not be confirmed.
+    """
+
+    def __init__(self) -> None:
+        self.balance: Optional[int] = None
+
+    def sync(self, gold: Optional[int] = None) -> int:
+        """Sets the balance from a verified value, reading it from the screen if none is given."""
+        self.balance = arena_functions.get_gold() if gold is None else gold
+        return self.balance
+
+    def invalidate(self) -> None:
+        """Forgets the balance so the next read goes to the screen."""
+        self.balance = None
+
+    def gold(self) -> int:
+        """Returns the predicted gold, syncing first if the ledger has no balance."""
+        return self.sync() if self.balance is None else self.balance
+
+    def spend(self, amount: int) -> None:
+        """Subtracts a known cost from the balance."""
+        if self.balance is not None:
+            self.balance -= amount
+
+    def at_least(self, amount: int) -> bool:
+        """Checks the balance against an amount, verifying on screen before answering no.
+
+        Used as the checkpoint of spending loops, so a drifted prediction can't end them early.
+        """
+        if self.balance is not None and self.balance >= amount:
+            return True
+        predicted: Optional[int] = self.balance
+        actual: int = self.sync()
+        if predicted is not None and predicted != actual:
+            print(f"  Gold prediction was {predicted}, read {actual}")
+        return actual >= amount
@@ -0,0 +1,119 @@
+"""
+On-disk HTTP cache that revalidates with ETag/Last-Modified, and a bounded parallel fetcher
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import requests
+
+FETCH_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """The parts of a response the comps loader uses, whether it came from the network or disk"""
+
+    url: str
+    status_code: int
+    text: str
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True for a successful response"""
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        """Decodes the body as JSON"""
+        return json.loads(self.text)
+
+
+class HttpCache:
+    """Stores response bodies per URL and sends conditional requests for them.
+
+    A 304 answer serves the stored body, so a warm refresh only downloads pages
+    that changed. Every thread gets its own keep-alive session.
+    """
+
+    def __init__(self, folder: str) -> None:
+        self.folder: str = folder
+        self.local = threading.local()
+
+    def session(self) -> requests.Session:
+        """Returns this thread's session"""
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def paths(self, url: str) -> tuple[str, str]:
+        """Returns the body and metadata file of a URL"""
+        key: str = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return (
+            os.path.join(self.folder, key + ".body"),
+            os.path.join(self.folder, key + ".json"),
+        )
+
+    def load(self, url: str) -> Optional[tuple[dict, str]]:
+        """Returns the stored metadata and body of a URL, None if it isn't cached"""
+        body_path, meta_path = self.paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as meta_file:
+                meta: dict = json.load(meta_file)
+            with open(body_path, encoding="utf-8") as body_file:
+                return meta, body_file.read()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Saves a response, writing to temporary files first so readers never see half of it"""
+        os.makedirs(self.folder, exist_ok=True)
+        body_path, meta_path = self.paths(url)
+        meta: dict = {
+            "url": response.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        for path, content in ((body_path, response.text), (meta_path, json.dumps(meta))):
+            temporary: str = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.replace(temporary, path)
+
+    def get(self, url: str, timeout: float = 20) -> CachedResponse:
+        """Fetches a URL, revalidating the cached copy when there is one.
+
+        The cached copy is also served when the site can't be reached.
+        """
+        cached: Optional[tuple[dict, str]] = self.load(url)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached[0].get("etag"):
+                headers["If-None-Match"] = cached[0]["etag"]
+            if cached[0].get("last_modified"):
+                headers["If-Modified-Since"] = cached[0]["last_modified"]
+        try:
+            response: requests.Response = self.session().get(
+                url, headers=headers, timeout=timeout
+            )
+        except requests.exceptions.RequestException:
+            if cached is None:
+                raise
+            return CachedResponse(cached[0]["url"], 200, cached[1], from_cache=True)
+        if response.status_code == 304 and cached is not None:
+            return CachedResponse(cached[0]["url"], 200, cached[1], from_cache=True)
+        if response.ok:
+            self.store(url, response)
+        return CachedResponse(response.url, response.status_code, response.text)
+
+    def get_all(
+        self, urls: Iterable[str], timeout: float = 20, workers: int = FETCH_WORKERS
+    ) -> list[CachedResponse]:
+        """Fetches the URLs with at most `workers` requests in flight, results keep the URL order"""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda url: self.get(url, timeout), urls))
@@ -0,0 +1,120 @@
+"""
+Sends queued inputs and moves on as soon as their effect shows up on screen,
+with the old fixed waits kept only as timeouts
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from time import sleep
+from typing import Callable, Optional
+
+import numpy as np
+
+import arena_functions
+import frame_capture
+
+POLL_INTERVAL = 0.02
+# Polls in a row a changed region has to stay the same for before it counts as settled
+SETTLE_FRAMES = 3
+
+Condition = Callable[[], bool]
+
+
+def wait_until(condition: Condition, timeout: float) -> bool:
+    """Polls the condition until it holds, returns False if the timeout ran out first."""
+    deadline: float = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        sleep(POLL_INTERVAL)
+    return True
+
+
+def region_changed(*boxes: tuple) -> Condition:
+    """Returns a condition that holds once any of the screen boxes differs from its current pixels."""
+    baselines: list[np.ndarray] = [np.asarray(frame_capture.grab(box)) for box in boxes]
+    return lambda: any(
+        not np.array_equal(np.asarray(frame_capture.grab(box)), baseline)
+        for box, baseline in zip(boxes, baselines)
+    )
+
+
+def region_settled(*boxes: tuple, frames: int = SETTLE_FRAMES) -> Condition:
+    """Returns a condition that holds once any of the screen boxes differs from its current
+    pixels and then stays the same for frames polls, so a change still animating doesn't count."""
+    baselines: list[np.ndarray] = [np.asarray(frame_capture.grab(box)) for box in boxes]
+    previous: Optional[list[np.ndarray]] = None
+    steady: int = 0
+
+    def settled() -> bool:
+        nonlocal previous, steady
+        current: list[np.ndarray] = [np.asarray(frame_capture.grab(box)) for box in boxes]
+        if previous is not None and all(
+            np.array_equal(pixels, last) for pixels, last in zip(current, previous)
+        ):
+            steady += 1
+        else:
+            steady = 0
+        previous = current
+        return steady >= frames and any(
+            not np.array_equal(pixels, baseline)
+            for pixels, baseline in zip(current, baselines)
+        )
+
+    return settled
+
+
+def bench_slot_occupied(slot: int) -> Condition:
+    """Returns a condition that holds once the bench slot shows a health bar."""
+    return lambda: bool(arena_functions.bench_occupied_mask() >> slot & 1)
+
+
+def bench_slot_empty(slot: int) -> Condition:
+    """Returns a condition that holds once the bench slot has no health bar."""
+    return lambda: not arena_functions.bench_occupied_mask() >> slot & 1
+
+
+@dataclass
+class Action:
+    """An input plus the visual postcondition that confirms it landed.
+
+    expect is called right before the input is sent, so conditions that compare
+    against the current screen take their baseline at the right moment.
+    """
+
+    perform: Callable[[], None]
+    expect: Optional[Callable[[], Condition]] = None
+    timeout: float = 0.0
+
+
+class InputSequencer:
+    """Queue of actions that each wait for their postcondition or their timeout"""
+
+    def __init__(self) -> None:
+        self.actions: deque[Action] = deque()
+
+    def add(
+        self,
+        perform: Callable[[], None],
+        expect: Optional[Callable[[], Condition]] = None,
+        timeout: float = 0.0,
+    ) -> "InputSequencer":
+        """Queues an action, returns the sequencer so calls can be chained."""
+        self.actions.append(Action(perform, expect, timeout))
+        return self
+
+    def run(self) -> bool:
+        """Sends every queued action in order, returns False if any postcondition timed out."""
+        confirmed = True
+        while self.actions:
+            action: Action = self.actions.popleft()
+            condition: Optional[Condition] = (
+                action.expect() if action.expect is not None else None
+            )
+            action.perform()
+            if condition is not None:
+                confirmed = wait_until(condition, action.timeout) and confirmed
+            elif action.timeout > 0:
+                sleep(action.timeout)
+        return confirmed
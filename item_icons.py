@@ -0,0 +1,180 @@
+"""
+Recognizes the items on the item bench from their icons, all slots from one capture
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+import settings
+
+TEMPLATE_SIZE = 12
+HISTOGRAM_LEVELS = 4
+# Half the side of the square cropped around each ITEM_POS icon location
+ICON_RADIUS = 14
+# Template correlation, -1 to 1, the best match needs to reach
+MIN_CORRELATION = 0.85
+# How far the best label's correlation has to be ahead of any other label's
+MIN_MARGIN = 0.1
+# Colour histogram intersection, 0 to 1, with the best matching template
+MIN_COLOUR_OVERLAP = 0.6
+MAX_TEMPLATES_PER_LABEL = 3
+# Icon files starting with this describe an empty slot
+EMPTY_PREFIX = "_empty"
+
+
+def icon_box(center: tuple) -> tuple:
+    """Returns the (x, y, x+w, y+h) box of the icon drawn at an ITEM_POS location."""
+    return (
+        center[0] - ICON_RADIUS,
+        center[1] - ICON_RADIUS,
+        center[0] + ICON_RADIUS,
+        center[1] + ICON_RADIUS,
+    )
+
+
+def describe(images: list[Image]) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the normalized downsampled templates and colour histograms of the icons."""
+    pixels: np.ndarray = np.stack(
+        [
+            np.asarray(
+                image.convert("RGB").resize(
+                    (TEMPLATE_SIZE, TEMPLATE_SIZE), Image.Resampling.BOX
+                ),
+                dtype=np.float32,
+            )
+            for image in images
+        ]
+    ).reshape(len(images), -1, 3)
+
+    templates: np.ndarray = pixels.reshape(len(images), -1).copy()
+    templates -= templates.mean(axis=1, keepdims=True)
+    templates /= np.maximum(np.linalg.norm(templates, axis=1, keepdims=True), 1e-6)
+
+    levels: np.ndarray = (pixels * HISTOGRAM_LEVELS / 256).astype(np.int64)
+    bins: np.ndarray = (
+        levels[..., 0] * HISTOGRAM_LEVELS + levels[..., 1]
+    ) * HISTOGRAM_LEVELS + levels[..., 2]
+    histograms: np.ndarray = np.stack(
+        [np.bincount(row, minlength=HISTOGRAM_LEVELS**3) for row in bins]
+    ).astype(np.float32)
+    histograms /= pixels.shape[1]
+    return templates, histograms
+
+
+@dataclass(frozen=True)
+class IconMatch:
+    """The best label for an icon and the evidence for it"""
+
+    label: Optional[str]
+    correlation: float
+    margin: float
+    colour_overlap: float
+
+    @property
+    def confident(self) -> bool:
+        """True when every measure clears its own threshold"""
+        return (
+            self.correlation >= MIN_CORRELATION
+            and self.margin >= MIN_MARGIN
+            and self.colour_overlap >= MIN_COLOUR_OVERLAP
+        )
+
+
+class IconIndex:
+    """Icon descriptors labelled by item name, None labels an empty slot"""
+
+    def __init__(self) -> None:
+        self.labels: list[Optional[str]] = []
+        self.templates: np.ndarray = np.empty(
+            (0, TEMPLATE_SIZE * TEMPLATE_SIZE * 3), dtype=np.float32
+        )
+        self.histograms: np.ndarray = np.empty(
+            (0, HISTOGRAM_LEVELS**3), dtype=np.float32
+        )
+
+    def add(self, label: Optional[str], image: Image) -> None:
+        """Adds an icon as a template for the label."""
+        if self.labels.count(label) >= MAX_TEMPLATES_PER_LABEL:
+            return
+        templates, histograms = describe([image])
+        self.labels.append(label)
+        self.templates = np.vstack((self.templates, templates))
+        self.histograms = np.vstack((self.histograms, histograms))
+
+    def classify(self, images: list[Image]) -> list[IconMatch]:
+        """Matches every icon against every descriptor in one pass.
+
+        The label with the highest template correlation wins. Its margin is the
+        distance to the best template of any other label, and its colour overlap
+        the histogram intersection with the winning template.
+        """
+        if not self.labels:
+            return [IconMatch(None, -1.0, 0.0, 0.0)] * len(images)
+        templates, histograms = describe(images)
+        correlation: np.ndarray = templates @ self.templates.T
+        best: np.ndarray = correlation.argmax(axis=1)
+        # Templates of one label share the index of the label's first template
+        label_ids: np.ndarray = np.array([self.labels.index(label) for label in self.labels])
+        same_label: np.ndarray = label_ids[None, :] == label_ids[best][:, None]
+        runner_up: np.ndarray = np.where(same_label, -1.0, correlation).max(axis=1)
+        overlap: np.ndarray = np.minimum(
+            histograms, self.histograms[best]
+        ).sum(axis=1)
+        return [
+            IconMatch(
+                self.labels[index],
+                float(correlation[row, index]),
+                float(correlation[row, index] - runner_up[row]),
+                float(overlap[row]),
+            )
+            for row, index in enumerate(best)
+        ]
+
+
+def load_index(folder: str) -> IconIndex:
+    """Builds the index from a folder of icons named after their item."""
+    index = IconIndex()
+    if not os.path.isdir(folder):
+        return index
+    for file_name in sorted(os.listdir(folder)):
+        stem, extension = os.path.splitext(file_name)
+        if extension.lower() not in (".png", ".jpg", ".jpeg", ".bmp"):
+            continue
+        with Image.open(os.path.join(folder, file_name)) as image:
+            index.add(None if stem.startswith(EMPTY_PREFIX) else stem, image)
+    return index
+
+
+_INDEX: dict[str, IconIndex] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def icon_index() -> IconIndex:
+    """Returns the index for settings.ITEM_ICON_DIR, loading it on first use."""
+    with _INDEX_LOCK:
+        if settings.ITEM_ICON_DIR not in _INDEX:
+            _INDEX[settings.ITEM_ICON_DIR] = load_index(settings.ITEM_ICON_DIR)
+        return _INDEX[settings.ITEM_ICON_DIR]
+
+
+def read_items(icons: list[Image]) -> list[tuple[Optional[str], bool]]:
+    """Returns each slot's item and whether it was recognized confidently.
+
+    Slots that aren't confident are left for the caller to read another way.
+    """
+    return [(match.label, match.confident) for match in icon_index().classify(icons)]
+
+
+def learn(icon: Image, item: Optional[str]) -> None:
+    """Adds an icon whose item is known to the index, None for a slot known to be empty.
+
+    Only pass reads that are certain, a wrong label would be trusted from then on.
+    """
+    index: IconIndex = icon_index()
+    with _INDEX_LOCK:
+        index.add(item, icon)
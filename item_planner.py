@@ -0,0 +1,183 @@
+"""
+Plans where every item on the item bench goes before any of them is clicked
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import game_assets
+from champion import Champion
+
+GLOVES: frozenset[str] = frozenset(
+    {"ThiefsGloves", "BlacksmithsGloves", "RascalsGloves", "AccomplicesGloves"}
+)
+
+# The game_assets.CRAFTABLE_ITEMS_DICT the current recipe index was built from
+_RECIPE_INDEX: dict[str, object] = {}
+
+
+class RecipeIndex:
+    """Lookup tables derived once from the recipe dictionaries"""
+
+    def __init__(self) -> None:
+        self.recipes: dict[str, tuple[str, str]] = dict(
+            game_assets.CRAFTABLE_ITEMS_DICT
+        )
+        self.uses: dict[str, frozenset[str]] = {}
+        for craftable, components in self.recipes.items():
+            for component in components:
+                self.uses[component] = self.uses.get(component, frozenset()) | {
+                    craftable
+                }
+        # Items that may be dumped on a champion whose build is already done
+        self.fillers: frozenset = frozenset(
+            set(game_assets.CRAFTABLE_ITEMS_DICT.values()).union(
+                game_assets.RADIANT_ITEMS_DICT.values(),
+                game_assets.FORCED_ITEMS,
+            )
+        )
+
+    def other_component(self, craftable: str, component: str) -> str:
+        """Returns the component still missing once the given one is on the champion"""
+        first, second = self.recipes[craftable]
+        return second if first == component else first
+
+
+def recipe_index() -> RecipeIndex:
+    """Returns the recipe index, rebuilt only when game_assets is reloaded with new recipes"""
+    if _RECIPE_INDEX.get("source") is not game_assets.CRAFTABLE_ITEMS_DICT:
+        _RECIPE_INDEX["source"] = game_assets.CRAFTABLE_ITEMS_DICT
+        _RECIPE_INDEX["index"] = RecipeIndex()
+    return _RECIPE_INDEX["index"]
+
+
+@dataclass(frozen=True)
+class Placement:
+    """One item moved from the item bench onto a champion, with the build change it causes"""
+
+    item_index: int
+    item: str
+    champion: Champion
+    # Craftable from the build placed whole, or finished by this component
+    completes: Optional[str] = None
+    # Craftable started by this component, with the component it still needs
+    starts: Optional[tuple[str, str]] = None
+    filler: bool = False
+
+
+class BuildState:
+    """Copy of a champion's item progress that planning can change without touching the champion"""
+
+    def __init__(self, champion: Champion) -> None:
+        self.build: list[str] = list(champion.build)
+        self.completed_items: list[str] = list(champion.completed_items)
+        self.current_building: list[tuple[str, str]] = list(champion.current_building)
+        self.max_item_slots: int = champion.max_item_slots
+
+
+def apply_placement(placement: Placement, state) -> None:
+    """Applies the build change of a placement to a Champion or a BuildState"""
+    if placement.filler:
+        if placement.item in GLOVES and state.max_item_slots == 3:
+            # Thief's Gloves style items take every slot
+            state.completed_items = [placement.item] * 3
+        state.completed_items.append(placement.item)
+    elif placement.starts is not None:
+        state.current_building.append(placement.starts)
+        state.build.remove(placement.starts[0])
+    elif placement.completes == placement.item:
+        # A whole craftable leaves any half-built recipe alone
+        state.completed_items.append(placement.completes)
+        state.build.remove(placement.completes)
+    else:
+        state.completed_items.append(placement.completes)
+        state.current_building.clear()
+
+
+def needs_items(state: BuildState) -> bool:
+    """Same rule as Champion.does_need_items"""
+    return not (len(state.completed_items) == 3 and len(state.current_building) == 0)
+
+
+def place_for_build(
+    index: RecipeIndex, item_index: int, item: str, champion: Champion, state: BuildState
+) -> Optional[Placement]:
+    """Returns the placement of the item towards the champion's build, if it fits it"""
+    if item in index.recipes:
+        if item in state.build:
+            return Placement(item_index, item, champion, completes=item)
+    elif not state.current_building:
+        craftables: frozenset[str] = index.uses.get(item, frozenset())
+        for craftable in state.build:
+            if craftable in craftables:
+                return Placement(
+                    item_index,
+                    item,
+                    champion,
+                    starts=(craftable, index.other_component(craftable, item)),
+                )
+    elif state.current_building[0][1] == item:
+        return Placement(
+            item_index, item, champion, completes=state.current_building[0][0]
+        )
+    return None
+
+
+def plan_items(
+    items: list[Optional[str]],
+    board: Iterable[Champion],
+    bench: Iterable[Champion],
+    comp_items: Iterable[str],
+) -> list[Placement]:
+    """Works out the placement of every item in one pass over the inventory.
+
+    Items are handed out in bench order and champions are tried in board order,
+    each item going to the first champion whose build it advances. An item nobody
+    on the board, bench or in the comp still needs is dumped on a champion whose
+    build is done. Nothing is clicked, the plan is applied by the caller.
+    """
+    index: RecipeIndex = recipe_index()
+    champions: list[Champion] = [champ for champ in board if isinstance(champ, Champion)]
+    states: dict[int, BuildState] = {id(champ): BuildState(champ) for champ in champions}
+
+    reserved: set[str] = set(comp_items)
+    # Items still wanted by a build on the board or the bench
+    wanted: Counter = Counter(
+        item
+        for champ in champions + [slot for slot in bench if isinstance(slot, Champion)]
+        for item in champ.build
+        if item not in champ.completed_items
+    )
+
+    plan: list[Placement] = []
+    for item_index, item in enumerate(items):
+        if item is None:
+            continue
+        for champ in champions:
+            state: BuildState = states[id(champ)]
+            placement: Optional[Placement] = None
+            if needs_items(state):
+                placement = place_for_build(index, item_index, item, champ, state)
+            if (
+                placement is None
+                and not state.build
+                and len(state.completed_items) < 3
+                and item in index.fillers
+                and item not in reserved
+                and wanted[item] <= 0
+                and (
+                    item not in GLOVES
+                    or not (state.completed_items or state.current_building)
+                )
+            ):
+                placement = Placement(item_index, item, champ, filler=True)
+            if placement is not None:
+                if placement.starts is not None:
+                    wanted[placement.starts[0]] -= 1
+                elif placement.completes == placement.item:
+                    wanted[placement.completes] -= 1
+                apply_placement(placement, state)
+                plan.append(placement)
+                break
+    return plan
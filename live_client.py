@@ -0,0 +1,98 @@
+"""
+Polls the Live Client Data API in the background so health and level reads are
+in-memory lookups
+"""
+
+import threading
+import time
+from time import sleep
+from typing import Optional
+
+import requests
+
+import settings
+
+
+class LiveClientPoller:
+    """Keeps a recent allgamedata snapshot from the Live Client Data API.
+
+    A daemon thread fetches the endpoint over one keep-alive session at a fixed rate,
+    so reads are in-memory lookups. A snapshot older than the TTL is fetched again in
+    the caller's thread, and a failed fetch yields None instead of stale data.
+    After a failure both wait a backoff that doubles up to max_backoff before asking
+    again, and the thread stops once it reaches it, as it does outside a game.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(
+        self,
+        url: str = "https://127.0.0.1:2999/liveclientdata/allgamedata",
+        interval: float = settings.LIVE_CLIENT_POLL_INTERVAL,
+        ttl: float = settings.LIVE_CLIENT_SNAPSHOT_TTL,
+        timeout: float = settings.LIVE_CLIENT_TIMEOUT,
+        max_backoff: float = settings.LIVE_CLIENT_MAX_BACKOFF,
+    ) -> None:
+        self.url: str = url
+        self.interval: float = interval
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self.max_backoff: float = max_backoff
+        self.session = requests.Session()
+        # Guards the snapshot fields, never held during a request
+        self.lock = threading.Lock()
+        self.data: Optional[dict] = None
+        self.fetched_at: float = 0.0
+        self.failures: int = 0
+        self.retry_at: float = 0.0
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the polling thread if it is not running yet."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.poll, daemon=True)
+            self.thread.start()
+
+    def backoff(self) -> float:
+        """Returns the seconds to wait after the current run of failures."""
+        return min(self.max_backoff, self.interval * 2**self.failures)
+
+    def poll(self) -> None:
+        """Fetches the endpoint at the configured interval until the backoff maxes out."""
+        while True:
+            sleep(max(0.0, self.retry_at - time.monotonic()))
+            if self.fetch() is None and self.backoff() >= self.max_backoff:
+                return
+            sleep(self.interval)
+
+    def fetch(self) -> Optional[dict]:
+        """Requests a new snapshot and swaps it in."""
+        try:
+            # verify is passed per request, REQUESTS_CA_BUNDLE overrides a session's
+            data: dict = self.session.get(
+                self.url, timeout=self.timeout, verify=False
+            ).json()
+        except (requests.exceptions.RequestException, ValueError):
+            data = None
+        with self.lock:
+            self.data = data
+            self.fetched_at = time.monotonic()
+            if data is None:
+                self.failures += 1
+                self.retry_at = self.fetched_at + self.backoff()
+            else:
+                self.failures = 0
+                self.retry_at = 0.0
+        return data
+
+    def snapshot(self, max_age: Optional[float] = None) -> Optional[dict]:
+        """Returns allgamedata no older than max_age seconds (the TTL by default)."""
+        self.start()
+        max_age = self.ttl if max_age is None else max_age
+        with self.lock:
+            now: float = time.monotonic()
+            if self.data is not None and now - self.fetched_at <= max_age:
+                return self.data
+            if now < self.retry_at:
+                return None
+        return self.fetch()
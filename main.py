@@ -9,7 +9,9 @@ import os
 import time
 import auto_comps
 import auto_queue
-from settings import LEAGUE_CLIENT_PATH
+import comps_store
+import recorder
+from settings import LEAGUE_CLIENT_PATH, RECORDING_DIR
 from comps import CompsManager
 from game import Game
 from ui import UI
@@ -23,7 +25,12 @@ def game_loop(ui_queue: multiprocessing.Queue, comps: CompsManager) -> None:
     """Keeps the program running indefinitely by calling queue and game start in a loop"""
     while True:
         auto_queue.handle_queue()
-        Game(ui_queue, comps)
+        if RECORDING_DIR is None:
+            Game(ui_queue, comps)
+            continue
+        path = os.path.join(RECORDING_DIR, f"game-{time.strftime('%Y%m%d-%H%M%S')}.rec")
+        with recorder.recording(path):
+            Game(ui_queue, comps)
 
 
 def is_admin():
@@ -113,22 +120,15 @@ def load_champions_data() -> dict:
     return champions_data
 
 
-def update_comps(file_path):
-    """Update comps if the user chooses to."""
+def update_comps() -> bool:
+    """Ask whether to refresh the stored comps, only the ones that changed are rewritten."""
     while True:
         comp_input = input("Do you want to update comps? (y/n) ")
         if comp_input.lower() in YES_CHOICES:
-            os.remove(file_path)
-            print("Old comp files successfully deleted!")
-            for file_name in ["deck.json", "inputed"]:
-                file_to_remove = os.path.join("cached_data", file_name)
-                if os.path.isfile(file_to_remove):
-                    os.remove(file_to_remove)
-            break
-        elif comp_input.lower() in NO_CHOICES:
-            break
-        else:
-            print("Type yes or no")
+            return True
+        if comp_input.lower() in NO_CHOICES:
+            return False
+        print("Type yes or no")
 
 
 def main():
@@ -173,14 +173,14 @@ def main():
         "\n\nAutoComps version - https://github.com/Sizzzles/TFT-OCR-BOT\n"
     )
 
-    file_path = os.path.join("cached_data", "cached11.json")
-    if os.path.isfile(file_path):
-        last_modified_time = time.ctime(os.path.getmtime(file_path))
-        print(f"Champions and comps already exist. Last modified: {last_modified_time}")
-        update_comps(file_path)
+    refresh = False
+    last_update = comps_store.last_update(auto_comps.COMPS_STORE_DIR)
+    if last_update is not None:
+        print(f"Comps already exist. Last updated: {time.ctime(last_update)}")
+        refresh = update_comps()
 
     print("Close this window to terminate the overlay window & program")
-    auto_comps.load_champions_and_comps(comps_manager)
+    auto_comps.load_champions_and_comps(comps_manager, refresh)
     game_thread.start()
     overlay.ui_loop()
 
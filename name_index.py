@@ -0,0 +1,96 @@
+"""
+Indexed fuzzy matching of OCR strings against a fixed vocabulary of names
+"""
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+
+MAX_CANDIDATES = 8
+
+
+def normalize(text: str) -> str:
+    """Lowercases the text and keeps only letters and digits."""
+    return "".join(char for char in text.lower() if char.isalnum())
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the padded character trigrams of an already normalized string."""
+    padded: str = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Resolves misread names to the vocabulary without scanning all of it.
+
+    Lookups go exact name, correction table, normalized name, then a fuzzy
+    ratio check on the few names that share the most trigrams with the text.
+    Every answer, fuzzy hits included, is kept in a memo of at most memo_size
+    reads, so the index stops growing however many misreads a game produces.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        min_ratio: float,
+        corrections: Optional[dict[str, str]] = None,
+        match_substrings: bool = False,
+        memo_size: int = 1024,
+    ) -> None:
+        self.names: set[str] = set(names)
+        self.min_ratio: float = min_ratio
+        self.match_substrings: bool = match_substrings
+        self.memo_size: int = memo_size
+        self.corrections: dict[str, str] = {
+            misread: name
+            for misread, name in (corrections or {}).items()
+            if name in self.names
+        }
+        self.normalized: dict[str, str] = {normalize(name): name for name in self.names}
+        self.postings: dict[str, set[str]] = {}
+        for key, name in self.normalized.items():
+            for trigram in trigrams(key):
+                self.postings.setdefault(trigram, set()).add(name)
+        self.memo: OrderedDict[str, Optional[str]] = OrderedDict()
+
+    def candidates(self, text: str) -> list[str]:
+        """Returns the names sharing the most trigrams with the text, best first."""
+        shared: dict[str, int] = {}
+        for trigram in trigrams(normalize(text)):
+            for name in self.postings.get(trigram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        return sorted(shared, key=lambda name: (-shared[name], name))[:MAX_CANDIDATES]
+
+    def fuzzy_match(self, text: str) -> Optional[str]:
+        """Scores the trigram candidates and returns the best one above min_ratio."""
+        candidates: list[str] = self.candidates(text)
+        if self.match_substrings:
+            contained: list[str] = [name for name in candidates if name in text]
+            if contained:
+                return max(contained, key=len)
+        best_name: Optional[str] = None
+        best_ratio: float = self.min_ratio
+        for name in candidates:
+            ratio: float = SequenceMatcher(a=name, b=text).ratio()
+            if ratio >= best_ratio:
+                best_name, best_ratio = name, ratio
+        return best_name
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Returns the name the text most likely refers to, None if nothing is close."""
+        if text in self.names:
+            return text
+        if text in self.memo:
+            self.memo.move_to_end(text)
+            return self.memo[text]
+
+        name: Optional[str] = self.corrections.get(text.strip())
+        if name is None:
+            name = self.normalized.get(normalize(text))
+        if name is None and text:
+            name = self.fuzzy_match(text)
+
+        self.memo[text] = name
+        if len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return name
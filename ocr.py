@@ -2,22 +2,75 @@
 Contains all code related to turning a screenshot into a string
 """
 
-from typing import Any
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 import cv2
 import numpy as np
-from PIL import ImageGrab, Image
+from PIL import Image
 from tesserocr import PyTessBaseAPI
 
+import digit_matcher
+import frame_capture
 import settings
 
 TESSDATA_PATH = settings.TESSERACT_TESSDATA_PATH
 
 ALPHABET_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+DIGIT_WHITELIST = "0123456789"
 ROUND_WHITELIST = "0123456789-"
 SPACE_WHITELIST = " "
 SYMBOL_WHITELIST = "&'"
 
+# Idle Tesseract engines keyed by their (psm, whitelist) profile
+_ENGINE_POOL: dict[tuple[int, str], list[PyTessBaseAPI]] = {}
+_ENGINE_POOL_LOCK = threading.Lock()
+
+
+class OcrCache:
+    """Bounded LRU of OCR results keyed by the thresholded pixels and the engine profile"""
+
+    def __init__(self, max_size: int = 512) -> None:
+        self.max_size: int = max_size
+        self.entries: OrderedDict[bytes, str] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def key(thresholding: Any, psm: int, whitelist: str, boxes: tuple = ()) -> bytes:
+        """Hashes the image bytes together with its shape, psm, whitelist and read boxes."""
+        digest = hashlib.blake2b(thresholding.tobytes(), digest_size=16)
+        digest.update(
+            f"{thresholding.shape}|{psm}|{whitelist}|{boxes}".encode("utf-8")
+        )
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Returns the cached text and marks it as recently used, None on a miss."""
+        with self.lock:
+            text = self.entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: bytes, text: str) -> None:
+        """Stores a result, evicting the least recently used one when full."""
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+OCR_CACHE = OcrCache()
+
 
 def image_grayscale(image: Image) -> Any:
     """Converts an image to grayscale to improve OCR performance."""
@@ -42,16 +95,40 @@ def image_resize(image: int, scale: int) -> Any:
     return image.resize((width, height))
 
 
-def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
-    """Returns text from specified screen coordinates."""
-    screenshot = ImageGrab.grab(bbox=screenxy)
-    resize = image_resize(screenshot, scale)
-    array = image_array(resize)
-    grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
-    with PyTessBaseAPI(path=TESSDATA_PATH) as api:
+@contextmanager
+def tesseract_engine(psm: int, whitelist: str = "") -> Iterator[PyTessBaseAPI]:
+    """Checks out a configured Tesseract engine for the (psm, whitelist) profile.
+
+    Engines are created the first time a profile is needed and handed back to the pool
+    afterwards, so the language model is loaded once instead of on every call.
+    Each engine is used by a single thread at a time.
+    """
+    profile: tuple[int, str] = (psm, whitelist)
+    with _ENGINE_POOL_LOCK:
+        idle: list = _ENGINE_POOL.setdefault(profile, [])
+        api = idle.pop() if idle else None
+    if api is None:
+        api = PyTessBaseAPI(path=TESSDATA_PATH)
         api.SetVariable("tessedit_char_whitelist", whitelist)
         api.SetPageSegMode(psm)
+    try:
+        yield api
+    finally:
+        api.Clear()
+        with _ENGINE_POOL_LOCK:
+            _ENGINE_POOL[profile].append(api)
+
+
+def image_to_text(thresholding: Any, psm: int, whitelist: str = "") -> str:
+    """Runs Tesseract on an already thresholded single channel image.
+
+    Identical crops are answered from OCR_CACHE without touching Tesseract.
+    """
+    key: bytes = OcrCache.key(thresholding, psm, whitelist)
+    cached: Optional[str] = OCR_CACHE.get(key)
+    if cached is not None:
+        return cached
+    with tesseract_engine(psm, whitelist) as api:
         api.SetImageBytes(
             thresholding.tobytes(),
             thresholding.shape[1],
@@ -59,25 +136,84 @@ def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
             1,
             thresholding.shape[1],
         )
-        text = api.GetUTF8Text()
-    return text.strip()
+        text = api.GetUTF8Text().strip()
+    OCR_CACHE.put(key, text)
+    return text
 
 
-def get_text_from_image(image: Image, whitelist: str = "") -> str:
-    """Extracts text from the given image."""
-    resize = image_resize(image, 3)
+def preprocess_image(image: Image, scale: int) -> Any:
+    """Resizes, grayscales and thresholds an image for text recognition."""
+    resize = image_resize(image, scale)
     array = image_array(resize)
     grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
-    with PyTessBaseAPI(path=TESSDATA_PATH) as api:
-        api.SetVariable("tessedit_char_whitelist", whitelist)
-        api.SetPageSegMode(7)
+    return image_thresholding(grayscale)
+
+
+def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
+    """Returns text from specified screen coordinates."""
+    screenshot = frame_capture.grab(screenxy)
+    thresholding = preprocess_image(screenshot, scale)
+    return image_to_text(thresholding, psm, whitelist)
+
+
+def get_text_from_image(image: Image, whitelist: str = "", psm: int = 7) -> str:
+    """Extracts text from the given image."""
+    thresholding = preprocess_image(image, 3)
+    return image_to_text(thresholding, psm, whitelist)
+
+
+def get_text_lines_from_image(
+    image: Image, boxes: list[tuple], whitelist: str = "", psm: int = 7
+) -> list[str]:
+    """Reads several (x, y, x+w, y+h) boxes of one image in a single engine pass.
+
+    Each box is thresholded on its own and pasted onto a blank canvas, the canvas
+    is handed to Tesseract once and every box is read with SetRectangle.
+    """
+    scale: int = 3
+    canvas = np.full((image.height * scale, image.width * scale), 255, dtype=np.uint8)
+    rectangles: list[tuple] = []
+    for box in boxes:
+        box = (
+            max(box[0], 0),
+            max(box[1], 0),
+            min(box[2], image.width),
+            min(box[3], image.height),
+        )
+        thresholding = preprocess_image(image.crop(box), scale)
+        left, top = box[0] * scale, box[1] * scale
+        canvas[
+            top : top + thresholding.shape[0], left : left + thresholding.shape[1]
+        ] = thresholding
+        rectangles.append((left, top, thresholding.shape[1], thresholding.shape[0]))
+
+    key: bytes = OcrCache.key(canvas, psm, whitelist, tuple(rectangles))
+    cached: Optional[str] = OCR_CACHE.get(key)
+    if cached is not None:
+        return cached.split("\n")
+    lines: list[str] = []
+    with tesseract_engine(psm, whitelist) as api:
         api.SetImageBytes(
-            thresholding.tobytes(),
-            thresholding.shape[1],
-            thresholding.shape[0],
-            1,
-            thresholding.shape[1],
+            canvas.tobytes(), canvas.shape[1], canvas.shape[0], 1, canvas.shape[1]
         )
-        text = api.GetUTF8Text()
-    return text.strip()
+        for rectangle in rectangles:
+            api.SetRectangle(*rectangle)
+            lines.append(api.GetUTF8Text().strip())
+    OCR_CACHE.put(key, "\n".join(lines))
+    return lines
+
+
+def get_digits_from_image(
+    image: Image, whitelist: str = DIGIT_WHITELIST, psm: int = 7
+) -> str:
+    """Reads a fixed-font digit string with the glyph matcher.
+
+    Falls back to Tesseract when the match is not confident, and votes that
+    read into the matcher, which trusts a glyph once several reads agree on it.
+    """
+    thresholding = preprocess_image(image, 3)
+    text = digit_matcher.read_digits(thresholding, whitelist)
+    if text is None:
+        text = image_to_text(thresholding, psm, whitelist)
+        digit_matcher.learn(thresholding, whitelist, text)
+    return text
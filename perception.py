@@ -0,0 +1,114 @@
+"""
+Reads everything the bot needs from the screen out of a single capture of the game window
+"""
+
+from functools import partial
+from typing import Any, Callable, Optional
+
+import arena_functions
+import game_functions
+from comps import CompsManager
+from frame_capture import Frame
+from phase_clock import PhaseClock
+
+
+class GameState:
+    """Immutable snapshot of the game from one frame.
+
+    The fields are read-only properties over a frozen Frame. Each region is
+    decoded the first time it's used and kept, so callers only pay for the
+    reads they need and all of them come from the same frame.
+    """
+
+    __slots__ = ("_frame", "_comps", "_clock", "_decoded")
+
+    def __init__(
+        self,
+        frame: Frame,
+        comps: Optional[CompsManager] = None,
+        clock: Optional[PhaseClock] = None,
+    ) -> None:
+        self._frame: Frame = frame
+        self._comps: Optional[CompsManager] = comps
+        self._clock: Optional[PhaseClock] = clock
+        self._decoded: dict[str, Any] = {}
+
+    def _decode(self, name: str, read: Callable[[], Any]) -> Any:
+        """Returns the named field, reading it from the frame on first use"""
+        if name not in self._decoded:
+            self._decoded[name] = read()
+        return self._decoded[name]
+
+    @property
+    def frame(self) -> Frame:
+        """The capture every field is read from"""
+        return self._frame
+
+    @property
+    def round(self) -> tuple[str, int]:
+        """The round text and the layout it was read at"""
+        return self._decode("round", lambda: tuple(game_functions.get_round(self._frame)))
+
+    @property
+    def gold(self) -> int:
+        """Gold the player has"""
+        return self._decode("gold", partial(arena_functions.get_gold, self._frame))
+
+    @property
+    def level(self) -> int:
+        """Level of the player"""
+        return self._decode(
+            "level", partial(arena_functions.get_level_via_ocr, self._frame)
+        )
+
+    @property
+    def seconds_remaining(self) -> int:
+        """Seconds left in the phase.
+
+        With a PhaseClock the timer is only read when the clock asks for a
+        sync, otherwise its estimate is used.
+        """
+        return self._decode("seconds_remaining", self._read_seconds_remaining)
+
+    def _read_seconds_remaining(self) -> int:
+        """Reads the timer, or the clock's estimate of it"""
+        if self._clock is None:
+            return arena_functions.get_seconds_remaining(self._frame)
+        self._clock.sync(
+            partial(arena_functions.get_seconds_remaining, self._frame), self.round[0]
+        )
+        return self._clock.seconds()
+
+    @property
+    def bench_occupied(self) -> tuple[bool, ...]:
+        """Whether each bench slot holds a unit"""
+        return self._decode(
+            "bench_occupied",
+            lambda: tuple(arena_functions.bench_occupied_check(self._frame)),
+        )
+
+    @property
+    def board_occupied(self) -> int:
+        """Bit mask of the occupied board hexes"""
+        return self._decode(
+            "board_occupied", partial(arena_functions.board_occupied_mask, self._frame)
+        )
+
+    @property
+    def shop(self) -> tuple[tuple[int, str], ...]:
+        """Slot and champion name of the shop, empty without a CompsManager since
+        resolving the names needs the champion pool"""
+        return self._decode("shop", self._read_shop)
+
+    def _read_shop(self) -> tuple[tuple[int, str], ...]:
+        """Reads the shop names if there is a champion pool to resolve them against"""
+        if self._comps is None:
+            return ()
+        return tuple(arena_functions.get_shop(self._comps, self._frame))
+
+
+def capture_game_state(
+    comps: Optional[CompsManager] = None, clock: Optional[PhaseClock] = None
+) -> GameState:
+    """Grabs the game window once, the regions are read from that frame on first use"""
+    return GameState(Frame.grab_window(), comps, clock)
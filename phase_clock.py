@@ -0,0 +1,81 @@
+"""
+Models the phase timer so the seconds remaining can be read without OCR every time
+"""
+
+import statistics
+import time
+from typing import Callable, Optional
+
+# Timer reads kept per phase, the deadline is their median
+SYNC_READS = 3
+# A read further than this from the model means the phase changed or the clock drifted
+DRIFT_TOLERANCE = 1.5
+# Seconds between reads once the model has settled, to catch drift
+RECHECK_SECONDS = 5.0
+# The timer shows whole seconds, so a read of n means between n and n + 1 seconds are left
+READ_OFFSET = 0.5
+
+
+class PhaseClock:
+    """Extrapolates the phase timer from a few OCR reads with time.monotonic().
+
+    Reads are only needed when the round changes, the modelled phase runs out,
+    the model hasn't settled yet, or it hasn't been checked for a while.
+    """
+
+    def __init__(self, now: Callable[[], float] = time.monotonic) -> None:
+        self.now: Callable[[], float] = now
+        self.round: Optional[str] = None
+        # Phase end estimated from each read of the current phase
+        self.deadlines: list[float] = []
+        self.last_read: float = 0.0
+
+    def needs_sync(self, round_name: Optional[str] = None) -> bool:
+        """Returns whether the timer should be read now"""
+        if round_name is not None and round_name != self.round:
+            return True
+        if len(self.deadlines) < SYNC_READS:
+            return True
+        current: float = self.now()
+        return current >= self.deadline() or current - self.last_read >= RECHECK_SECONDS
+
+    def observe(self, seconds: int, round_name: Optional[str] = None) -> None:
+        """Feeds a timer read, -1 for a failed one, starting a new phase if it doesn't fit"""
+        current: float = self.now()
+        self.last_read = current
+        if round_name is not None and round_name != self.round:
+            self.round = round_name
+            self.deadlines = []
+        if seconds < 0:
+            return
+        read_deadline: float = current + seconds + READ_OFFSET
+        if self.deadlines and abs(read_deadline - self.deadline()) > DRIFT_TOLERANCE:
+            self.deadlines = []
+        self.deadlines = (self.deadlines + [read_deadline])[-SYNC_READS:]
+
+    def sync(self, read: Callable[[], int], round_name: Optional[str] = None) -> bool:
+        """Feeds read() to the clock if it needs a sync, returns whether the timer was read"""
+        if not self.needs_sync(round_name):
+            return False
+        self.observe(read(), round_name)
+        return True
+
+    def synced(self) -> bool:
+        """Returns whether any read of the current phase has been taken"""
+        return bool(self.deadlines)
+
+    def deadline(self) -> float:
+        """Returns the time.monotonic() the phase ends at, now if it has no reads"""
+        if not self.deadlines:
+            return self.now()
+        return statistics.median(self.deadlines)
+
+    def remaining(self) -> float:
+        """Returns the seconds left in the phase"""
+        return max(0.0, self.deadline() - self.now())
+
+    def seconds(self) -> int:
+        """Returns the seconds left the way the game's timer shows them, -1 if unknown"""
+        if not self.deadlines:
+            return -1
+        return int(self.remaining())
@@ -0,0 +1,469 @@
+"""
+Records a live game's screen captures, OCR results and inputs into a chunked archive,
+and replays an archive through the perception code with input stubbed
+"""
+
+import hashlib
+import io
+import json
+import queue
+import struct
+import sys
+import threading
+import time
+import types
+import zlib
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Union
+from unittest import mock
+
+from PIL import Image
+
+try:
+    import pydirectinput  # pylint: disable=unused-import
+except ImportError:
+    # pydirectinput only exists on Windows, replays stub every input function
+    sys.modules["pydirectinput"] = types.ModuleType("pydirectinput")
+
+# pylint: disable=wrong-import-position
+import arena_functions
+import frame_capture
+import game_functions
+import mk_functions
+import ocr
+from comps import CompsManager
+
+MAGIC = b"TFTREC1\n"
+# Chunk header: compressed event list length, then the length of the image blobs after it
+CHUNK_HEADER = struct.Struct("<II")
+# Encoded events and images held in memory before they are written as one chunk
+CHUNK_BYTES = 4 << 20
+# Raw payloads waiting for the writer thread before add() makes the caller wait
+MAX_PENDING_BYTES = 64 << 20
+
+# Functions whose calls and results are logged, the ones called from game code are replayed
+RECORDED_CALLS: list[tuple[Any, str]] = [
+    (arena_functions, "get_gold"),
+    (arena_functions, "get_level_via_ocr"),
+    (arena_functions, "get_seconds_remaining"),
+    (arena_functions, "get_shop"),
+    (arena_functions, "get_items"),
+    (arena_functions, "bench_occupied_mask"),
+    (arena_functions, "board_occupied_mask"),
+    (game_functions, "get_round"),
+    (ocr, "get_text"),
+    (ocr, "get_text_from_image"),
+    (ocr, "get_text_lines_from_image"),
+    (ocr, "get_digits_from_image"),
+]
+
+INPUT_FUNCTIONS: list[str] = [
+    "left_click",
+    "right_click",
+    "press_e",
+    "move_mouse",
+    "buy_xp",
+    "reroll",
+    "press_esc",
+    "press_enter",
+    "press_slash",
+    "press_f",
+]
+
+
+def to_json(
+    value: Any, store_image: Optional[Callable[[Image], str]] = None
+) -> Any:
+    """Returns a JSON-safe copy of the value, objects are replaced by their type name.
+
+    With store_image, images are handed to it and referenced by the key it returns.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [to_json(item, store_image) for item in value]
+    if isinstance(value, dict):
+        return {str(key): to_json(item, store_image) for key, item in value.items()}
+    if store_image is not None and isinstance(value, Image.Image):
+        return {"object": "Image", "image": store_image(value)}
+    return {"object": type(value).__name__}
+
+
+def payload_size(payload: Union[Image.Image, bytes, None]) -> int:
+    """Returns the bytes a queued payload holds in memory"""
+    if payload is None:
+        return 0
+    if isinstance(payload, Image.Image):
+        return payload.width * payload.height * len(payload.getbands())
+    return len(payload)
+
+
+def encode_png(image: Image.Image) -> bytes:
+    """Returns the image as a quickly compressed PNG"""
+    png = io.BytesIO()
+    image.save(png, format="PNG", compress_level=1)
+    return png.getvalue()
+
+
+class ArchiveWriter:
+    """Appends events to an archive, compressing them in chunks.
+
+    add() only queues the event. Images are PNG encoded and chunks written on a
+    background thread, so recording barely changes the timing of the game thread.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        chunk_bytes: int = CHUNK_BYTES,
+        max_pending_bytes: int = MAX_PENDING_BYTES,
+    ) -> None:
+        self.file: BinaryIO = file
+        self.chunk_bytes: int = chunk_bytes
+        self.max_pending_bytes: int = max_pending_bytes
+        # The chunk being built, only touched by the writer thread
+        self.events: list[str] = []
+        self.blobs = io.BytesIO()
+        self.buffered: int = 0
+        # Payload bytes queued and not yet encoded
+        self.pending: int = 0
+        self.pending_changed = threading.Condition()
+        self.queue: queue.Queue = queue.Queue()
+        self.file.write(MAGIC)
+        self.thread = threading.Thread(
+            target=self.write_events, name="ArchiveWriter", daemon=True
+        )
+        self.thread.start()
+
+    def add(
+        self, event: dict, payload: Union[Image.Image, bytes, None] = None
+    ) -> None:
+        """Queues an event, with an optional image or binary payload stored next to it.
+
+        The image must not be changed afterwards. Only waits when the writer has
+        fallen more than max_pending_bytes behind.
+        """
+        size: int = payload_size(payload)
+        with self.pending_changed:
+            self.pending_changed.wait_for(
+                lambda: self.pending == 0
+                or self.pending + size <= self.max_pending_bytes
+            )
+            self.pending += size
+        self.queue.put((event, payload, size))
+
+    def write_events(self) -> None:
+        """Encodes queued events into chunks until close() queues None"""
+        while True:
+            queued: Optional[tuple] = self.queue.get()
+            if queued is None:
+                self.flush()
+                return
+            event, payload, size = queued
+            if payload is not None:
+                blob: bytes = (
+                    payload if isinstance(payload, bytes) else encode_png(payload)
+                )
+                event["blob"] = [self.blobs.tell(), len(blob)]
+                self.blobs.write(blob)
+                self.buffered += len(blob)
+            line: str = json.dumps(event)
+            self.events.append(line)
+            self.buffered += len(line)
+            with self.pending_changed:
+                self.pending -= size
+                self.pending_changed.notify_all()
+            if self.buffered >= self.chunk_bytes:
+                self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered events as one chunk, only called from the writer thread"""
+        if not self.events:
+            return
+        header: bytes = zlib.compress(f"[{','.join(self.events)}]".encode("utf-8"))
+        blobs: bytes = self.blobs.getvalue()
+        self.file.write(CHUNK_HEADER.pack(len(header), len(blobs)))
+        self.file.write(header)
+        self.file.write(blobs)
+        self.events = []
+        self.blobs = io.BytesIO()
+        self.buffered = 0
+
+    def close(self) -> None:
+        """Writes what is left and closes the file"""
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+def read_archive(path: str) -> Iterator[tuple[dict, Optional[bytes]]]:
+    """Yields every event of an archive in recording order, with its binary payload"""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+        while True:
+            lengths: bytes = file.read(CHUNK_HEADER.size)
+            if len(lengths) < CHUNK_HEADER.size:
+                return
+            header_length, blobs_length = CHUNK_HEADER.unpack(lengths)
+            events: list[dict] = json.loads(zlib.decompress(file.read(header_length)))
+            blobs: bytes = file.read(blobs_length)
+            for event in events:
+                if "blob" in event:
+                    offset, length = event["blob"]
+                    yield event, blobs[offset : offset + length]
+                else:
+                    yield event, None
+
+
+class Recorder:
+    """Wraps the capture, OCR, reader and input functions to log what they see and do"""
+
+    def __init__(self, writer: ArchiveWriter) -> None:
+        self.writer: ArchiveWriter = writer
+        self.start: float = time.monotonic()
+        # Nesting of the current recorded call, logged with each call
+        self.depth = threading.local()
+        # Keys of the image arguments already in the archive
+        self.images: set[str] = set()
+
+    def now(self) -> float:
+        """Seconds since recording started"""
+        return time.monotonic() - self.start
+
+    def grab(self, original: Callable) -> Callable:
+        """Logs every captured region as a PNG"""
+
+        @wraps(original)
+        def recorded_grab(bbox: tuple) -> Image:
+            image: Image = original(bbox)
+            self.writer.add({"kind": "grab", "t": self.now(), "bbox": to_json(bbox)}, image)
+            return image
+
+        return recorded_grab
+
+    def image(self, image: Image) -> str:
+        """Logs an image argument as a PNG the first time it is seen, returns its key"""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=12)
+        digest.update(f"{image.mode}{image.size}".encode("utf-8"))
+        key: str = digest.hexdigest()
+        if key not in self.images:
+            self.images.add(key)
+            self.writer.add({"kind": "image", "t": self.now(), "key": key}, image)
+        return key
+
+    def call(self, module: Any, name: str, original: Callable) -> Callable:
+        """Logs a perception call with its arguments, result and duration"""
+
+        @wraps(original)
+        def recorded_call(*args, **kwargs):
+            depth: int = getattr(self.depth, "value", 0)
+            self.depth.value = depth + 1
+            started: float = self.now()
+            try:
+                result = original(*args, **kwargs)
+            finally:
+                self.depth.value = depth
+            self.writer.add(
+                {
+                    "kind": "call",
+                    "t": started,
+                    "seconds": self.now() - started,
+                    "depth": depth,
+                    "module": module.__name__,
+                    "name": name,
+                    "args": to_json(args, self.image),
+                    "kwargs": to_json(kwargs, self.image),
+                    "result": to_json(result),
+                }
+            )
+            return result
+
+        return recorded_call
+
+    def input(self, name: str, original: Callable) -> Callable:
+        """Logs an input sent to the game"""
+
+        @wraps(original)
+        def recorded_input(*args):
+            self.writer.add(
+                {"kind": "input", "t": self.now(), "name": name, "args": to_json(args)}
+            )
+            return original(*args)
+
+        return recorded_input
+
+
+@contextmanager
+def recording(path: str, chunk_bytes: int = CHUNK_BYTES) -> Iterator[Recorder]:
+    """Records everything the bot captures, reads and sends to the game into an archive"""
+    # pylint: disable=consider-using-with
+    writer = ArchiveWriter(open(path, "wb"), chunk_bytes)
+    recorder = Recorder(writer)
+    with ExitStack() as stack:
+        stack.callback(writer.close)
+        stack.enter_context(
+            mock.patch.object(frame_capture, "grab", recorder.grab(frame_capture.grab))
+        )
+        for module, name in RECORDED_CALLS:
+            stack.enter_context(
+                mock.patch.object(
+                    module, name, recorder.call(module, name, getattr(module, name))
+                )
+            )
+        for name in INPUT_FUNCTIONS:
+            stack.enter_context(
+                mock.patch.object(
+                    mk_functions, name, recorder.input(name, getattr(mk_functions, name))
+                )
+            )
+        yield recorder
+
+
+@dataclass
+class CallStats:
+    """Replay results for one perception function"""
+
+    calls: int = 0
+    matches: int = 0
+    recorded_seconds: list[float] = field(default_factory=list)
+    replayed_seconds: list[float] = field(default_factory=list)
+    mismatches: list[tuple[Any, Any]] = field(default_factory=list)
+
+
+class ReplayScreen:
+    """Serves recorded captures back to frame_capture.grab"""
+
+    def __init__(self) -> None:
+        self.captures: dict[tuple, Image] = {}
+        self.misses = 0
+
+    def show(self, bbox: tuple, image: Image) -> None:
+        """Makes a recorded capture the current contents of its region"""
+        self.captures.pop(bbox, None)
+        self.captures[bbox] = image
+
+    def grab(self, bbox: tuple) -> Image:
+        """Returns the latest capture of the box, or a crop of the latest one containing it"""
+        bbox = tuple(bbox)
+        if bbox in self.captures:
+            return self.captures[bbox]
+        for source, image in reversed(self.captures.items()):
+            if (
+                source[0] <= bbox[0]
+                and source[1] <= bbox[1]
+                and bbox[2] <= source[2]
+                and bbox[3] <= source[3]
+            ):
+                return image.crop(
+                    (
+                        bbox[0] - source[0],
+                        bbox[1] - source[1],
+                        bbox[2] - source[0],
+                        bbox[3] - source[1],
+                    )
+                )
+        self.misses += 1
+        return Image.new("RGB", (bbox[2] - bbox[0], bbox[3] - bbox[1]))
+
+
+def replay_arguments(
+    args: list,
+    kwargs: dict,
+    comps: Optional[CompsManager],
+    images: dict[str, Image],
+) -> Optional[tuple[list, dict]]:
+    """Turns recorded arguments back into call arguments, None if one can't be rebuilt.
+
+    Frames are dropped so readers grab their own region from the replayed screen,
+    and images are loaded back from the archive.
+    """
+    rebuilt: dict = {}
+    for key, value in list(enumerate(args)) + list(kwargs.items()):
+        if isinstance(value, dict) and "object" in value:
+            if value["object"] == "Frame":
+                value = None
+            elif value["object"] == "CompsManager" and comps is not None:
+                value = comps
+            elif value["object"] == "Image" and value.get("image") in images:
+                value = images[value["image"]]
+            else:
+                return None
+        rebuilt[key] = tuple(value) if isinstance(value, list) else value
+    return (
+        [rebuilt[index] for index in range(len(args))],
+        {key: rebuilt[key] for key in kwargs},
+    )
+
+
+def replay(path: str, comps: Optional[CompsManager] = None) -> dict[str, CallStats]:
+    """Feeds an archive's captures back through the perception code.
+
+    Every call to a recorded function, including the OCR calls made from inside
+    the readers, is made again against the captures and images it saw, with
+    input stubbed. Returns per function how often the result matched the live
+    one and how long each took live and on replay. Calls with arguments that
+    can't be rebuilt, such as get_shop without a CompsManager, are skipped.
+    """
+    screen = ReplayScreen()
+    images: dict[str, Image] = {}
+    stats: dict[str, CallStats] = {}
+    functions: dict[tuple[str, str], Callable] = {
+        (module.__name__, name): getattr(module, name) for module, name in RECORDED_CALLS
+    }
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(frame_capture, "grab", screen.grab))
+        for name in INPUT_FUNCTIONS:
+            stack.enter_context(
+                mock.patch.object(mk_functions, name, lambda *args: None)
+            )
+        for event, blob in read_archive(path):
+            if event["kind"] == "grab":
+                screen.show(tuple(event["bbox"]), Image.open(io.BytesIO(blob)).copy())
+                continue
+            if event["kind"] == "image":
+                images[event["key"]] = Image.open(io.BytesIO(blob)).copy()
+                continue
+            if event["kind"] != "call":
+                continue
+            arguments: Optional[tuple[list, dict]] = replay_arguments(
+                event["args"], event["kwargs"], comps, images
+            )
+            if arguments is None:
+                continue
+            started: float = time.perf_counter()
+            result = functions[event["module"], event["name"]](
+                *arguments[0], **arguments[1]
+            )
+            elapsed: float = time.perf_counter() - started
+
+            call: CallStats = stats.setdefault(
+                f"{event['module']}.{event['name']}", CallStats()
+            )
+            call.calls += 1
+            call.recorded_seconds.append(event["seconds"])
+            call.replayed_seconds.append(elapsed)
+            if to_json(result) == event["result"]:
+                call.matches += 1
+            else:
+                call.mismatches.append((event["result"], to_json(result)))
+    return stats
+
+
+def print_report(stats: dict[str, CallStats]) -> None:
+    """Prints accuracy and latency per replayed function"""
+    for name, call in sorted(stats.items()):
+        recorded: float = sum(call.recorded_seconds) / call.calls * 1000
+        replayed: float = sum(call.replayed_seconds) / call.calls * 1000
+        print(
+            f"{name}: {call.matches}/{call.calls} match, "
+            f"{recorded:.2f} ms live, {replayed:.2f} ms replayed"
+        )
+
+
+if __name__ == "__main__":
+    print_report(replay(sys.argv[1]))
@@ -0,0 +1,138 @@
+"""
+Closed-vocabulary round banner recognizer: every round string is rendered from learned
+glyphs and the banner is matched against all of them, for every layout, in one comparison
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+import game_assets
+from digit_matcher import (
+    GLYPH_HEIGHT,
+    GLYPH_WIDTH,
+    MAX_TEMPLATES_PER_LABEL,
+    GlyphVotes,
+    crop_id,
+    segment_glyphs,
+)
+
+MIN_CONFIDENCE = 0.92
+# Every round string is "stage-round"
+ROUND_LENGTH = 3
+GLYPH_SIZE = GLYPH_WIDTH * GLYPH_HEIGHT
+
+
+@dataclass(frozen=True)
+class RoundMatch:
+    """A recognized round, the banner layout it was found at and how well it matched"""
+
+    round: str
+    layout: int
+    confidence: float
+
+    @property
+    def confident(self) -> bool:
+        """True when the match can be used without checking it with Tesseract"""
+        return self.confidence >= MIN_CONFIDENCE
+
+
+class BannerAtlas:
+    """Glyph templates of the banner font and the round strings rendered from them"""
+
+    def __init__(self) -> None:
+        self.glyphs: dict[str, list[np.ndarray]] = {}
+        # Tesseract reads of glyphs that aren't trusted as templates yet
+        self.votes: GlyphVotes = GlyphVotes()
+        self.rounds: list[str] = []
+        # One row per renderable round with the glyph vector of each of its characters
+        self.renders: np.ndarray = np.empty(
+            (0, ROUND_LENGTH, GLYPH_SIZE), dtype=np.float32
+        )
+
+    def add(self, label: str, glyph: np.ndarray) -> bool:
+        """Adds a glyph template, returns whether the atlas changed"""
+        templates: list[np.ndarray] = self.glyphs.setdefault(label, [])
+        if len(templates) >= MAX_TEMPLATES_PER_LABEL:
+            return False
+        templates.append(glyph)
+        return True
+
+    def render(self) -> None:
+        """Renders every round whose characters have all been learned"""
+        mean_glyphs: dict[str, np.ndarray] = {}
+        for label, templates in self.glyphs.items():
+            glyph: np.ndarray = np.mean(templates, axis=0)
+            mean_glyphs[label] = glyph / max(float(np.linalg.norm(glyph)), 1e-6)
+        self.rounds = sorted(
+            game_round
+            for game_round in game_assets.ROUNDS
+            if len(game_round) == ROUND_LENGTH
+            and all(char in mean_glyphs for char in game_round)
+        )
+        if not self.rounds:
+            self.renders = np.empty((0, ROUND_LENGTH, GLYPH_SIZE), dtype=np.float32)
+            return
+        self.renders = np.stack(
+            [
+                np.stack([mean_glyphs[char] for char in game_round])
+                for game_round in self.rounds
+            ]
+        )
+
+    def match(self, banners: dict[int, np.ndarray]) -> Optional[RoundMatch]:
+        """Scores the thresholded crop of every layout against every rendered round at once.
+
+        A round scores its worst glyph correlation, so a character that hasn't
+        been learned can't pass as a similar one. The best round and layout win.
+        """
+        layouts: list[int] = []
+        vectors: list[np.ndarray] = []
+        for layout, thresholding in banners.items():
+            glyphs: np.ndarray = segment_glyphs(thresholding)
+            if len(glyphs) == ROUND_LENGTH:
+                layouts.append(layout)
+                vectors.append(glyphs)
+        if not layouts or not self.rounds:
+            return None
+        scores: np.ndarray = np.einsum(
+            "lkg,rkg->lrk", np.stack(vectors), self.renders
+        ).min(axis=2)
+        layout_index, round_index = divmod(int(scores.argmax()), scores.shape[1])
+        return RoundMatch(
+            self.rounds[round_index],
+            layouts[layout_index],
+            float(scores[layout_index, round_index]),
+        )
+
+
+_ATLAS = BannerAtlas()
+_ATLAS_LOCK = threading.Lock()
+
+
+def match_round(banners: dict[int, np.ndarray]) -> Optional[RoundMatch]:
+    """Returns the best round for the thresholded banner crop of each layout, None if
+    no crop looks like a round or no round can be rendered yet."""
+    with _ATLAS_LOCK:
+        return _ATLAS.match(banners)
+
+
+def learn(thresholding: np.ndarray, game_round: str) -> None:
+    """Votes the glyphs of a banner crop with the round Tesseract read for it.
+
+    Glyphs become templates once reads of different crops agree on them, then
+    the rounds they complete are rendered.
+    """
+    glyphs: np.ndarray = segment_glyphs(thresholding)
+    if len(game_round) != ROUND_LENGTH or len(glyphs) != ROUND_LENGTH:
+        return
+    crop: int = crop_id(thresholding)
+    with _ATLAS_LOCK:
+        changed: bool = False
+        for label, glyph in zip(game_round, glyphs):
+            if _ATLAS.votes.vote(label, glyph, crop):
+                changed = _ATLAS.add(label, glyph) or changed
+        if changed:
+            _ATLAS.render()
@@ -0,0 +1,153 @@
+"""
+Per-game table of what every round is, built once from game_assets and patched by encounters
+"""
+
+from enum import IntEnum, IntFlag
+from typing import Optional
+
+import game_assets
+
+STAGES = 7
+ROUNDS_PER_STAGE = 8
+
+
+class RoundType(IntEnum):
+    """Kinds of round, a higher value wins when a round could be two kinds"""
+
+    NONE = 0
+    ENCOUNTER = 1
+    SECOND = 2
+    CAROUSEL = 3
+    PVE = 4
+    PVP = 5
+    PORTAL = 6
+
+
+class RoundFlag(IntFlag):
+    """Extra tasks that happen during a round"""
+
+    NONE = 0
+    AUGMENT = 1
+    ANVIL = 2
+    PICKUP = 4
+    ITEM_PLACEMENT = 8
+
+
+# Kinds and flags an encounter check of a stage reassigns
+ENCOUNTER_TYPES = (RoundType.CAROUSEL, RoundType.PVE, RoundType.PVP)
+ENCOUNTER_FLAGS = RoundFlag.ANVIL | RoundFlag.ITEM_PLACEMENT
+
+# "stage-round" text of every round to its (stage, round) numbers
+ROUND_POSITIONS: dict[str, tuple[int, int]] = {
+    f"{stage}-{game_round}": (stage, game_round)
+    for stage in range(1, STAGES + 1)
+    for game_round in range(1, ROUNDS_PER_STAGE + 1)
+}
+
+
+def round_index(stage: int, game_round: int) -> int:
+    """Returns the table slot of a round"""
+    return (stage - 1) * ROUNDS_PER_STAGE + game_round - 1
+
+
+class RoundTable:
+    """The kind, flags and level targets of every round of one game.
+
+    game_assets holds the default layout and is never changed, encounters
+    only patch this game's copy.
+    """
+
+    def __init__(self) -> None:
+        size: int = STAGES * ROUNDS_PER_STAGE
+        self.types: bytearray = bytearray(size)
+        self.flags: bytearray = bytearray(size)
+        self.normal_levels: bytearray = bytearray(size)
+        self.fast8_levels: bytearray = bytearray(size)
+
+        for round_type, rounds in (
+            (RoundType.ENCOUNTER, game_assets.ENCOUNTER_ROUNDS),
+            (RoundType.SECOND, game_assets.SECOND_ROUND),
+            (RoundType.CAROUSEL, game_assets.CAROUSEL_ROUND),
+            (RoundType.PVE, game_assets.PVE_ROUND),
+            (RoundType.PVP, game_assets.PVP_ROUND),
+            (RoundType.PORTAL, game_assets.PORTAL_ROUND),
+        ):
+            for index in self.indices(rounds):
+                self.types[index] = max(self.types[index], round_type)
+        for flag, rounds in (
+            (RoundFlag.AUGMENT, game_assets.AUGMENT_ROUNDS),
+            (RoundFlag.ANVIL, game_assets.ANVIL_ROUNDS),
+            (RoundFlag.PICKUP, game_assets.PICKUP_ROUNDS),
+            (RoundFlag.ITEM_PLACEMENT, game_assets.ITEM_PLACEMENT_ROUNDS),
+        ):
+            for index in self.indices(rounds):
+                self.flags[index] |= flag
+        for levels, targets in (
+            (self.normal_levels, game_assets.NORMAL_LEVEL_ROUNDS),
+            (self.fast8_levels, game_assets.FAST8_LEVEL_ROUNDS),
+        ):
+            for name, level in targets.items():
+                levels[round_index(*ROUND_POSITIONS[name])] = level
+
+    @staticmethod
+    def indices(rounds: set[str]) -> list[int]:
+        """Returns the table slots of the rounds, skipping placeholders such as "0-0" """
+        return [
+            round_index(*ROUND_POSITIONS[name]) for name in rounds if name in ROUND_POSITIONS
+        ]
+
+    @staticmethod
+    def index(name: str) -> int:
+        """Returns the table slot of a round, -1 for text that isn't a round"""
+        position: Optional[tuple[int, int]] = ROUND_POSITIONS.get(name)
+        return round_index(*position) if position is not None else -1
+
+    def round_type(self, name: str) -> RoundType:
+        """Returns what kind of round it is"""
+        index: int = self.index(name)
+        return RoundType(self.types[index]) if index >= 0 else RoundType.NONE
+
+    def has(self, name: str, flag: RoundFlag) -> bool:
+        """Returns whether the round has the flag"""
+        index: int = self.index(name)
+        return index >= 0 and bool(self.flags[index] & flag)
+
+    def level_target(self, name: str, fast8: bool = False) -> int:
+        """Returns the level to reach during the round, 0 if there is none"""
+        index: int = self.index(name)
+        if index < 0:
+            return 0
+        return (self.fast8_levels if fast8 else self.normal_levels)[index]
+
+    def apply_encounters(self, stage: int, round_messages: list[str]) -> None:
+        """Relabels a stage from what its round icons say.
+
+        Carousel, PvE and PvP rounds and anvil and item placement flags of the
+        stage are cleared first, then every round after the first is set from
+        its message: a carousel brings anvils and item placement the round
+        after, and an encounter in the second round of stage 3 or 4 pushes
+        that augment to the third.
+        """
+        for game_round in range(1, ROUNDS_PER_STAGE + 1):
+            index: int = round_index(stage, game_round)
+            if self.types[index] in ENCOUNTER_TYPES:
+                self.types[index] = RoundType.NONE
+            self.flags[index] &= ~ENCOUNTER_FLAGS & 0xFF
+        for message_index, round_message in enumerate(round_messages):
+            game_round = message_index + 1
+            if game_round == 1 or game_round > ROUNDS_PER_STAGE:
+                continue
+            index = round_index(stage, game_round)
+            round_type: RoundType = {
+                "carousel": RoundType.CAROUSEL,
+                "pve": RoundType.PVE,
+                "pvp": RoundType.PVP,
+                "encounter": RoundType.ENCOUNTER,
+            }[round_message]
+            self.types[index] = max(self.types[index], round_type)
+            if game_round == ROUNDS_PER_STAGE:
+                continue
+            if round_type == RoundType.CAROUSEL:
+                self.flags[index + 1] |= ENCOUNTER_FLAGS
+            elif round_type == RoundType.ENCOUNTER and game_round == 2 and 3 <= stage <= 4:
+                self.flags[index + 1] |= RoundFlag.AUGMENT
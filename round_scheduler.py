@@ -0,0 +1,159 @@
+"""
+Runs a round's planning tasks against the phase deadline, skipping the ones that don't fit
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Seconds a task is assumed to take before it has been timed
+DEFAULT_COST = 1.0
+DEFAULT_COSTS: dict[str, float] = {
+    "fix_bench_state": 0.5,
+    "bench_cleanup": 0.3,
+    "clear_anvil": 1.0,
+    "spend_gold": 2.0,
+    "move_champions": 2.0,
+    "replace_unknown": 2.0,
+    "final_comp_check": 1.0,
+    "place_items": 2.0,
+}
+# Weight of the latest timing in a task's running estimate
+COST_SMOOTHING = 0.3
+# Seconds left free before the phase ends, since clicks made then are lost
+SAFETY_MARGIN = 1.0
+
+
+@dataclass(frozen=True)
+class Task:
+    """One planning action, higher priorities win when time is short"""
+
+    name: str
+    action: Callable[[], None]
+    priority: int = 0
+    # Required tasks run even without time left
+    required: bool = False
+
+
+class CostModel:
+    """Running estimates of how long each task takes, learned from its timings"""
+
+    def __init__(self, defaults: Optional[dict[str, float]] = None) -> None:
+        self.estimates: dict[str, float] = dict(
+            DEFAULT_COSTS if defaults is None else defaults
+        )
+
+    def estimate(self, name: str) -> float:
+        """Returns the expected seconds of a task"""
+        return self.estimates.get(name, DEFAULT_COST)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Folds a timing into the task's estimate"""
+        self.estimates[name] = (
+            1 - COST_SMOOTHING
+        ) * self.estimate(name) + COST_SMOOTHING * seconds
+
+
+@dataclass
+class TaskRecord:
+    """What the scheduler planned for a task and what happened"""
+
+    name: str
+    estimate: float
+    planned: bool
+    ran: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class RoundSchedule:
+    """The planned and actual schedule of one round"""
+
+    round: str
+    budget: float
+    records: list[TaskRecord] = field(default_factory=list)
+
+    def report(self) -> str:
+        """Returns the schedule as printable lines"""
+        lines: list[str] = [f"  [Schedule] {self.round}: {self.budget:.1f} s budget"]
+        for record in self.records:
+            if record.ran:
+                outcome: str = f"took {record.seconds:.2f} s"
+            elif record.planned:
+                outcome = "skipped, out of time"
+            else:
+                outcome = "skipped, not planned"
+            lines.append(f"    {record.name}: est. {record.estimate:.2f} s, {outcome}")
+        return "\n".join(lines)
+
+
+# Shared by every game in the process so estimates carry over
+COST_MODEL = CostModel()
+
+
+class RoundScheduler:
+    """Plans which tasks fit before the deadline and runs them in order.
+
+    Tasks are planned by priority against their estimated cost, then run in
+    the order given, since later tasks depend on earlier ones. Before each
+    task the real time left is checked again, keeping room for the
+    higher-priority tasks still ahead.
+    """
+
+    def __init__(
+        self, costs: Optional[CostModel] = None, margin: float = SAFETY_MARGIN
+    ) -> None:
+        self.costs: CostModel = COST_MODEL if costs is None else costs
+        self.margin: float = margin
+        self.history: list[RoundSchedule] = []
+
+    def plan(self, tasks: list[Task], budget: float) -> set[int]:
+        """Returns the indices of the tasks that fit the budget, by priority"""
+        available: float = budget - self.margin
+        planned: set[int] = set()
+        for index, task in enumerate(tasks):
+            if task.required:
+                planned.add(index)
+                available -= self.costs.estimate(task.name)
+        by_priority: list[int] = sorted(
+            (index for index, task in enumerate(tasks) if not task.required),
+            key=lambda index: -tasks[index].priority,
+        )
+        for index in by_priority:
+            cost: float = self.costs.estimate(tasks[index].name)
+            if cost <= available:
+                planned.add(index)
+                available -= cost
+        return planned
+
+    def reserved(self, tasks: list[Task], planned: set[int], index: int) -> float:
+        """Returns the estimated seconds of the planned tasks after this one that outrank it"""
+        return sum(
+            self.costs.estimate(tasks[later].name)
+            for later in planned
+            if later > index
+            and (tasks[later].required or tasks[later].priority > tasks[index].priority)
+        )
+
+    def run(self, round_name: str, tasks: list[Task], deadline: float) -> RoundSchedule:
+        """Runs the tasks that fit before the time.monotonic() deadline and logs the schedule"""
+        schedule = RoundSchedule(round_name, deadline - time.monotonic())
+        planned: set[int] = self.plan(tasks, schedule.budget)
+        for index, task in enumerate(tasks):
+            record = TaskRecord(task.name, self.costs.estimate(task.name), index in planned)
+            schedule.records.append(record)
+            if not record.planned:
+                continue
+            left: float = deadline - time.monotonic() - self.margin
+            if not task.required and left < record.estimate + self.reserved(
+                tasks, planned, index
+            ):
+                continue
+            started: float = time.perf_counter()
+            task.action()
+            record.seconds = time.perf_counter() - started
+            record.ran = True
+            self.costs.observe(task.name, record.seconds)
+        self.history.append(schedule)
+        print(schedule.report())
+        return schedule
@@ -7,6 +7,9 @@ Screen coords for 1920x1080 screens
 from vec2 import Vec2
 from vec4 import GameWindow, Vec4
 
+# The whole game window, every other Vec4 region lies inside it
+GAME_WINDOW_POS: Vec4 = Vec4(GameWindow(0, 0, 1920, 1080))
+
 BENCH_HEALTH_POS: list[Vec4] = [
     Vec4(GameWindow(369, 650, 472, 757)),
     Vec4(GameWindow(485, 650, 588, 757)),
@@ -0,0 +1,83 @@
+"""
+Watches a few small screen regions and reports which ones changed, so the game loop
+only runs perception when something on screen moved
+"""
+
+import time
+import zlib
+from typing import Iterable, Optional
+
+import numpy as np
+from PIL import Image
+
+import frame_capture
+import screen_coords
+from vec4 import Vec4
+
+# Regions whose changes wake the game loop
+WATCHED_REGIONS: dict[str, Vec4] = {
+    "round": screen_coords.ROUND_POS,
+    "timer": screen_coords.SECONDS_REMAINING_POS,
+}
+# Seconds between samples
+SAMPLE_INTERVAL = 0.1
+# Low bits of each grey level dropped before hashing, so noise doesn't count as a change
+QUANTIZE_SHIFT = 3
+
+
+def region_hash(image: Image) -> int:
+    """Returns a hash of the region's coarse grey levels"""
+    pixels: np.ndarray = np.asarray(image.convert("L"), dtype=np.uint8) >> QUANTIZE_SHIFT
+    return zlib.crc32(pixels.tobytes())
+
+
+class ScreenWatcher:
+    """Samples the watched regions in one small grab and hashes each of them.
+
+    The first sample after creating the watcher reports every region as changed.
+    """
+
+    def __init__(self, regions: Optional[dict[str, Vec4]] = None) -> None:
+        self.regions: dict[str, Vec4] = WATCHED_REGIONS if regions is None else regions
+        self.hashes: dict[str, int] = {}
+        # The last grab, so a region that changed can be read without grabbing it again
+        self.frame: Optional[frame_capture.Frame] = None
+
+    def sample(self) -> set[str]:
+        """Grabs the regions once and returns the names of the ones that changed"""
+        # Resolved on every sample since the game window may move or resize
+        coords: dict[str, tuple] = {
+            name: position.get_coords() for name, position in self.regions.items()
+        }
+        bbox: tuple = (
+            min(box[0] for box in coords.values()),
+            min(box[1] for box in coords.values()),
+            max(box[2] for box in coords.values()),
+            max(box[3] for box in coords.values()),
+        )
+        self.frame = frame_capture.Frame(frame_capture.grab(bbox), bbox)
+        changed: set[str] = set()
+        for name, box in coords.items():
+            digest: int = region_hash(self.frame.crop_coords(box))
+            if self.hashes.get(name) != digest:
+                self.hashes[name] = digest
+                changed.add(name)
+        return changed
+
+    def wait(
+        self, timeout: float, names: Optional[Iterable[str]] = None
+    ) -> set[str]:
+        """Samples until one of the named regions, all by default, changes.
+
+        Returns the regions that changed in that sample, an empty set on timeout.
+        """
+        wanted: set[str] = set(self.regions if names is None else names)
+        deadline: float = time.monotonic() + timeout
+        while True:
+            changed: set[str] = self.sample()
+            if changed & wanted:
+                return changed
+            left: float = deadline - time.monotonic()
+            if left <= 0:
+                return set()
+            time.sleep(min(SAMPLE_INTERVAL, left))
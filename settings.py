@@ -7,3 +7,9 @@ LEAGUE_CLIENT_PATH = (
     # Replace None with your path. Ex: 'C:\\Riot Games\\League of Legends'
 )
 TESSERACT_TESSDATA_PATH = r"C:\\Program Files\\Tesseract-OCR\\tessdata"
+LIVE_CLIENT_POLL_INTERVAL = 0.5  # Seconds between Live Client Data API requests
+LIVE_CLIENT_SNAPSHOT_TTL = 2.0  # Seconds before a Live Client Data snapshot is fetched again
+LIVE_CLIENT_TIMEOUT = 1.0  # Seconds a Live Client Data API request may take
+LIVE_CLIENT_MAX_BACKOFF = 10.0  # Most seconds between Live Client Data requests while they fail
+RECORDING_DIR = None  # Folder to record every game into for replay, None disables recording
+ITEM_ICON_DIR = "item_icons"  # Folder of item icons named after the item, used to read the item bench
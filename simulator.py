@@ -0,0 +1,664 @@
+"""
+Deterministic, headless stand-in for the game client so Arena's decision logic
+can be played through whole games in-process, and a throughput benchmark for it
+
+The simulation answers at the boundaries the bot reads and writes through:
+frame_capture.grab, the OCR-backed readers in arena_functions, game_functions and ocr,
+the Live Client snapshot and the pydirectinput calls made by mk_functions.
+Sleeps and input timeouts run on a virtual clock.
+"""
+
+import io
+import queue
+import random
+import sys
+import time
+import types
+from collections import Counter
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from unittest import mock
+
+from PIL import Image
+
+try:
+    import pydirectinput  # pylint: disable=unused-import
+except ImportError:
+    # pydirectinput only exists on Windows, every call mk_functions makes is answered below
+    sys.modules["pydirectinput"] = types.ModuleType("pydirectinput")
+
+# pylint: disable=wrong-import-position
+import arena
+import arena_functions
+import frame_capture
+import game_assets
+import game_functions
+import input_sequencer
+import mk_functions
+import ocr
+import screen_coords
+from comps import CompsManager
+
+# Chance of each champion cost (1 to 5) showing up in a shop slot, by level
+SHOP_ODDS: dict[int, tuple[float, ...]] = {
+    1: (1.0, 0.0, 0.0, 0.0, 0.0),
+    2: (1.0, 0.0, 0.0, 0.0, 0.0),
+    3: (0.75, 0.25, 0.0, 0.0, 0.0),
+    4: (0.55, 0.30, 0.15, 0.0, 0.0),
+    5: (0.45, 0.33, 0.20, 0.02, 0.0),
+    6: (0.30, 0.40, 0.25, 0.05, 0.0),
+    7: (0.19, 0.30, 0.40, 0.10, 0.01),
+    8: (0.18, 0.25, 0.32, 0.22, 0.03),
+    9: (0.10, 0.20, 0.25, 0.35, 0.10),
+    10: (0.05, 0.10, 0.20, 0.40, 0.25),
+}
+
+# Copies of each champion in the shared pool, by cost
+POOL_SIZES: dict[int, int] = {1: 30, 2: 25, 3: 18, 4: 10, 5: 9}
+
+# XP needed to go from a level to the next one
+XP_TO_LEVEL: dict[int, int] = {1: 2, 2: 6, 3: 10, 4: 20, 5: 36, 6: 48, 7: 76, 8: 84, 9: 100}
+
+# Base damage taken on a lost fight, by stage
+STAGE_DAMAGE: dict[int, int] = {1: 0, 2: 2, 3: 6, 4: 7, 5: 10, 6: 12, 7: 17}
+
+# Board strength of an average opponent, by stage
+STAGE_STRENGTH: dict[int, float] = {1: 2, 2: 6, 3: 14, 4: 26, 5: 40, 6: 55, 7: 70}
+
+SHOP_SIZE = 5
+PLANNING_SECONDS = 30
+# How far from a screen_coords location a click still lands on it
+HIT_RADIUS = 40
+
+
+@dataclass
+class Unit:
+    """A champion owned by the simulated player"""
+
+    name: str
+    star: int = 1
+    items: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Outcome of one simulated game"""
+
+    seed: int
+    last_round: str
+    rounds_played: int
+    health: int
+    level: int
+    gold: int
+    board: tuple[str, ...]
+    seconds: float
+
+
+class SimClock:
+    """Virtual time, so waits cost nothing and runs are reproducible"""
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def monotonic(self) -> float:
+        """Stands in for time.monotonic"""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Stands in for time.sleep"""
+        self.now += seconds
+
+
+class SimInput:
+    """Answers the pydirectinput calls made by mk_functions"""
+
+    def __init__(self, game: "SimulatedGame") -> None:
+        self.game: SimulatedGame = game
+
+    def moveTo(self, x_pos: int, y_pos: int) -> None:  # pylint: disable=invalid-name
+        """Moves the simulated cursor"""
+        self.game.mouse = (x_pos, y_pos)
+
+    def mouseDown(self, button: str = "left") -> None:  # pylint: disable=invalid-name
+        """Clicks are handled on release"""
+
+    def mouseUp(self, button: str = "left") -> None:  # pylint: disable=invalid-name
+        """Clicks at the cursor"""
+        if button == "right":
+            self.game.right_click()
+        else:
+            self.game.left_click()
+
+    def press(self, key: str) -> None:
+        """Presses a key at the cursor"""
+        self.game.press(key)
+
+
+def synthetic_champions(rng: random.Random) -> dict[str, dict]:
+    """Builds a champion table shaped like main.load_champions_data"""
+    traits: list[str] = [f"Trait{index}" for index in range(12)]
+    champions: dict[str, dict] = {}
+    for cost, count in zip(range(1, 6), (13, 13, 13, 12, 8)):
+        for number in range(count):
+            unit_traits: list[str] = rng.sample(traits, 3)
+            champions[f"Cost{cost}Unit{number}"] = {
+                "Gold": cost,
+                "Board Size": 1,
+                "Trait1": unit_traits[0],
+                "Trait2": unit_traits[1],
+                "Trait3": unit_traits[2] if rng.random() < 0.3 else "",
+            }
+    return champions
+
+
+def synthetic_comp(rng: random.Random, champions: dict[str, dict], size: int = 8) -> list:
+    """Builds a comp shaped like the ones auto_comps loads"""
+    names: list[str] = rng.sample(sorted(champions), size)
+    positions: list[int] = rng.sample(range(28), size)
+    craftables: list[str] = sorted(game_assets.CRAFTABLE_ITEMS_DICT)
+    carries: set[str] = set(rng.sample(names, 3))
+    comp: dict[str, dict] = {
+        name: {
+            "board_position": position,
+            "level": 2 if champions[name]["Gold"] <= 3 else 1,
+            "items": rng.sample(craftables, 3) if name in carries else [],
+            "final_comp": champions[name]["Gold"] >= 3,
+        }
+        for name, position in zip(names, positions)
+    }
+    return ["Simulated", comp, []]
+
+
+def round_schedule() -> list[str]:
+    """Returns the rounds of game_assets that have a known type, in play order"""
+    typed: set[str] = set().union(
+        game_assets.PORTAL_ROUND,
+        game_assets.SECOND_ROUND,
+        game_assets.CAROUSEL_ROUND,
+        game_assets.PVE_ROUND,
+        game_assets.PVP_ROUND,
+    )
+    return sorted(
+        (game_round for game_round in game_assets.ROUNDS if game_round in typed),
+        key=lambda game_round: tuple(int(part) for part in game_round.split("-")),
+    )
+
+
+class SimulatedGame:
+    """In-process model of one player's game: shop pool, economy, bench, board and items.
+
+    Everything random comes from one seeded generator, so the same seed and the
+    same decisions always play out the same game.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, champions: dict[str, dict], seed: int = 0) -> None:
+        self.rng = random.Random(seed)
+        self.clock = SimClock()
+        self.champions: dict[str, dict] = champions
+        self.by_cost: dict[int, list[str]] = {}
+        for name, data in sorted(champions.items()):
+            self.by_cost.setdefault(data["Gold"], []).append(name)
+        self.pool: Counter = Counter(
+            {name: POOL_SIZES[data["Gold"]] for name, data in champions.items()}
+        )
+        self.schedule: list[str] = round_schedule()
+        self.round_index = 0
+        self.phase_end: float = PLANNING_SECONDS
+        self.gold = 0
+        self.level = 1
+        self.xp = 0
+        self.health = 100
+        self.shop: list[Optional[str]] = [None] * SHOP_SIZE
+        self.bench: list[Optional[Unit]] = [None] * 9
+        self.board: list[Optional[Unit]] = [None] * 28
+        self.items: list[Optional[str]] = [None] * 10
+        self.mouse: tuple = (0, 0)
+        self.held: Optional[tuple[str, int]] = None
+        self.inspected = ""
+        # Bumped on every change, grabs of any region show it
+        self.version = 0
+        self.targets: list[tuple[str, int, tuple]] = (
+            [("shop", i, loc.get_coords()) for i, loc in enumerate(screen_coords.BUY_LOC)]
+            + [("bench", i, loc.get_coords()) for i, loc in enumerate(screen_coords.BENCH_LOC)]
+            + [("board", i, loc.get_coords()) for i, loc in enumerate(screen_coords.BOARD_LOC)]
+            + [("item", i, pos[0].get_coords()) for i, pos in enumerate(screen_coords.ITEM_POS)]
+        )
+        self.refresh_shop()
+
+    @property
+    def round(self) -> str:
+        """The round being played"""
+        return self.schedule[min(self.round_index, len(self.schedule) - 1)]
+
+    @property
+    def stage(self) -> int:
+        """The stage of the round being played"""
+        return int(self.round.split("-")[0])
+
+    def changed(self) -> None:
+        """Marks the screen as changed"""
+        self.version += 1
+
+    def cost(self, name: str) -> int:
+        """Gold cost of a champion"""
+        return self.champions[name]["Gold"]
+
+    def units(self) -> Iterator[tuple[str, int, Unit]]:
+        """Yields every owned unit with where it is, board first"""
+        for where, slots in (("board", self.board), ("bench", self.bench)):
+            for index, unit in enumerate(slots):
+                if unit is not None:
+                    yield where, index, unit
+
+    def slots(self, where: str) -> list[Optional[Unit]]:
+        """The bench or the board"""
+        return self.bench if where == "bench" else self.board
+
+    def roll_champion(self) -> Optional[str]:
+        """Draws a champion for a shop slot using the level's odds and the pool"""
+        cost: int = self.rng.choices(range(1, 6), SHOP_ODDS[self.level])[0]
+        names: list[str] = [name for name in self.by_cost.get(cost, []) if self.pool[name] > 0]
+        if not names:
+            return None
+        return self.rng.choices(names, [self.pool[name] for name in names])[0]
+
+    def refresh_shop(self) -> None:
+        """Fills every shop slot again"""
+        self.shop = [self.roll_champion() for _ in range(SHOP_SIZE)]
+        self.changed()
+
+    def add_xp(self, amount: int) -> None:
+        """Adds XP and levels up as far as it reaches"""
+        self.xp += amount
+        while self.level < 10 and self.xp >= XP_TO_LEVEL[self.level]:
+            self.xp -= XP_TO_LEVEL[self.level]
+            self.level += 1
+        self.changed()
+
+    def combine(self, name: str) -> None:
+        """Merges three copies of the same star level into one of the next"""
+        for star in (1, 2):
+            copies: list[tuple[str, int, Unit]] = [
+                entry for entry in self.units() if entry[2].name == name and entry[2].star == star
+            ]
+            if len(copies) < 3:
+                return
+            kept: Unit = copies[0][2]
+            for where, index, unit in copies[1:3]:
+                kept.items.extend(unit.items)
+                self.slots(where)[index] = None
+            for item in kept.items[3:]:
+                self.give_item_to_bench(item)
+            del kept.items[3:]
+            kept.star += 1
+
+    def give_unit(self, name: str) -> bool:
+        """Puts a new copy of the champion on the bench, combining it if it completes a set"""
+        free: Optional[int] = next(
+            (index for index, unit in enumerate(self.bench) if unit is None), None
+        )
+        copies: list[tuple[str, int, Unit]] = [
+            entry for entry in self.units() if entry[2].name == name and entry[2].star == 1
+        ]
+        if free is None and len(copies) < 2:
+            return False
+        self.pool[name] -= 1
+        if free is None:
+            # A full bench still takes the copy that completes a set, it merges right away
+            kept: Unit = copies[0][2]
+            where, index, merged = copies[1]
+            kept.items.extend(merged.items)
+            self.slots(where)[index] = None
+            for item in kept.items[3:]:
+                self.give_item_to_bench(item)
+            del kept.items[3:]
+            kept.star = 2
+        else:
+            self.bench[free] = Unit(name)
+        self.combine(name)
+        self.changed()
+        return True
+
+    def give_item_to_bench(self, item: str) -> None:
+        """Puts an item in the first free item bench slot, dropping it if the bench is full"""
+        for index, slot in enumerate(self.items):
+            if slot is None:
+                self.items[index] = item
+                self.changed()
+                return
+
+    def buy(self, shop_index: int) -> None:
+        """Buys the champion in a shop slot if there is gold and room for it"""
+        name: Optional[str] = self.shop[shop_index]
+        if name is None or self.gold < self.cost(name) or self.pool[name] <= 0:
+            return
+        if self.give_unit(name):
+            self.gold -= self.cost(name)
+            self.shop[shop_index] = None
+
+    def sell(self, where: str, index: int) -> None:
+        """Sells a unit, its items go back to the item bench"""
+        unit: Optional[Unit] = self.slots(where)[index]
+        if unit is None:
+            return
+        value: int = self.cost(unit.name) * 3 ** (unit.star - 1)
+        self.gold += value - (1 if unit.star > 1 and self.cost(unit.name) > 1 else 0)
+        self.pool[unit.name] += 3 ** (unit.star - 1)
+        for item in unit.items:
+            self.give_item_to_bench(item)
+        self.slots(where)[index] = None
+        self.changed()
+
+    def place(self, where: str, index: int) -> None:
+        """Drops the held unit on a bench or board slot, swapping if it is taken"""
+        from_where, from_index = self.held
+        unit: Unit = self.slots(from_where)[from_index]
+        target: Optional[Unit] = self.slots(where)[index]
+        board_count: int = sum(1 for unit in self.board if unit is not None)
+        if where == "board" and from_where == "bench" and target is None:
+            if board_count >= self.level:
+                return
+        self.slots(from_where)[from_index] = target
+        self.slots(where)[index] = unit
+        self.changed()
+
+    def equip(self, item_index: int, unit: Unit) -> None:
+        """Puts the held item on a unit, crafting it with a component already there"""
+        item: Optional[str] = self.items[item_index]
+        if item is None:
+            return
+        component_pairs: dict[frozenset, str] = {
+            frozenset(pair) if pair[0] != pair[1] else frozenset(pair[:1]): craftable
+            for craftable, pair in game_assets.CRAFTABLE_ITEMS_DICT.items()
+        }
+        if item in game_assets.COMPONENT_ITEMS:
+            for slot, held_item in enumerate(unit.items):
+                if held_item in game_assets.COMPONENT_ITEMS:
+                    craftable = component_pairs.get(frozenset((held_item, item)))
+                    if craftable is not None:
+                        unit.items[slot] = craftable
+                        self.items[item_index] = None
+                        self.changed()
+                        return
+        if len(unit.items) < 3:
+            unit.items.append(item)
+            self.items[item_index] = None
+            self.changed()
+
+    def hit(self) -> Optional[tuple[str, int]]:
+        """Returns the shop, bench, board or item slot under the cursor"""
+        best: Optional[tuple[str, int]] = None
+        best_distance: float = HIT_RADIUS**2
+        for kind, index, (x_pos, y_pos) in self.targets:
+            distance: float = (x_pos - self.mouse[0]) ** 2 + (y_pos - self.mouse[1]) ** 2
+            if distance <= best_distance:
+                best, best_distance = (kind, index), distance
+        return best
+
+    def left_click(self) -> None:
+        """Buys, picks up, drops or equips depending on what is under the cursor"""
+        target: Optional[tuple[str, int]] = self.hit()
+        held, self.held = self.held, None
+        if target is None:
+            return
+        kind, index = target
+        if kind == "shop":
+            self.buy(index)
+        elif kind == "item":
+            self.held = target if self.items[index] is not None else None
+        elif held is not None and held[0] == "item":
+            unit: Optional[Unit] = self.slots(kind)[index]
+            if unit is not None:
+                self.equip(held[1], unit)
+        elif held is not None:
+            self.held = held
+            self.place(kind, index)
+            self.held = None
+        elif self.slots(kind)[index] is not None:
+            self.held = target
+
+    def right_click(self) -> None:
+        """Opens the info panel of the unit under the cursor"""
+        target: Optional[tuple[str, int]] = self.hit()
+        self.inspected = ""
+        if target is not None and target[0] in ("bench", "board"):
+            unit: Optional[Unit] = self.slots(target[0])[target[1]]
+            self.inspected = unit.name if unit is not None else ""
+
+    def press(self, key: str) -> None:
+        """Handles the sell, buy XP and reroll keys"""
+        if key == "e":
+            target: Optional[tuple[str, int]] = self.hit()
+            if target is not None and target[0] in ("bench", "board"):
+                self.sell(*target)
+        elif key == "f" and self.gold >= 4 and self.level < 10:
+            self.gold -= 4
+            self.add_xp(4)
+        elif key == "d" and self.gold >= 2:
+            self.gold -= 2
+            self.refresh_shop()
+
+    def grab(self, bbox: tuple) -> Image:  # pylint: disable=unused-argument
+        """Stands in for frame_capture.grab, any change shows in every region"""
+        return Image.new("L", (1, 1), self.version % 256)
+
+    def wait_until(self, condition, timeout: float) -> bool:
+        """Stands in for input_sequencer.wait_until.
+
+        Nothing changes while the bot waits in the simulation, so a condition that
+        doesn't hold once a changed region had the polls to settle never will and
+        the timeout is simply spent.
+        """
+        polls: int = min(
+            input_sequencer.SETTLE_FRAMES, int(timeout / input_sequencer.POLL_INTERVAL)
+        )
+        for poll in range(polls + 1):
+            if condition():
+                self.clock.sleep(poll * input_sequencer.POLL_INTERVAL)
+                return True
+        self.clock.sleep(timeout)
+        return False
+
+    def snapshot(self, max_age: Optional[float] = None) -> dict:  # pylint: disable=unused-argument
+        """Stands in for LiveClientPoller.snapshot"""
+        return {
+            "activePlayer": {
+                "level": self.level,
+                "championStats": {"currentHealth": self.health},
+            }
+        }
+
+    def read_shop(self, comps: CompsManager, frame=None) -> list:  # pylint: disable=unused-argument
+        """Stands in for arena_functions.get_shop"""
+        return [(index, name or "") for index, name in enumerate(self.shop)]
+
+    def occupied_mask(self, positions: list, frame=None) -> int:  # pylint: disable=unused-argument
+        """Stands in for arena_functions.occupied_mask"""
+        slots: list[Optional[Unit]] = (
+            self.bench if positions is screen_coords.BENCH_HEALTH_POS else self.board
+        )
+        return sum(1 << index for index, unit in enumerate(slots) if unit is not None)
+
+    def read_text(self, screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
+        """Stands in for ocr.get_text, only the info panel and item tooltips have text"""
+        # pylint: disable=unused-argument
+        if screenxy == screen_coords.PANEL_NAME_LOC.get_coords():
+            return self.inspected
+        target: Optional[tuple[str, int]] = self.hit()
+        if target is not None and target[0] == "item":
+            if screenxy == screen_coords.ITEM_POS[target[1]][1].get_coords():
+                return self.items[target[1]] or ""
+        return ""
+
+    @contextmanager
+    def patched(self) -> Iterator["SimulatedGame"]:
+        """Routes the bot's screen reads, inputs, Live Client calls and sleeps to this game"""
+        replacements: list[tuple[object, str, object]] = [
+            (mk_functions, "pydirectinput", SimInput(self)),
+            (mk_functions, "random", self.rng),
+            (frame_capture, "grab", self.grab),
+            (arena_functions, "LIVE_CLIENT", self),
+            (arena_functions, "get_gold", lambda frame=None: self.gold),
+            (arena_functions, "get_level_via_ocr", lambda frame=None: self.level),
+            (arena_functions, "get_shop", self.read_shop),
+            (arena_functions, "get_items", lambda frame=None: list(self.items)),
+            (arena_functions, "occupied_mask", self.occupied_mask),
+            (
+                arena_functions,
+                "get_seconds_remaining",
+                lambda frame=None: max(0, int(self.phase_end - self.clock.now)),
+            ),
+            (game_functions, "get_round", lambda frame=None: [self.round, 3]),
+            (ocr, "get_text", self.read_text),
+            (input_sequencer, "time", self.clock),
+            (input_sequencer, "wait_until", self.wait_until),
+        ]
+        replacements += [
+            (module, "sleep", self.clock.sleep)
+            for module in (arena, arena_functions, game_functions, input_sequencer)
+        ]
+        with ExitStack() as stack:
+            for target, attribute, value in replacements:
+                stack.enter_context(mock.patch.object(target, attribute, value))
+            stack.enter_context(mock.patch("comps.random", self.rng))
+            yield self
+
+    def fight(self) -> None:
+        """Resolves the round's fight and hands out its loot"""
+        if self.round in game_assets.PVE_ROUND or self.stage == 1:
+            for _ in range(self.rng.randint(1, 2)):
+                self.give_item_to_bench(self.rng.choice(sorted(game_assets.COMPONENT_ITEMS)))
+            self.gold += self.rng.choice((0, 0, 1, 3))
+            return
+        strength: float = sum(
+            self.cost(unit.name) * 3 ** (unit.star - 1) + 0.5 * len(unit.items)
+            for unit in self.board
+            if unit is not None
+        )
+        opponent: float = STAGE_STRENGTH[self.stage] * self.rng.uniform(0.7, 1.3)
+        if strength < opponent:
+            self.health -= STAGE_DAMAGE[self.stage] + self.rng.randint(1, 5)
+
+    def carousel(self) -> None:
+        """Hands out a champion and a component like a carousel pick"""
+        cost: int = min(self.stage, 5)
+        names: list[str] = [name for name in self.by_cost[cost] if self.pool[name] > 0]
+        if names:
+            self.give_unit(self.rng.choice(names))
+        self.give_item_to_bench(self.rng.choice(sorted(game_assets.COMPONENT_ITEMS)))
+
+    def advance_round(self) -> None:
+        """Ends the round and starts the next one with its income and a new shop"""
+        if self.round not in game_assets.CAROUSEL_ROUND | game_assets.PORTAL_ROUND:
+            self.fight()
+        self.round_index += 1
+        self.clock.now = max(self.clock.now, self.phase_end)
+        self.phase_end = self.clock.now + PLANNING_SECONDS
+        if self.stage == 1:
+            income: int = 2 if self.round != "1-4" else 3
+        else:
+            income = 5
+        self.gold += income + min(self.gold // 10, 5)
+        if self.round_index > 1:
+            self.add_xp(2)
+        self.refresh_shop()
+
+    def finished(self) -> bool:
+        """True once the player died or the schedule ran out"""
+        return self.health <= 0 or self.round_index >= len(self.schedule)
+
+
+def play_planning(game: SimulatedGame, bot: arena.Arena) -> None:
+    """Mirrors the planning steps of Game.pvp_round and Game.pve_round, augments aside"""
+    game_round: str = game.round
+    if game_round in game_assets.PVP_ROUND and game_round in game_assets.NORMAL_LEVEL_ROUNDS:
+        target_level: int = game_assets.NORMAL_LEVEL_ROUNDS[game_round]
+        while game.level < target_level and game.gold >= 4:
+            bot.buy_xp_round()
+    if game_round in game_assets.PICKUP_ROUNDS:
+        game_functions.pickup_items()
+    bot.fix_bench_state()
+    bot.bench_cleanup()
+    bot.spend_gold(speedy=game_round in game_assets.PICKUP_ROUNDS)
+    bot.move_champions()
+    bot.replace_unknown()
+    if bot.final_comp:
+        bot.final_comp_check()
+    bot.bench_cleanup()
+    if game_round in game_assets.ITEM_PLACEMENT_ROUNDS or len(bot.items) >= 8:
+        bot.place_items()
+    bot.get_label()
+
+
+def play_round(game: SimulatedGame, bot: arena.Arena) -> None:
+    """Runs the bot's tasks for the current round the way Game.game_loop dispatches them"""
+    game_round: str = game.round
+    bot.gold_ledger.invalidate()
+    game_functions.default_pos()
+    bot.check_health()
+    if game_round in game_assets.PORTAL_ROUND:
+        game.carousel()
+    elif game_round in game_assets.SECOND_ROUND:
+        occupied: list = arena_functions.bench_occupied_check()
+        if any(occupied):
+            bot.bench[occupied.index(True)] = "?"
+            for _ in range(arena_functions.get_level_via_https_request()):
+                bot.move_unknown()
+    elif game_round in game_assets.CAROUSEL_ROUND:
+        if game_round == "3-4":
+            bot.final_comp = True
+        game.carousel()
+    else:
+        play_planning(game, bot)
+
+
+def play_game(
+    seed: int = 0,
+    comps_manager: Optional[CompsManager] = None,
+    max_rounds: Optional[int] = None,
+) -> GameResult:
+    """Plays one full simulated game with the bot's Arena making every decision.
+
+    A synthetic champion pool and comp are generated from the seed unless a loaded
+    CompsManager is given.
+    """
+    rng = random.Random(seed)
+    if comps_manager is None:
+        comps_manager = CompsManager()
+        comps_manager.champions = synthetic_champions(rng)
+        comps_manager.set_comps_loaded([synthetic_comp(rng, comps_manager.champions)])
+    game = SimulatedGame(comps_manager.champions, seed)
+    rounds_played = 0
+    with game.patched():
+        bot = arena.Arena(queue.Queue(), comps_manager)
+        while not game.finished() and (max_rounds is None or rounds_played < max_rounds):
+            play_round(game, bot)
+            game.advance_round()
+            rounds_played += 1
+    return GameResult(
+        seed=seed,
+        last_round=game.round,
+        rounds_played=rounds_played,
+        health=game.health,
+        level=game.level,
+        gold=game.gold,
+        board=tuple(unit.name for unit in game.board if unit is not None),
+        seconds=game.clock.now,
+    )
+
+
+def benchmark(games: int = 20, seed: int = 0) -> float:
+    """Plays games with consecutive seeds and returns how many finish per wall-clock second"""
+    start: float = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for offset in range(games):
+            play_game(seed + offset)
+    return games / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    GAMES: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{benchmark(GAMES):.1f} games/s over {GAMES} games")
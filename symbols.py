@@ -0,0 +1,115 @@
+"""
+Interns champion, trait and item names to small integers, with traits as bitsets
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+import game_assets
+
+# Trait bitsets are stored as uint64
+MAX_TRAITS = 64
+TRAIT_KEYS = ("Trait1", "Trait2", "Trait3")
+
+
+class SymbolTable:
+    """Ids for every champion, trait and item, built from the champion data.
+
+    A champion's traits are a bitset with bit n set for trait id n. Names
+    outside the table get no id, and an empty trait set.
+    """
+
+    def __init__(
+        self,
+        champions: dict[str, dict[str, int]],
+        items: Iterable[str] = game_assets.ALL_ITEMS,
+    ) -> None:
+        self.champion_names: list[str] = list(champions)
+        self.champion_ids: dict[str, int] = {
+            name: index for index, name in enumerate(self.champion_names)
+        }
+        self.trait_names: list[str] = sorted(
+            {
+                data[key]
+                for data in champions.values()
+                for key in TRAIT_KEYS
+                if data.get(key)
+            }
+        )
+        if len(self.trait_names) > MAX_TRAITS:
+            raise ValueError(f"Symbols.py | More than {MAX_TRAITS} traits")
+        self.trait_ids: dict[str, int] = {
+            name: index for index, name in enumerate(self.trait_names)
+        }
+        self.item_names: list[str] = sorted(items)
+        self.item_ids: dict[str, int] = {
+            name: index for index, name in enumerate(self.item_names)
+        }
+
+        self.trait_masks: np.ndarray = np.zeros(len(self.champion_names), dtype=np.uint64)
+        for index, name in enumerate(self.champion_names):
+            self.trait_masks[index] = self.traits_of(
+                champions[name].get(key, "") for key in TRAIT_KEYS
+            )
+        # Trait granted by each emblem, emblems are named <trait>Emblem
+        self.emblem_traits: list[int] = [
+            self.trait_bit(item.replace("Emblem", "")) if "Emblem" in item else 0
+            for item in self.item_names
+        ]
+
+    def trait_bit(self, trait: str) -> int:
+        """Returns the bitset of a single trait, 0 for an unknown one"""
+        trait_id: int = self.trait_ids.get(trait, -1)
+        return 1 << trait_id if trait_id >= 0 else 0
+
+    def traits_of(self, traits: Iterable[str]) -> int:
+        """Returns the bitset of the traits"""
+        mask = 0
+        for trait in traits:
+            mask |= self.trait_bit(trait)
+        return mask
+
+    def champion_traits(self, champion: str) -> int:
+        """Returns the trait bitset of a champion"""
+        champion_id: int = self.champion_ids.get(champion, -1)
+        return int(self.trait_masks[champion_id]) if champion_id >= 0 else 0
+
+    def emblem_trait(self, item: str) -> int:
+        """Returns the trait bitset an emblem grants, 0 for other items"""
+        item_id: int = self.item_ids.get(item, -1)
+        if item_id < 0:
+            return self.trait_bit(item.replace("Emblem", "")) if "Emblem" in item else 0
+        return self.emblem_traits[item_id]
+
+
+class ChampionCounts:
+    """How many copies of each champion are on the board"""
+
+    def __init__(self, symbols: SymbolTable) -> None:
+        self.symbols: SymbolTable = symbols
+        self.counts: np.ndarray = np.zeros(len(symbols.champion_names), dtype=np.int16)
+
+    def __contains__(self, champion: str) -> bool:
+        champion_id: int = self.symbols.champion_ids.get(champion, -1)
+        return champion_id >= 0 and self.counts[champion_id] > 0
+
+    def add(self, champion: str) -> None:
+        """Counts one more copy of the champion"""
+        self.counts[self.symbols.champion_ids[champion]] += 1
+
+    def remove(self, champion: str) -> None:
+        """Counts one copy fewer, raises ValueError if there is none"""
+        if champion not in self:
+            raise ValueError(f"{champion} is not on the board")
+        self.counts[self.symbols.champion_ids[champion]] -= 1
+
+    def trait_totals(self) -> np.ndarray:
+        """Returns per trait id how many different champions on the board have it.
+
+        Every present champion's bitset is shifted against all trait ids at
+        once and the set bits are summed per trait.
+        """
+        masks: np.ndarray = self.symbols.trait_masks[self.counts > 0]
+        shifts: np.ndarray = np.arange(len(self.symbols.trait_names), dtype=np.uint64)
+        return ((masks[:, None] >> shifts) & np.uint64(1)).sum(axis=0, dtype=np.int64)
@@ -0,0 +1,131 @@
+"""
+Stand-in for the League client: writes a lockfile, answers the REST endpoints of the
+queue flow and pushes gameflow phase changes over the WAMP WebSocket
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import BasicAuth, WSMsgType, web
+
+import auto_queue
+
+PASSWORD = "fake-lcu-password"
+# Delay before the client moves on to the phase a request started
+PHASE_DELAY = 0.05
+
+
+class FakeLcu:
+    """Walks the gameflow phases the way the client does when the bot queues.
+
+    Creating a lobby leads to Lobby, searching to Matchmaking then ReadyCheck,
+    and accepting to InProgress. Every request the bot made is kept in calls.
+    """
+
+    def __init__(self, phase: str = "None") -> None:
+        self.phase: str = phase
+        self.calls: list[str] = []
+        self.subscriptions: list[str] = []
+        self.sockets: list[web.WebSocketResponse] = []
+        self.runner: Optional[web.AppRunner] = None
+        self.port: int = 0
+        app = web.Application(middlewares=[self.check_auth])
+        app.add_routes(
+            [
+                web.get("/", self.websocket),
+                web.get("/lol-gameflow/v1/session", self.session),
+                web.post("/lol-lobby/v2/lobby/", self.create_lobby),
+                web.delete("/lol-cosmetics/v1/selection/tft-map-skin", self.map_skin),
+                web.post("/lol-lobby/v2/lobby/matchmaking/search", self.search),
+                web.post("/lol-matchmaking/v1/ready-check/accept", self.accept),
+            ]
+        )
+        self.app: web.Application = app
+
+    async def start(self, directory: Path) -> None:
+        """Listens on a free port and writes the lockfile into directory"""
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+        (directory / "lockfile").write_text(
+            f"LeagueClient:1234:{self.port}:{PASSWORD}:http", encoding="utf-8"
+        )
+
+    async def stop(self) -> None:
+        """Closes the sockets and the server"""
+        for socket in self.sockets:
+            await socket.close()
+        await self.runner.cleanup()
+
+    @web.middleware
+    async def check_auth(self, request: web.Request, handler) -> web.StreamResponse:
+        """Rejects requests without the lockfile's password, like the client does"""
+        auth: Optional[BasicAuth] = None
+        if "Authorization" in request.headers:
+            auth = BasicAuth.decode(request.headers["Authorization"])
+        if auth is None or auth.login != "riot" or auth.password != PASSWORD:
+            return web.Response(status=401)
+        return await handler(request)
+
+    async def set_phase(self, phase: str, delay: float = PHASE_DELAY) -> None:
+        """Moves to a phase after a delay and sends its event to every subscriber"""
+        await asyncio.sleep(delay)
+        self.phase = phase
+        message: str = json.dumps(
+            [
+                auto_queue.WAMP_EVENT,
+                auto_queue.GAMEFLOW_PHASE_EVENT,
+                {"data": phase, "eventType": "Update"},
+            ]
+        )
+        for socket in self.sockets:
+            if auto_queue.GAMEFLOW_PHASE_EVENT in self.subscriptions:
+                await socket.send_str(message)
+
+    def later(self, phase: str, delay: float = PHASE_DELAY) -> None:
+        """Schedules a phase change without holding up the response"""
+        asyncio.ensure_future(self.set_phase(phase, delay))
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """Records WAMP subscriptions until the bot disconnects"""
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.sockets.append(socket)
+        async for message in socket:
+            if message.type == WSMsgType.TEXT:
+                opcode, event = json.loads(message.data)
+                if opcode == auto_queue.WAMP_SUBSCRIBE:
+                    self.subscriptions.append(event)
+        return socket
+
+    async def session(self, _: web.Request) -> web.Response:
+        """Current gameflow session"""
+        return web.json_response({"phase": self.phase})
+
+    async def create_lobby(self, _: web.Request) -> web.Response:
+        """Creates the lobby"""
+        self.calls.append("lobby")
+        self.later("Lobby")
+        return web.json_response({"canStartActivity": True})
+
+    async def map_skin(self, _: web.Request) -> web.Response:
+        """Resets the arena skin"""
+        self.calls.append("map skin")
+        return web.Response(status=204)
+
+    async def search(self, _: web.Request) -> web.Response:
+        """Starts matchmaking, a match is found shortly after"""
+        self.calls.append("search")
+        self.later("Matchmaking")
+        self.later("ReadyCheck", PHASE_DELAY * 4)
+        return web.Response(status=204)
+
+    async def accept(self, _: web.Request) -> web.Response:
+        """Accepts the ready check, the game starts"""
+        self.calls.append("accept")
+        self.later("InProgress")
+        return web.Response(status=204)
@@ -0,0 +1,134 @@
+"""
+Local HTTP server answering from canned pages on a background thread, optionally over
+TLS, for testing the bot's HTTP clients without the game or the internet
+"""
+
+import json
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class StubPage:
+    """What the server answers for one path.
+
+    Pages with an ETag or Last-Modified header answer matching conditional
+    requests with 304 Not Modified, like a real server.
+    """
+
+    body: bytes
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    # Seconds to wait before answering
+    delay: float = 0.0
+
+
+@dataclass
+class StubRequest:
+    """A request the server received"""
+
+    path: str
+    headers: dict[str, str]
+    # Client port of the connection, the same port means a reused connection
+    port: int
+    status: int
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the stub's pages with keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub.connections.add(self.connection)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answers from the page table, 404 for unknown paths"""
+        stub: StubHttpServer = self.server.stub
+        page: StubPage = stub.pages.get(self.path, StubPage(b"", 404))
+        not_modified: bool = any(
+            page.headers.get(header) is not None
+            and self.headers.get(condition) == page.headers[header]
+            for header, condition in (
+                ("ETag", "If-None-Match"),
+                ("Last-Modified", "If-Modified-Since"),
+            )
+        )
+        status: int = 304 if not_modified else page.status
+        body: bytes = b"" if not_modified else page.body
+        stub.requests.append(
+            StubRequest(self.path, dict(self.headers), self.client_address[1], status)
+        )
+        time.sleep(page.delay)
+        self.send_response(status)
+        for name, value in page.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        """Keeps the test output quiet"""
+
+
+class StubServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that knows the stub it serves"""
+
+    daemon_threads = True
+    stub: "StubHttpServer"
+
+
+class StubHttpServer:
+    """Serves pages set in pages until stopped, stopping also drops open connections"""
+
+    def __init__(self) -> None:
+        self.pages: dict[str, StubPage] = {}
+        self.requests: list[StubRequest] = []
+        self.connections: set[socket.socket] = set()
+        self.server = StubServer(("127.0.0.1", 0), StubHandler)
+        self.server.stub = self
+        self.scheme = "http"
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self, certificate: Optional[tuple[Path, Path]] = None) -> None:
+        """Starts serving, over TLS with a (certificate, key) pair"""
+        if certificate is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = "https"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stops listening and closes every connection, so clients see the server go away"""
+        self.server.shutdown()
+        self.server.server_close()
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+
+    def url(self, path: str) -> str:
+        """Returns the full URL of a path on the server"""
+        return f"{self.scheme}://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def set_json(self, path: str, data: object, status: int = 200) -> None:
+        """Serves data as JSON at the path"""
+        self.pages[path] = StubPage(
+            json.dumps(data).encode("utf-8"),
+            status,
+            {"Content-Type": "application/json"},
+        )
@@ -0,0 +1,48 @@
+"""
+Drives QueueController against the fake League client
+"""
+
+import asyncio
+
+import auto_queue
+import settings
+from fake_lcu import FakeLcu
+
+TIMEOUT = 10
+
+
+async def queue(lcu: FakeLcu, directory, monkeypatch) -> bool:
+    """Starts the fake client and runs the queue flow against it"""
+    await lcu.start(directory)
+    monkeypatch.setattr(settings, "LEAGUE_CLIENT_PATH", str(directory))
+    try:
+        controller = auto_queue.QueueController(auto_queue.get_client())
+        return await asyncio.wait_for(controller.run(), TIMEOUT)
+    finally:
+        await lcu.stop()
+
+
+def test_lobby_to_game(tmp_path, monkeypatch):
+    """A finished game leads through lobby, queue and ready check into the next game"""
+    lcu = FakeLcu("EndOfGame")
+    assert asyncio.run(queue(lcu, tmp_path, monkeypatch))
+    assert lcu.calls == ["lobby", "map skin", "search", "accept"]
+    assert lcu.subscriptions == [
+        auto_queue.GAMEFLOW_PHASE_EVENT,
+        auto_queue.READY_CHECK_EVENT,
+    ]
+
+
+def test_reattach_during_ready_check(tmp_path, monkeypatch):
+    """A bot restarted mid-queue accepts and plays the game it queued for"""
+    lcu = FakeLcu("ReadyCheck")
+    assert asyncio.run(queue(lcu, tmp_path, monkeypatch))
+    assert lcu.calls == ["accept"]
+
+
+def test_game_before_queueing_is_not_played():
+    """A game already running when the bot starts is the previous one ending"""
+    controller = auto_queue.QueueController(("password", "http://127.0.0.1:1"))
+    assert not asyncio.run(controller.handle_phase("InProgress"))
+    assert not asyncio.run(controller.handle_phase("ChampSelect"))
+    assert asyncio.run(controller.handle_phase("InProgress"))
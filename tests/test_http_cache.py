@@ -0,0 +1,97 @@
+"""
+HttpCache revalidation against a stub server
+"""
+
+import pytest
+import requests
+
+from http_cache import HttpCache
+from stub_http import StubHttpServer, StubPage
+
+MODIFIED = "Wed, 01 Oct 2026 10:00:00 GMT"
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """A running stub with a page revalidated by ETag and one by Last-Modified"""
+    server = StubHttpServer()
+    server.pages["/etag"] = StubPage(b"first", headers={"ETag": '"v1"'})
+    server.pages["/modified"] = StubPage(b"dated", headers={"Last-Modified": MODIFIED})
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_first_fetch_downloads_and_stores(server, tmp_path):
+    """A URL that isn't cached is fetched without conditions"""
+    response = HttpCache(str(tmp_path)).get(server.url("/etag"))
+    assert (response.status_code, response.text, response.from_cache) == (200, "first", False)
+    assert "If-None-Match" not in server.requests[0].headers
+
+
+def test_unchanged_page_is_served_from_disk_on_304(server, tmp_path):
+    """The stored ETag is sent back and a 304 serves the stored body"""
+    HttpCache(str(tmp_path)).get(server.url("/etag"))
+    response = HttpCache(str(tmp_path)).get(server.url("/etag"))
+    assert (response.status_code, response.text, response.from_cache) == (200, "first", True)
+    assert server.requests[1].headers["If-None-Match"] == '"v1"'
+    assert server.requests[1].status == 304
+
+
+def test_last_modified_is_revalidated(server, tmp_path):
+    """Pages without an ETag are revalidated with If-Modified-Since"""
+    cache = HttpCache(str(tmp_path))
+    cache.get(server.url("/modified"))
+    response = cache.get(server.url("/modified"))
+    assert response.from_cache and response.text == "dated"
+    assert server.requests[1].headers["If-Modified-Since"] == MODIFIED
+    assert server.requests[1].status == 304
+
+
+def test_changed_page_is_downloaded_and_replaces_the_copy(server, tmp_path):
+    """A new ETag means a 200 with the new body, which is stored for next time"""
+    cache = HttpCache(str(tmp_path))
+    cache.get(server.url("/etag"))
+    server.pages["/etag"] = StubPage(b"second", headers={"ETag": '"v2"'})
+    response = cache.get(server.url("/etag"))
+    assert (response.text, response.from_cache) == ("second", False)
+    assert cache.get(server.url("/etag")).from_cache
+    assert server.requests[-1].headers["If-None-Match"] == '"v2"'
+
+
+def test_error_answers_are_not_stored(server, tmp_path):
+    """A 404 is passed on and never served from the cache later"""
+    cache = HttpCache(str(tmp_path))
+    assert cache.get(server.url("/missing")).status_code == 404
+    assert cache.load(server.url("/missing")) is None
+
+
+def test_connection_failure_serves_the_stored_copy(server, tmp_path):
+    """When the site is down the cached body is used, an uncached URL raises"""
+    cache = HttpCache(str(tmp_path))
+    cache.get(server.url("/etag"))
+    server.stop()
+    response = cache.get(server.url("/etag"), timeout=2)
+    assert (response.text, response.from_cache) == ("first", True)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        cache.get(server.url("/modified"), timeout=2)
+
+
+def test_warm_refresh_only_downloads_changed_pages(server, tmp_path):
+    """get_all keeps the URL order and re-downloads only what changed"""
+    for index in range(10):
+        server.pages[f"/deck/{index}"] = StubPage(
+            f"deck {index}".encode(), headers={"ETag": f'"{index}"'}
+        )
+    urls: list[str] = [server.url(f"/deck/{index}") for index in range(10)]
+    cache = HttpCache(str(tmp_path))
+    assert [response.text for response in cache.get_all(urls, workers=4)] == [
+        f"deck {index}" for index in range(10)
+    ]
+    server.pages["/deck/3"] = StubPage(b"deck 3 v2", headers={"ETag": '"3b"'})
+    server.requests.clear()
+    responses = cache.get_all(urls, workers=4)
+    assert responses[3].text == "deck 3 v2"
+    assert [request.path for request in server.requests if request.status == 200] == [
+        "/deck/3"
+    ]
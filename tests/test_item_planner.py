@@ -0,0 +1,63 @@
+"""
+Item placement plans and the build changes they make
+"""
+
+from champion import Champion
+from item_planner import apply_placement, plan_items
+
+
+def champion(name: str, build: list[str], slot: int = 0) -> Champion:
+    """A board champion with the given build"""
+    return Champion(name, (slot, 0), list(build), slot, 1, False, "", "", "")
+
+
+def place(items: list, board: list, comp_items=()) -> list:
+    """Plans the items and applies every placement to its champion"""
+    plan = plan_items(items, board, [], comp_items)
+    for placement in plan:
+        apply_placement(placement, placement.champion)
+    return plan
+
+
+def test_component_starts_a_recipe_and_its_partner_finishes_it():
+    """The second component completes the craftable the first one started"""
+    ahri = champion("Ahri", ["ArchangelsStaff"])
+    plan = place(["TearoftheGoddess", "NeedlesslyLargeRod"], [ahri])
+    assert [placement.item_index for placement in plan] == [0, 1]
+    assert ahri.completed_items == ["ArchangelsStaff"]
+    assert (ahri.build, ahri.current_building) == ([], [])
+
+
+def test_whole_craftable_leaves_a_half_built_recipe_alone():
+    """Giving a finished item to a champion mid-recipe only takes it off the build"""
+    ahri = champion("Ahri", ["AdaptiveHelm", "ArchangelsStaff"])
+    place(["TearoftheGoddess"], [ahri])
+    assert ahri.current_building == [("AdaptiveHelm", "NegatronCloak")]
+
+    place(["ArchangelsStaff"], [ahri])
+    assert ahri.build == []
+    assert ahri.current_building == [("AdaptiveHelm", "NegatronCloak")]
+    assert ahri.completed_items == ["ArchangelsStaff"]
+
+    place(["NegatronCloak"], [ahri])
+    assert ahri.completed_items == ["ArchangelsStaff", "AdaptiveHelm"]
+    assert not ahri.current_building
+
+
+def test_whole_craftable_is_no_longer_wanted_once_placed():
+    """A second copy of a craftable given to a champion mid-recipe can be dumped"""
+    done = champion("Garen", [], slot=0)
+    ahri = champion("Ahri", ["AdaptiveHelm", "ArchangelsStaff"], slot=1)
+    place(["TearoftheGoddess"], [done, ahri])
+    plan = place(["ArchangelsStaff", "ArchangelsStaff"], [done, ahri])
+    assert [(placement.champion.name, placement.filler) for placement in plan] == [
+        ("Ahri", False),
+        ("Garen", True),
+    ]
+
+
+def test_reserved_items_are_not_dumped():
+    """Items the comp still asks for stay on the bench"""
+    done = champion("Garen", [])
+    assert not place(["ArchangelsStaff"], [done], comp_items={"ArchangelsStaff"})
+    assert done.completed_items == []
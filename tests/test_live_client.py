@@ -0,0 +1,165 @@
+"""
+LiveClientPoller against a stub Live Client Data API
+"""
+
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from live_client import LiveClientPoller
+from stub_http import StubHttpServer, StubPage
+
+PATH = "/liveclientdata/allgamedata"
+
+
+def game_data(level: int) -> dict:
+    """An allgamedata answer with the fields the bot reads"""
+    return {
+        "activePlayer": {"level": level, "championStats": {"currentHealth": 100.0}}
+    }
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """A running stub serving level 3"""
+    server = StubHttpServer()
+    server.set_json(PATH, game_data(3))
+    server.start()
+    yield server
+    server.stop()
+
+
+def foreground_poller(server: StubHttpServer, ttl: float) -> LiveClientPoller:
+    """A poller that only fetches when a snapshot asks for it"""
+    poller = LiveClientPoller(server.url(PATH), interval=60, ttl=ttl)
+    poller.start = lambda: None
+    return poller
+
+
+def test_snapshot_is_served_from_memory_within_the_ttl(server):
+    """A fresh snapshot answers without another request"""
+    poller = foreground_poller(server, ttl=60)
+    assert poller.snapshot() == game_data(3)
+    server.set_json(PATH, game_data(4))
+    assert poller.snapshot() == game_data(3)
+    assert len(server.requests) == 1
+
+
+def test_stale_snapshot_is_fetched_again(server):
+    """Once the TTL passed the endpoint is asked again"""
+    poller = foreground_poller(server, ttl=0.05)
+    poller.snapshot()
+    server.set_json(PATH, game_data(4))
+    time.sleep(0.1)
+    assert poller.snapshot() == game_data(4)
+    assert poller.snapshot(max_age=0) == game_data(4)
+    assert len(server.requests) == 3
+
+
+def test_requests_reuse_one_connection(server):
+    """The session keeps its connection alive between fetches"""
+    poller = foreground_poller(server, ttl=60)
+    for _ in range(3):
+        poller.snapshot(max_age=0)
+    assert len({request.port for request in server.requests}) == 1
+
+
+def test_error_answer_yields_none_not_stale_data(server):
+    """A fetch that doesn't return JSON drops the old snapshot"""
+    poller = foreground_poller(server, ttl=60)
+    poller.snapshot()
+    server.pages[PATH] = StubPage(b"Internal Server Error", 500)
+    assert poller.snapshot(max_age=0) is None
+
+
+def test_connection_failure_yields_none(server):
+    """Once the game is gone reads fail instead of returning the last game's data"""
+    poller = foreground_poller(server, ttl=60)
+    assert poller.snapshot() == game_data(3)
+    server.stop()
+    assert poller.snapshot(max_age=0) is None
+    assert poller.snapshot() is None
+
+
+def test_background_thread_keeps_the_snapshot_fresh(server):
+    """Started by the first read, the thread picks up changes without a caller fetching"""
+    poller = LiveClientPoller(server.url(PATH), interval=0.01, ttl=60)
+    assert poller.snapshot()["activePlayer"]["level"] in (3, 4)
+    server.set_json(PATH, game_data(4))
+    deadline: float = time.monotonic() + 5
+    while poller.data != game_data(4) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert poller.snapshot() == game_data(4)
+
+
+def test_snapshot_does_not_wait_for_a_fetch_in_flight(server):
+    """A fresh snapshot is served while the poll thread waits on a slow answer"""
+    poller = LiveClientPoller(server.url(PATH), interval=0.01, ttl=60)
+    assert poller.snapshot() == game_data(3)
+    server.pages[PATH].delay = 0.5
+    time.sleep(0.1)
+    started: float = time.monotonic()
+    assert poller.snapshot() == game_data(3)
+    assert time.monotonic() - started < 0.2
+
+
+def test_slow_answer_times_out(server):
+    """The game thread waits at most the timeout for an answer"""
+    poller = LiveClientPoller(server.url(PATH), interval=60, ttl=60, timeout=0.1)
+    poller.start = lambda: None
+    server.pages[PATH].delay = 1.0
+    started: float = time.monotonic()
+    assert poller.snapshot() is None
+    assert time.monotonic() - started < 0.5
+
+
+def test_failures_back_off(server):
+    """After a failed fetch reads return None without asking until the backoff passed"""
+    poller = LiveClientPoller(server.url(PATH), interval=0.1, ttl=60, max_backoff=1)
+    poller.start = lambda: None
+    server.pages[PATH] = StubPage(b"Internal Server Error", 500)
+    for _ in range(3):
+        assert poller.snapshot(max_age=0) is None
+    assert len(server.requests) == 1
+    time.sleep(poller.backoff())
+    server.set_json(PATH, game_data(4))
+    assert poller.snapshot(max_age=0) == game_data(4)
+    assert (len(server.requests), poller.failures) == (2, 0)
+
+
+def test_thread_stops_once_the_backoff_maxes_out(server):
+    """Outside a game the thread gives up, and the next read starts it again"""
+    poller = LiveClientPoller(server.url(PATH), interval=0.01, ttl=60, max_backoff=0.04)
+    server.pages[PATH] = StubPage(b"Internal Server Error", 500)
+    poller.snapshot()
+    poller.thread.join(timeout=5)
+    assert not poller.thread.is_alive()
+    failed: int = len(server.requests)
+    assert failed <= 5
+
+    server.set_json(PATH, game_data(4))
+    time.sleep(poller.max_backoff)
+    assert poller.snapshot() == game_data(4)
+    assert poller.thread.is_alive()
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl")
+def test_https_with_the_clients_self_signed_certificate(tmp_path):
+    """The game serves its API over TLS with a certificate that isn't trusted"""
+    certificate, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=127.0.0.1", "-keyout", str(key), "-out", str(certificate)],
+        check=True,
+        capture_output=True,
+    )
+    server = StubHttpServer()
+    server.set_json(PATH, game_data(5))
+    server.start((certificate, key))
+    try:
+        assert server.url(PATH).startswith("https://")
+        assert foreground_poller(server, ttl=60).snapshot() == game_data(5)
+    finally:
+        server.stop()
@@ -0,0 +1,26 @@
+"""
+NameIndex resolution of misread names and the bound on what it remembers
+"""
+
+from name_index import NameIndex
+
+NAMES = ["Ahri", "Garen", "Jinx", "Lux", "Miss Fortune"]
+
+
+def test_resolves_corrections_normalized_and_fuzzy_reads():
+    """Each lookup stage finds the name it is meant to"""
+    index = NameIndex(NAMES, min_ratio=0.7, corrections={"Ahrl": "Ahri"})
+    assert index.resolve("Ahrl") == "Ahri"
+    assert index.resolve("miss fortune!") == "Miss Fortune"
+    assert index.resolve("Garn") == "Garen"
+    assert index.resolve("Zzzzzz") is None
+
+
+def test_misreads_are_remembered_in_the_bounded_memo_only():
+    """However many different misreads come in, the index keeps memo_size of them"""
+    index = NameIndex(NAMES, min_ratio=0.7, memo_size=16)
+    for count in range(1000):
+        assert index.resolve(f"Garen{count}") == "Garen"
+    assert len(index.memo) == 16
+    assert not index.corrections
+    assert index.resolve("Garen999") == "Garen"
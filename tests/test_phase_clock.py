@@ -0,0 +1,110 @@
+"""
+PhaseClock kept in sync from ScreenWatcher grabs across a planning to combat switch
+"""
+
+import types
+
+import pytest
+from PIL import Image, ImageDraw
+
+import frame_capture
+import screen_watcher
+from phase_clock import PhaseClock
+from screen_watcher import ScreenWatcher
+from vec4 import GameWindow, Vec4
+
+ROUND_BOX = (0, 0, 60, 20)
+TIMER_BOX = (70, 0, 100, 20)
+PLANNING_SECONDS = 30
+COMBAT_SECONDS = 30
+
+
+class FakeTime:
+    """time.monotonic and time.sleep over a clock that only moves when slept on"""
+
+    def __init__(self) -> None:
+        self.current: float = 0.0
+
+    def monotonic(self) -> float:
+        """Returns the fake time"""
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        """Moves the fake time on"""
+        self.current += seconds
+
+
+def render(round_name: str, seconds: int) -> Image.Image:
+    """Draws the round banner and the timer the way the screen shows them"""
+    image = Image.new("RGB", (100, 20), (16, 24, 32))
+    draw = ImageDraw.Draw(image)
+    draw.text((4, 4), round_name, fill=(230, 230, 230))
+    draw.text((TIMER_BOX[0] + 4, 4), str(seconds), fill=(230, 230, 230))
+    return image
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """Fake time for the watcher, and a screen with a 30 s planning then 30 s combat phase"""
+    clock = FakeTime()
+    fake_time = types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(screen_watcher, "time", fake_time)
+
+    def grab(bbox: tuple) -> Image.Image:
+        if clock.current < PLANNING_SECONDS:
+            shown = PLANNING_SECONDS - clock.current
+        else:
+            shown = max(0.0, PLANNING_SECONDS + COMBAT_SECONDS - clock.current)
+        return render("2-1", int(shown)).crop(bbox)
+
+    monkeypatch.setattr(frame_capture, "grab", grab)
+    return clock
+
+
+def test_clock_follows_the_timer_into_combat(clock):
+    """The timer region waking the watcher keeps the clock within a second of the screen"""
+    timer_reads: dict[bytes, int] = {
+        render("2-1", seconds).crop(TIMER_BOX).tobytes(): seconds
+        for seconds in range(PLANNING_SECONDS + 1)
+    }
+    reads: list[float] = []
+
+    def read_timer(frame: frame_capture.Frame) -> int:
+        reads.append(clock.current)
+        return timer_reads.get(frame.crop_coords(TIMER_BOX).tobytes(), -1)
+
+    watcher = ScreenWatcher(
+        {"round": Vec4(GameWindow(*ROUND_BOX)), "timer": Vec4(GameWindow(*TIMER_BOX))}
+    )
+    phase_clock = PhaseClock(now=clock.monotonic)
+    watcher.sample()
+    phase_clock.observe(read_timer(watcher.frame), "2-1")
+
+    combat_errors: list[float] = []
+    while clock.current < PLANNING_SECONDS + COMBAT_SECONDS - 1:
+        # The game loop's inner loop: only the timer ticked
+        assert watcher.wait(2.0) == {"timer"}
+        phase_clock.sync(lambda: read_timer(watcher.frame), "2-1")
+        if clock.current > PLANNING_SECONDS + 1:
+            shown: float = PLANNING_SECONDS + COMBAT_SECONDS - clock.current
+            combat_errors.append(abs(phase_clock.remaining() - shown))
+
+    assert combat_errors and max(combat_errors) <= 1.0
+    assert any(PLANNING_SECONDS <= read < PLANNING_SECONDS + 1 for read in reads)
+    # Settled phases are only rechecked, not read on every tick
+    assert len(reads) < (PLANNING_SECONDS + COMBAT_SECONDS) / 2
+
+
+def test_sync_reads_only_when_needed():
+    """A settled clock skips the read until the recheck interval passes"""
+    now = [0.0]
+    phase_clock = PhaseClock(now=lambda: now[0])
+    for second in range(3):
+        now[0] = float(second)
+        assert phase_clock.sync(lambda second=second: 30 - second, "3-2")
+    now[0] = 3.0
+    assert not phase_clock.sync(lambda: pytest.fail("read while settled"), "3-2")
+    now[0] = 7.5
+    assert phase_clock.sync(lambda: 23, "3-2")
+    assert phase_clock.sync(lambda: 20, "3-3")
+    assert phase_clock.seconds() == 20
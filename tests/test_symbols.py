@@ -0,0 +1,67 @@
+"""
+Symbol table ids, trait bitsets and board trait totals
+"""
+
+import random
+
+import pytest
+
+from symbols import ChampionCounts, SymbolTable, TRAIT_KEYS
+
+CHAMPIONS: dict[str, dict] = {
+    "Ahri": {"Gold": 2, "Trait1": "Arcana", "Trait2": "Scholar", "Trait3": ""},
+    "Garen": {"Gold": 1, "Trait1": "Warrior", "Trait2": "", "Trait3": ""},
+    "Lux": {"Gold": 3, "Trait1": "Arcana", "Trait2": "Scholar", "Trait3": "Mage"},
+    "Vi": {"Gold": 4, "Trait1": "Warrior", "Trait2": "Mage", "Trait3": ""},
+}
+
+
+@pytest.fixture(name="symbols")
+def fixture_symbols() -> SymbolTable:
+    """A table over four champions and their items"""
+    return SymbolTable(CHAMPIONS, items=["ArcanaEmblem", "WarriorEmblem", "Deathblade"])
+
+
+def test_emblem_grants_its_trait_bit(symbols):
+    """An emblem's bitset matches the champions that carry its trait"""
+    arcana: int = symbols.emblem_trait("ArcanaEmblem")
+    assert arcana == symbols.trait_bit("Arcana")
+    assert symbols.champion_traits("Lux") & arcana
+    assert not symbols.champion_traits("Garen") & arcana
+    assert symbols.emblem_trait("Deathblade") == 0
+
+
+def test_trait_totals_count_each_champion_once(symbols):
+    """Copies of a champion add to a trait once, removed champions stop counting"""
+    board = ChampionCounts(symbols)
+    for name in ("Ahri", "Ahri", "Lux", "Vi"):
+        board.add(name)
+    totals = board.trait_totals()
+    assert {
+        name: int(totals[symbols.trait_ids[name]]) for name in symbols.trait_names
+    } == {"Arcana": 2, "Mage": 2, "Scholar": 2, "Warrior": 1}
+
+    board.remove("Vi")
+    totals = board.trait_totals()
+    assert totals[symbols.trait_ids["Warrior"]] == 0
+    assert totals[symbols.trait_ids["Mage"]] == 1
+
+
+def test_trait_totals_match_a_string_count():
+    """The bitset totals agree with counting trait names on random boards"""
+    rng = random.Random(0)
+    traits: list[str] = [f"Trait{index}" for index in range(40)]
+    champions: dict[str, dict] = {
+        f"Unit{index}": dict(zip(TRAIT_KEYS, rng.sample(traits, 3)))
+        for index in range(60)
+    }
+    symbols = SymbolTable(champions, items=[])
+    for _ in range(20):
+        board = ChampionCounts(symbols)
+        names: list[str] = rng.sample(sorted(champions), 9)
+        for name in names:
+            board.add(name)
+        totals = board.trait_totals()
+        for trait in symbols.trait_names:
+            expected: int = sum(trait in champions[name].values() for name in names)
+            assert totals[symbols.trait_ids[trait]] == expected